@@ -1,5 +1,7 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+from django.template import loader
+from properties.utils.outbox import enqueue_email
 from .models import CustomUser
 
 class SignUpForm(UserCreationForm):
@@ -25,4 +27,20 @@ class SignUpForm(UserCreationForm):
             'min_length': 'Password must be at least 8 characters long.',
             'common_password': 'Choose a less common password.',
             'password_mismatch': 'The passwords do not match.',
-        }
\ No newline at end of file
+        }
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    """
+    Queues the reset email in the outbox instead of talking to the mail
+    server while the request waits.
+    """
+
+    def send_mail(self, subject_template_name, email_template_name, context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = ''.join(loader.render_to_string(subject_template_name, context).splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html_body = ''
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(html_email_template_name, context)
+        enqueue_email('password_reset', subject, body, [to_email], html_body=html_body, from_email=from_email or '')
@@ -7,9 +7,11 @@ from django.contrib.auth.views import (
 from django.urls import reverse_lazy
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, authenticate, logout
-from .forms import SignUpForm
+from .forms import OutboxPasswordResetForm, SignUpForm
 from django.contrib import messages
+from properties.utils.ratelimit import rate_limit
 
+@rate_limit('signup')
 def signup(request):
     if request.method == 'POST':
         form = SignUpForm(request.POST)
@@ -24,6 +26,7 @@ def signup(request):
         form = SignUpForm()
     return render(request, 'authentication/register.html', {'form': form})
 
+@rate_limit('login')
 def user_login(request):
     if request.method == 'POST':
         email = request.POST.get('email')
@@ -48,6 +51,7 @@ def user_logout(request):
 # Password reset views
 class CustomPasswordResetView(PasswordResetView):
     template_name = 'authentication/reset_password.html'
+    form_class = OutboxPasswordResetForm
     success_url = reverse_lazy('password_reset_done')
 
 class CustomPasswordResetDoneView(PasswordResetDoneView):
@@ -0,0 +1,123 @@
+"""
+Primary/replica database routing.
+
+Writes, migrations and anything outside a request always use the primary
+(``default``). Reads move to a replica only while ``ReplicaRoutingMiddleware``
+is handling a GET or HEAD request for one of the read-only views listed in
+``REPLICA_VIEWS``. After a client submits a form it is pinned to the primary
+for ``REPLICA_STICKY_SECONDS``, so it always sees its own writes even while
+the replicas lag.
+
+Anything that fills a shared cache reads inside ``primary_reads()``: a
+replica may not yet hold the rows of a model version that is already
+bumped, and caching them would serve the stale copy until the next write.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+PRIMARY = 'default'
+STICKY_COOKIE = 'db_primary_until'
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, 'DATABASE_REPLICAS', ()) if alias in settings.DATABASES]
+
+
+@contextmanager
+def primary_reads():
+    """
+    Routes every read inside the block to the primary.
+    """
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        pool = {PRIMARY, *replica_aliases()}
+        return obj1._state.db in pool and obj2._state.db in pool
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.views = set(getattr(settings, 'REPLICA_VIEWS', ()))
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # A sync hook would run on a worker thread under ASGI.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_from_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = _read_from_replica.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        return self.pin_after_write(request, response)
+
+    def pin_after_write(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time()) + self.sticky_seconds),
+                max_age=self.sticky_seconds, httponly=True, samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.route(request)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.route(request)
+
+    def route(self, request):
+        match = request.resolver_match
+        _read_from_replica.set(
+            request.method in ('GET', 'HEAD')
+            and match is not None and match.url_name in self.views
+            and not self.pinned_to_primary(request)
+        )
+
+    def pinned_to_primary(self, request):
+        try:
+            return int(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,311 @@
+"""
+Per-request performance metrics exposed in Prometheus text format.
+
+``RequestMetricsMiddleware`` measures each request and records it under the
+resolved URL name; ``metrics_view`` serves the aggregated histograms. Values
+are kept in process memory, so each worker reports its own series.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.template.backends.django import Template as DjangoBackendTemplate
+
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_current_request = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, view, value):
+        counts, total = self.series.get(view, ([0] * (len(self.buckets) + 1), 0))
+        counts[bisect_left(self.buckets, value)] += 1
+        self.series[view] = (counts, total + value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for view, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{view="{view}",le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{view}"}} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.series = {}
+
+    def inc(self, view, amount=1):
+        self.series[view] = self.series.get(view, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for view, value in sorted(self.series.items()):
+            lines.append(f'{self.name}{{view="{view}"}} {value}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_duration = Histogram(
+            'eswift_request_duration_seconds', 'Time spent handling the request.', DURATION_BUCKETS)
+        self.db_queries = Histogram(
+            'eswift_db_queries', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS)
+        self.db_duration = Histogram(
+            'eswift_db_query_duration_seconds', 'Time spent in SQL per request.', DURATION_BUCKETS)
+        self.template_duration = Histogram(
+            'eswift_template_render_seconds', 'Time spent rendering templates per request.', DURATION_BUCKETS)
+        self.response_size = Histogram(
+            'eswift_response_size_bytes', 'Size of the response body.', SIZE_BUCKETS)
+        self.cache_hits = Counter('eswift_cache_hits_total', 'Cache lookups that found a value.')
+        self.cache_misses = Counter('eswift_cache_misses_total', 'Cache lookups that found nothing.')
+
+    def record(self, view, stats):
+        with self.lock:
+            self.request_duration.observe(view, stats.duration)
+            self.db_queries.observe(view, stats.query_count)
+            self.db_duration.observe(view, stats.query_time)
+            self.template_duration.observe(view, stats.template_time)
+            if stats.response_size is not None:
+                self.response_size.observe(view, stats.response_size)
+            self.cache_hits.inc(view, stats.cache_hits)
+            self.cache_misses.inc(view, stats.cache_misses)
+
+    def render(self):
+        with self.lock:
+            lines = []
+            for metric in (
+                self.request_duration, self.db_queries, self.db_duration, self.template_duration,
+                self.response_size, self.cache_hits, self.cache_misses,
+            ):
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestStats:
+    """
+    Totals for one request. Queries and cache lookups may be recorded from
+    worker threads running on the request's behalf, so those totals are
+    only changed under the lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.duration = 0.0
+        self.query_count = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.response_size = None
+
+    def add_query(self, elapsed):
+        with self.lock:
+            self.query_count += 1
+            self.query_time += elapsed
+
+    def add_cache_lookups(self, hits, misses):
+        with self.lock:
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(time.perf_counter() - start)
+
+
+def instrument_connection(connection, **kwargs):
+    """
+    Counts the connection's queries toward whichever request is current.
+
+    Every connection gets the wrapper when it opens, on whatever thread, so
+    queries run from worker threads or ASGI's sync threads on behalf of a
+    request are counted without wrapping each call.
+    """
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(instrument_connection)
+
+
+def _instrument_templates():
+    if getattr(DjangoBackendTemplate, '_metrics_instrumented', False):
+        return
+    original_render = DjangoBackendTemplate.render
+
+    def render(self, context=None, request=None):
+        stats = _current_request.get()
+        if stats is None:
+            return original_render(self, context, request)
+        # Only the outermost render is timed so includes are not counted twice.
+        stats.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            stats.template_depth -= 1
+            if stats.template_depth == 0:
+                stats.template_time += time.perf_counter() - start
+
+    DjangoBackendTemplate.render = render
+    DjangoBackendTemplate._metrics_instrumented = True
+
+
+def _instrument_cache(backend):
+    if getattr(backend, '_metrics_instrumented', False):
+        return
+    original_get = backend.get
+    original_get_many = backend.get_many
+    missing = object()
+
+    def get(key, default=None, version=None):
+        value = original_get(key, missing, version=version)
+        stats = _current_request.get()
+        if stats is not None:
+            stats.add_cache_lookups(int(value is not missing), int(value is missing))
+        return default if value is missing else value
+
+    def get_many(keys, version=None):
+        keys = list(keys)
+        values = original_get_many(keys, version=version)
+        stats = _current_request.get()
+        if stats is not None:
+            stats.add_cache_lookups(len(values), len(keys) - len(values))
+        return values
+
+    backend.get = get
+    backend.get_many = get_many
+    backend._metrics_instrumented = True
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or 'unnamed'
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count and time, template render time, cache hits and
+    misses, response size and total duration for every request.
+
+    ``settings.QUERY_BUDGETS`` maps URL names to the maximum number of
+    queries the view may run; ``settings.QUERY_BUDGET_ACTION`` decides
+    whether exceeding it logs a warning (``'log'``) or raises
+    ``QueryBudgetExceeded`` (``'raise'``).
+
+    Runs natively under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.budget_action = getattr(settings, 'QUERY_BUDGET_ACTION', 'log')
+        if self.budget_action not in ('log', 'raise'):
+            raise ImproperlyConfigured("QUERY_BUDGET_ACTION must be 'log' or 'raise'.")
+        _instrument_templates()
+        # Connections opened before this module was imported.
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(stats, token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(stats, token)
+        return self.finish(request, response, stats)
+
+    def start(self, request):
+        _instrument_cache(caches['default'])
+        stats = RequestStats()
+        stats.duration = time.perf_counter()
+        return stats, _current_request.set(stats)
+
+    def stop(self, stats, token):
+        stats.duration = time.perf_counter() - stats.duration
+        _current_request.reset(token)
+
+    def finish(self, request, response, stats):
+        if not response.streaming:
+            stats.response_size = len(response.content)
+        view = _view_name(request)
+        registry.record(view, stats)
+        self.check_query_budget(view, stats)
+        return response
+
+    def check_query_budget(self, view, stats):
+        budget = self.query_budgets.get(view)
+        if budget is None or stats.query_count <= budget:
+            return
+        message = f'{view} ran {stats.query_count} queries, over its budget of {budget}'
+        if self.budget_action == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def metrics_view(request):
+    allowed_ips = getattr(settings, 'METRICS_ALLOWED_IPS', ('127.0.0.1', '::1'))
+    if request.META.get('REMOTE_ADDR') not in allowed_ips:
+        raise PermissionDenied
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
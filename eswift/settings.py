@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api	
@@ -61,15 +61,21 @@ AUTH_USER_MODEL = 'authentication.CustomUser'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'eswift.metrics.RequestMetricsMiddleware',
+    'eswift.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'livereload.middleware.LiveReloadScript',
 ]
 
+# LiveReload is sync-only; outside development it would only make ASGI
+# switch threads on every request.
+if DEBUG:
+    MIDDLEWARE.append('livereload.middleware.LiveReloadScript')
+
 ROOT_URLCONF = 'eswift.urls'
 
 TEMPLATES = [
@@ -90,17 +96,130 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'eswift.wsgi.application'
 
+# Route the home and search pages to their async views. eswift/asgi.py turns
+# this on; under WSGI the sync views are used.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# DB_REPLICAS lists read replicas of the primary: hosts for PostgreSQL, or
+# database file paths for SQLite. Connections are kept open for
+# DB_CONN_MAX_AGE seconds and checked before each request reuses them.
+
+DB_ENGINE = config('DB_ENGINE', default='django.db.backends.sqlite3')
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': DB_ENGINE,
+        'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        'USER': config('DB_USER', default=''),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default=''),
+        'PORT': config('DB_PORT', default=''),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+for number, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    location = {'NAME': replica} if DB_ENGINE.endswith('sqlite3') else {'HOST': replica}
+    DATABASES[f'replica{number}'] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['eswift.db_router.PrimaryReplicaRouter']
+
+# Read-only views (by URL name) whose GET requests may read from a replica,
+# and how long a client reads from the primary after submitting a form.
+REPLICA_VIEWS = (
+    'home', 'about', 'agent', 'blog', 'blog_feed', 'blog_details', 'project', 'project_category',
+    'project_details', 'properties', 'property_category', 'properties_details', 'global_search',
+    'api_properties', 'api_projects', 'api_agents', 'api_blogs',
+)
+REPLICA_STICKY_SECONDS = 15
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Fragment versions must be shared by every worker, so production should
+# point this at a shared backend such as Redis or Memcached.
+
+SESSION_CACHE_BACKEND = config('SESSION_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    },
+    # Sessions get their own alias so clearing the page cache logs nobody
+    # out. The in-memory default is per process, so sessions only use it
+    # once SESSION_CACHE_BACKEND names a shared backend (see SESSION_STORE).
+    'sessions': {
+        'BACKEND': SESSION_CACHE_BACKEND,
+        'LOCATION': config('SESSION_CACHE_LOCATION', default='sessions'),
+    },
+}
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+# Property and project detail pages, cached per slug until the listing changes.
+DETAIL_CACHE_TIMEOUT = 60 * 60
+
+
+# Sessions and messages
+# SESSION_STORE picks where sessions live: 'cached_db' (the sessions cache
+# in front of the database, written through, so reads skip the database),
+# 'cache' (cache only; no database writes at all), 'signed_cookies' (in the
+# client's cookie) or 'db'. It defaults to 'cached_db' when the sessions
+# cache is shared and to 'db' while it is the per-process LocMemCache, where
+# each worker would see its own sessions. Run "manage.py migrate_sessions"
+# before moving from the database to 'cache' so nobody is logged out.
+# MESSAGE_STORE is 'cookie', 'session' or 'fallback' (cookie, then session
+# when too large).
+
+SESSION_ENGINES = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_ENGINE = SESSION_ENGINES[config(
+    'SESSION_STORE', default='db' if SESSION_CACHE_BACKEND.endswith('.LocMemCache') else 'cached_db',
+)]
+SESSION_CACHE_ALIAS = 'sessions'
+
+MESSAGE_STORAGES = {
+    'cookie': 'django.contrib.messages.storage.cookie.CookieStorage',
+    'session': 'django.contrib.messages.storage.session.SessionStorage',
+    'fallback': 'django.contrib.messages.storage.fallback.FallbackStorage',
+}
+MESSAGE_STORAGE = MESSAGE_STORAGES[config('MESSAGE_STORE', default='cookie')]
+
+
+# Rate limiting
+# Token buckets for form POSTs, kept in the shared cache. Each policy allows
+# a burst of "burst" posts, refilled at "rate" (count per s/m/h/d), and
+# counts separately per client address and per submitted email ("by").
+# Set RATE_LIMIT_IP_HEADER to the header a reverse proxy puts the client
+# address in, such as HTTP_X_REAL_IP.
+
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMIT_IP_HEADER = config('RATE_LIMIT_IP_HEADER', default='REMOTE_ADDR')
+RATE_LIMITS = {
+    'newsletter': {'rate': '10/h', 'burst': 3, 'by': ('ip', 'email')},
+    'inquiry': {'rate': '20/h', 'burst': 5, 'by': ('ip', 'email')},
+    'review': {'rate': '20/h', 'burst': 5, 'by': ('ip',)},
+    'signup': {'rate': '10/h', 'burst': 3, 'by': ('ip', 'email')},
+    'login': {'rate': '30/h', 'burst': 10, 'by': ('ip', 'email')},
+}
+
+
+# Request metrics
+# Served at /metrics to the listed addresses. QUERY_BUDGETS maps URL names
+# to the most queries a view may run; QUERY_BUDGET_ACTION is 'log' or 'raise'.
+
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')
+QUERY_BUDGETS = {}
+QUERY_BUDGET_ACTION = 'raise' if DEBUG else 'log'
+
 
 
 # Password validation
@@ -141,6 +260,19 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+
+# collectstatic minifies assets, writes content-hashed names and adds .gz/.br
+# siblings (see eswift/storage.py). Serve STATIC_ROOT with
+# "Cache-Control: public, max-age=31536000, immutable" and let the web server
+# pick the precompressed sibling (nginx gzip_static / brotli_static).
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'eswift.storage.OptimizedStaticFilesStorage',
+    },
+}
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
@@ -217,9 +349,42 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
 
+# Geocoding
+# Listing locations are geocoded offline against this CSV of place names
+# (name, parent, latitude, longitude); "manage.py geocode_listings"
+# backfills coordinates after it changes.
+
+GAZETTEER_PATH = BASE_DIR / 'properties' / 'data' / 'gazetteer.csv'
+
+# Newsletter campaigns
+# Sent by "manage.py send_campaigns --loop" in batches over one SMTP
+# connection. SITE_URL is used for absolute links in the emails.
+
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+CAMPAIGN_BATCH_SIZE = 100
+CAMPAIGN_RATE_LIMIT = config('CAMPAIGN_RATE_LIMIT', default=10, cast=float)
+
+# Notification outbox
+# Inquiry, booking and password-reset emails are written to the outbox in
+# the request's transaction and sent by "manage.py drain_outbox --loop".
+# Inspection bookings go to the listing's agents; other inquiries, and
+# listings without agents, go to INQUIRY_NOTIFICATION_EMAILS.
+
+INQUIRY_NOTIFICATION_EMAILS = config('INQUIRY_NOTIFICATION_EMAILS', default='', cast=Csv())
+
 cloudinary.config(
   	cloud_name = config('CLOUDINARY_CLOUD_NAME'),
   	api_key = config('CLOUDINARY_API_KEY'),
   	api_secret = config('CLOUDINARY_API_SECRET'),
 )
 
+
+# Responsive images
+# IMAGE_SERVICE is 'cloudinary', or 'local' to build derivatives from files
+# under MEDIA_ROOT with Pillow when Cloudinary is not configured.
+
+IMAGE_SERVICE = config('IMAGE_SERVICE', default='cloudinary')
+RESPONSIVE_IMAGE_WIDTHS = (320, 480, 768, 1024)
+RESPONSIVE_IMAGE_FORMATS = ('avif', 'webp')
+# Images a gallery upload sends to the image service at the same time.
+GALLERY_UPLOAD_WORKERS = config('GALLERY_UPLOAD_WORKERS', default=6, cast=int)
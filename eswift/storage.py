@@ -0,0 +1,183 @@
+"""
+Static files storage that optimizes assets during ``collectstatic``.
+
+Every collected CSS, JS and SVG file is minified before it is hashed, raster
+images embedded in SVGs are downscaled, and the hashed files get ``.gz`` and
+``.br`` siblings that a web server can send as-is. Hashed names change
+whenever content does, so they can be cached for a year.
+"""
+import base64
+import gzip
+import io
+import logging
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.html', '.map', '.ico')
+COMPRESS_MIN_SIZE = getattr(settings, 'STATIC_COMPRESS_MIN_SIZE', 1024)
+SVG_MAX_RASTER_SIZE = getattr(settings, 'STATIC_SVG_MAX_RASTER_SIZE', 1600)
+SVG_WARN_SIZE = getattr(settings, 'STATIC_SVG_WARN_SIZE', 512 * 1024)
+
+# Strings, unquoted url() values and comments; whitespace is only collapsed
+# in the text between them.
+CSS_PROTECTED = re.compile(
+    r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\(\s*[^\s'")][^)]*\)|/\*.*?\*/)''', re.S | re.I,
+)
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+XML_COMMENT = re.compile(r'<!--.*?-->', re.S)
+DATA_URI = re.compile(r'data:image/(png|jpe?g);base64,([A-Za-z0-9+/=\s]+)')
+
+
+def shrink_raster(match):
+    """
+    Re-encodes a base64 raster embedded in an SVG, capped at
+    SVG_MAX_RASTER_SIZE pixels on its longest side. The <image> element keeps
+    its width and height, so the SVG renders at the same size.
+    """
+    from PIL import Image
+
+    original = match.group(0)
+    try:
+        image = Image.open(io.BytesIO(base64.b64decode(match.group(2))))
+        image.load()
+    except Exception:
+        return original
+    image.thumbnail((SVG_MAX_RASTER_SIZE, SVG_MAX_RASTER_SIZE), Image.LANCZOS)
+
+    output = io.BytesIO()
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image.save(output, 'PNG', optimize=True)
+        mime = 'png'
+    else:
+        image.convert('RGB').save(output, 'JPEG', quality=80, optimize=True, progressive=True)
+        mime = 'jpeg'
+    replacement = f'data:image/{mime};base64,{base64.b64encode(output.getvalue()).decode()}'
+    return replacement if len(replacement) < len(original) else original
+
+
+def _collapse_css(code):
+    code = CSS_PUNCTUATION.sub(r'\1', re.sub(r'\s+', ' ', code))
+    # Only after a colon: a space before one is a descendant combinator.
+    return re.sub(r':\s+', ':', code).replace(';}', '}')
+
+
+def minify_css(text):
+    output = []
+    code = ''
+    for index, part in enumerate(CSS_PROTECTED.split(text)):
+        if index % 2 == 0:
+            code += part
+        elif part.startswith('/*'):
+            code += ' '
+        else:
+            output += [_collapse_css(code), part]
+            code = ''
+    output.append(_collapse_css(code))
+    return ''.join(output).strip()
+
+
+def minify_svg(text):
+    text = XML_COMMENT.sub('', text)
+    text = re.sub(r'>\s+<', '><', text)
+    return DATA_URI.sub(shrink_raster, text).strip()
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.svg': minify_svg,
+}
+# JavaScript needs a real tokenizer to tell strings, template literals and
+# regular expressions from code; without rjsmin it is only compressed.
+if rjsmin is not None:
+    MINIFIERS['.js'] = rjsmin.jsmin
+
+
+class OptimizedStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage with minification before hashing and
+    precompressed siblings after it.
+
+    Templates still reference some social-card images that were never
+    added, so a file that was not collected is served at its unhashed URL
+    instead of failing the page.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run=dry_run, **options)
+            return
+
+        for path, (storage, source_path) in paths.items():
+            self.minify(path, storage, source_path)
+
+        # Hash the minified copies in this storage rather than the sources.
+        optimized_paths = {path: (self, path) for path in paths}
+        yield from super().post_process(optimized_paths, dry_run=dry_run, **options)
+
+        for hashed_name in set(self.hashed_files.values()):
+            self.compress(hashed_name)
+
+    def minify(self, path, storage, source_path):
+        extension = os.path.splitext(path)[1].lower()
+        minifier = MINIFIERS.get(extension)
+        if minifier is None or path.lower().endswith(('.min.css', '.min.js')):
+            return
+        with storage.open(source_path) as source:
+            original = source.read()
+        try:
+            minified = minifier(original.decode('utf-8')).encode('utf-8')
+        except UnicodeDecodeError:
+            return
+        # Large SVGs that wrap bitmaps are better served as AVIF/WebP files.
+        if extension == '.svg' and b'<image' in original and min(len(minified), len(original)) > SVG_WARN_SIZE:
+            logger.warning(
+                '%s is still %d KB after optimization; serve a raster version instead.',
+                path, min(len(minified), len(original)) // 1024,
+            )
+        if len(minified) >= len(original):
+            return
+
+        if self.exists(path):
+            self.delete(path)
+        self._save(path, ContentFile(minified))
+
+    def compress(self, name):
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+            return
+        with self.open(name) as stored:
+            content = stored.read()
+        if len(content) < COMPRESS_MIN_SIZE:
+            return
+
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(content, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
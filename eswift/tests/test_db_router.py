@@ -0,0 +1,93 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+from django.urls import resolve
+
+from eswift.db_router import (
+    STICKY_COOKIE, PrimaryReplicaRouter, ReplicaRoutingMiddleware, _read_from_replica, primary_reads,
+)
+from properties.models import Property
+from properties.tests.factories import make_property
+from properties.utils.details import load_property_detail
+
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('eswift.db_router.replica_aliases', return_value=['replica1'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+
+    def read_alias(self, request):
+        """
+        Runs ``request`` through the middleware and returns the alias a read
+        would use inside its view.
+        """
+        aliases = []
+
+        def view(request):
+            middleware.process_view(request, None, (), {})
+            aliases.append(self.router.db_for_read(Property))
+            return self.response
+
+        middleware = ReplicaRoutingMiddleware(view)
+        request.resolver_match = resolve(request.path)
+        self.response = mock.MagicMock()
+        middleware(request)
+        return aliases[0]
+
+    def test_listed_views_read_from_a_replica(self):
+        self.assertEqual(self.read_alias(self.factory.get('/properties/')), 'replica1')
+        self.assertEqual(self.read_alias(self.factory.get('/contact/')), 'default')
+        self.assertEqual(self.read_alias(self.factory.post('/properties/')), 'default')
+        # Outside a request everything uses the primary.
+        self.assertEqual(self.router.db_for_read(Property), 'default')
+        self.assertEqual(self.router.db_for_write(Property), 'default')
+
+    def test_a_write_pins_the_client_to_the_primary(self):
+        self.read_alias(self.factory.post('/contact/'))
+        self.response.set_cookie.assert_called_once()
+        self.assertEqual(self.response.set_cookie.call_args.args[0], STICKY_COOKIE)
+
+        request = self.factory.get('/properties/')
+        request.COOKIES[STICKY_COOKIE] = str(int(time.time()) + 10)
+        self.assertEqual(self.read_alias(request), 'default')
+        request.COOKIES[STICKY_COOKIE] = str(int(time.time()) - 10)
+        self.assertEqual(self.read_alias(request), 'replica1')
+
+    def test_primary_reads(self):
+        token = _read_from_replica.set(True)
+        self.addCleanup(_read_from_replica.reset, token)
+        with primary_reads():
+            self.assertEqual(self.router.db_for_read(Property), 'default')
+        self.assertEqual(self.router.db_for_read(Property), 'replica1')
+
+
+class CacheFillTests(TestCase):
+    """
+    The replica alias does not exist here, so these pass only if the
+    cache-filling reads never touch it.
+    """
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('eswift.db_router.replica_aliases', return_value=['replica1'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        token = _read_from_replica.set(True)
+        self.addCleanup(_read_from_replica.reset, token)
+
+    def test_detail_loader_reads_from_the_primary(self):
+        make_property(slug='flat')
+        self.assertEqual(load_property_detail('flat')['listing'].slug, 'flat')
+
+    def test_fragments_are_filled_from_the_primary(self):
+        make_property(title='Cached Flat')
+        template = Template(
+            '{% load fragment_cache %}{% cachefragment "titles" "property" %}'
+            '{% for listing in listings %}{{ listing.title }}{% endfor %}{% endcachefragment %}'
+        )
+        self.assertEqual(template.render(Context({'listings': Property.objects.all()})), 'Cached Flat')
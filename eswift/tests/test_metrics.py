@@ -0,0 +1,68 @@
+import asyncio
+from unittest import mock
+
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+
+from eswift.metrics import MetricsRegistry, QueryBudgetExceeded, RequestStats, _current_request
+from properties.models import Property
+from properties.tests.factories import make_property
+from properties.utils.concurrency import fan_out
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('eswift.metrics.registry', MetricsRegistry())
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_are_recorded_by_url_name(self):
+        make_property(slug='a')
+        self.client.get('/properties/')
+        queries = self.registry.db_queries.series['properties']
+        self.assertEqual(sum(queries[0]), 1)
+        self.assertGreater(queries[1], 0)
+        self.assertEqual(sum(self.registry.response_size.series['properties'][0]), 1)
+        self.assertIn('properties', self.registry.template_duration.series)
+
+    def test_async_requests_are_recorded(self):
+        self.client.get('/')
+        async def get():
+            return await AsyncClient().get('/properties/')
+        self.assertEqual(asyncio.run(get()).status_code, 200)
+        self.assertIn('properties', self.registry.db_queries.series)
+
+    @override_settings(QUERY_BUDGETS={'properties': 1}, QUERY_BUDGET_ACTION='raise')
+    def test_query_budget_can_raise(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'over its budget of 1'):
+            self.client.get('/properties/')
+
+    @override_settings(QUERY_BUDGETS={'properties': 1})
+    def test_query_budget_logs_by_default(self):
+        with self.assertLogs('eswift.metrics', 'WARNING'):
+            self.assertEqual(self.client.get('/properties/').status_code, 200)
+
+    def test_metrics_endpoint(self):
+        self.client.get('/properties/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        self.assertContains(response, 'eswift_db_queries_count{view="properties"} 1')
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.9').status_code, 403)
+
+
+class WorkerQueryTests(TransactionTestCase):
+    """
+    Worker threads open their own connections, which cannot read through
+    an open test transaction.
+    """
+
+    def test_worker_thread_queries_count_toward_the_request(self):
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        try:
+            asyncio.run(fan_out(**{
+                f'call{index}': (lambda: [list(Property.objects.all()[:1]) for _ in range(5)])
+                for index in range(4)
+            }))
+        finally:
+            _current_request.reset(token)
+        self.assertEqual(stats.query_count, 20)
@@ -0,0 +1,80 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from eswift import storage
+from eswift.storage import OptimizedStaticFilesStorage, minify_css, minify_svg
+
+
+class MinifierTests(SimpleTestCase):
+    def test_css_whitespace_and_comments_go(self):
+        self.assertEqual(
+            minify_css('/* header */\n.nav  >  a:hover ,\n.nav b {\n  color: red ;\n  margin: 0 auto;\n}\n'),
+            '.nav>a:hover,.nav b{color:red;margin:0 auto}',
+        )
+
+    def test_css_strings_and_urls_are_kept(self):
+        css = (
+            '.a::before { content: "  a ; b  { } "; }\n'
+            ".b { background: url( 'img/my  file.png' ) no-repeat; }\n"
+            '.c { background: url(img/a.png) ; font-family: "Open  Sans", serif; }\n'
+        )
+        self.assertEqual(minify_css(css), (
+            '.a::before{content:"  a ; b  { } "}'
+            ".b{background:url( 'img/my  file.png' ) no-repeat}"
+            '.c{background:url(img/a.png);font-family:"Open  Sans",serif}'
+        ))
+
+    def test_css_descendant_pseudo_selectors_keep_their_space(self):
+        self.assertEqual(minify_css('.menu :hover { color: red }'), '.menu :hover{color:red}')
+
+    @skipIf(storage.rjsmin is None, 'rjsmin is not installed')
+    def test_js_strings_and_template_literals_are_kept(self):
+        js = 'const a = "x  //  y";\nconst b = `line  one\n  line two`; // note\nconst c = /a  b/g;\n'
+        minified = storage.MINIFIERS['.js'](js)
+        for literal in ('"x  //  y"', '`line  one\n  line two`', '/a  b/g'):
+            self.assertIn(literal, minified)
+        self.assertNotIn('note', minified)
+
+    def test_svg_comments_and_gaps_go(self):
+        self.assertEqual(minify_svg('<svg>\n  <!-- logo -->\n  <path d="M0 0"/>\n</svg>'), '<svg><path d="M0 0"/></svg>')
+
+
+class CollectStaticTests(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.source, 'css'))
+        with open(os.path.join(self.source, 'css', 'site.css'), 'w') as css:
+            css.write('/* site */\nbody {\n  color: #333 ;\n}\n' + '.item { margin : 0 auto ; }\n' * 200)
+
+    def collect(self):
+        with override_settings(
+            STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root, INSTALLED_APPS=['django.contrib.staticfiles'],
+            STORAGES={'staticfiles': {'BACKEND': 'eswift.storage.OptimizedStaticFilesStorage'}},
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            return OptimizedStaticFilesStorage()
+
+    def test_files_are_minified_hashed_and_precompressed(self):
+        static = self.collect()
+        hashed = static.stored_name('css/site.css')
+        self.assertRegex(hashed, r'^css/site\.[0-9a-f]{12}\.css$')
+        with open(os.path.join(self.root, hashed), 'rb') as stored:
+            content = stored.read()
+        self.assertTrue(content.startswith(b'body{color:#333}'))
+        with open(os.path.join(self.root, hashed + '.gz'), 'rb') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), content)
+        if storage.brotli is not None:
+            self.assertTrue(os.path.exists(os.path.join(self.root, hashed + '.br')))
+
+    def test_uncollected_files_keep_their_name(self):
+        static = self.collect()
+        self.assertEqual(static.stored_name('img/missing-card.png'), 'img/missing-card.png')
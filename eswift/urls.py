@@ -4,11 +4,13 @@ from django.urls import path,include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls import handler404
+from eswift.metrics import metrics_view
 
 handler404 = 'properties.views.custom_404'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('authentication.urls')),
     path('', include('properties.urls')),
 ]
@@ -1,15 +1,216 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.utils import timezone
+from django.template.response import TemplateResponse
+from django.urls import path
+from .forms import GalleryUploadForm, ListingImportForm
 from .models import *
+from .utils.campaigns import add_recipients, create_campaign, pause_campaigns, queue_campaigns
+from .utils.exporter import EXPORT_FORMATS, encode_rows, export_kind, export_rows
+from .utils.facets import get_facets
+from .utils.gallery import upload_gallery
+from .utils.importer import detect_format, import_listings, text_stream
+from .utils.outbox import retry_failed
+from .utils.pagination import EstimatedCountPaginator
+from .utils.search import document_type_for, get_backend
+
+
+# Most matches an indexed changelist search returns, best first.
+ADMIN_SEARCH_LIMIT = 500
+
+
+class ListingImportMixin:
+    import_kind = None
+    change_list_template = 'admin/properties/listing_change_list.html'
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='%s_%s_import' % info),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not (self.has_add_permission(request) and self.has_change_permission(request)):
+            raise PermissionDenied
+        form = ListingImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                result = import_listings(self.import_kind, text_stream(upload), detect_format(upload.name))
+            except ValueError as error:
+                messages.error(request, f'Import failed: {error}')
+            else:
+                messages.success(request, f'Import finished: {result}')
+                for line_number, message in result.errors[:20]:
+                    messages.warning(request, f'Line {line_number}: {message}')
+                info = self.model._meta.app_label, self.model._meta.model_name
+                return redirect('admin:%s_%s_changelist' % info)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'form': form,
+            'title': f'Import {self.model._meta.verbose_name_plural}',
+        }
+        return TemplateResponse(request, 'admin/properties/listing_import.html', context)
+
+
+class GalleryUploadMixin:
+    """
+    Adds a page that uploads many gallery images to a listing at once. The
+    page's script posts the files together and lists each file's outcome;
+    without scripts the form posts normally and reports through messages.
+    """
+    change_form_template = 'admin/properties/listing_change_form.html'
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('<path:object_id>/gallery/', self.admin_site.admin_view(self.gallery_view),
+                 name='%s_%s_gallery' % info),
+        ] + super().get_urls()
+
+    def gallery_view(self, request, object_id):
+        listing = get_object_or_404(self.model, pk=object_id)
+        if not self.has_change_permission(request, listing):
+            raise PermissionDenied
+        form = GalleryUploadForm()
+        wants_json = 'application/json' in request.headers.get('Accept', '')
+        if request.method == 'POST':
+            form = GalleryUploadForm(request.POST, request.FILES)
+            if not form.is_valid():
+                if wants_json:
+                    return JsonResponse({'errors': form.errors}, status=400)
+            else:
+                result = upload_gallery(listing, form.cleaned_data['images'])
+                if wants_json:
+                    return JsonResponse({
+                        'files': [{'name': name, 'error': error} for name, error in result.files],
+                        'stored': result.stored,
+                    })
+                messages.success(request, f'Gallery upload finished: {result}')
+                for name, error in result.failed:
+                    messages.warning(request, f'{name}: {error}')
+                info = self.model._meta.app_label, self.model._meta.model_name
+                return redirect('admin:%s_%s_change' % info, listing.pk)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'original': listing,
+            'form': form,
+            'title': f'Upload images to {listing}',
+        }
+        return TemplateResponse(request, 'admin/properties/gallery_upload.html', context)
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for tables too large to count in full on every
+    page view. ``facet_counted`` models take the unfiltered total from
+    their stored facet counts.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    facet_counted = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        known_count = None
+        if self.facet_counted and not queryset.query.where:
+            known_count = get_facets(self.model)['count']
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, known_count=known_count)
+
+class IndexedSearchMixin:
+    """
+    Searches the changelist, and autocomplete widgets pointing at the
+    model, through the full-text search index instead of LIKE scans. Every
+    word matches as a prefix of a word in the indexed text.
+    """
+    search_help_text = 'Matches words starting with each search term.'
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        ids = get_backend().search(document_type_for(self.model), search_term, ADMIN_SEARCH_LIMIT)
+        return queryset.filter(pk__in=ids), False
+
+class EmailSearchMixin:
+    """
+    Searches the changelist by whole email address. An equality lookup is
+    served by the email index on every database, where a LIKE, prefix or
+    case-insensitive match would scan the table; the address is tried as
+    typed and in lower case.
+    """
+    search_fields = ['email']
+    search_help_text = 'Enter a full email address.'
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return queryset.filter(email__in={term, term.lower()}), False
+
+class ExportMixin:
+    """
+    Adds actions that stream the selected rows as CSV or JSON lines. Pick
+    "select all" to export everything the changelist's filters match, such
+    as a created_at date range.
+    """
+    actions = ['export_csv', 'export_jsonl']
+    list_filter = ['created_at']
+
+    def stream_export(self, queryset, file_format):
+        kind = export_kind(self.model)
+        response = StreamingHttpResponse(
+            encode_rows(kind, export_rows(kind, queryset), file_format),
+            content_type=EXPORT_FORMATS[file_format],
+        )
+        filename = f'{kind}-{timezone.localdate():%Y-%m-%d}.{file_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @admin.action(description='Export selected as CSV')
+    def export_csv(self, request, queryset):
+        return self.stream_export(queryset, 'csv')
+
+    @admin.action(description='Export selected as JSON lines')
+    def export_jsonl(self, request, queryset):
+        return self.stream_export(queryset, 'jsonl')
+
+class ContactMessageAdmin(ExportMixin, EmailSearchMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['name', 'email', 'subject', 'created_at']
+    date_hierarchy = 'created_at'
+
+class ProjectContactMessageAdmin(ExportMixin, EmailSearchMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['name', 'email', 'project', 'created_at']
+    list_select_related = ['project']
+    date_hierarchy = 'created_at'
+    autocomplete_fields = ['project']
+
+class InspectionBookingAdmin(ExportMixin, EmailSearchMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['name', 'email', 'property', 'created_at']
+    list_select_related = ['property']
+    date_hierarchy = 'created_at'
+    autocomplete_fields = ['property']
+
+class NewsletterSubscriptionAdmin(ExportMixin, EmailSearchMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['email', 'created_at']
+    date_hierarchy = 'created_at'
 
 class PropertyImageInline(admin.TabularInline):
     model = PropertyImage
     extra = 1
 
 
-class PropertyAdmin(admin.ModelAdmin):
+class PropertyAdmin(
+    ListingImportMixin, GalleryUploadMixin, LargeTableAdminMixin, IndexedSearchMixin, admin.ModelAdmin,
+):
+    import_kind = 'property'
+    facet_counted = True
     inlines = [PropertyImageInline]
-    list_display = ('title', 'price',  'location')
-    search_fields = ('title', 'associated_agent__name') 
+    list_display = ('title', 'price',  'location', 'category', 'agent_names', 'review_count', 'inquiry_count')
+    list_select_related = ('category',)
+    search_fields = ('title', 'location')
+    autocomplete_fields = ('category', 'associated_agent')
 
     fieldsets = (
         ('Basic Information', {
@@ -18,9 +219,20 @@ class PropertyAdmin(admin.ModelAdmin):
         ('Additional Information', {
             'fields': ('living_room', 'dining' ,'no_of_bedrooms', 'no_of_bathrooms', 'no_of_floors', 'features', 'associated_agent', 'slug')
         }),
+        ('Map Position', {
+            'description': 'Filled in from the location when left blank.',
+            'fields': ('latitude', 'longitude')
+        }),
     )
     
     prepopulated_fields = {'slug': ('title',)} 
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('associated_agent')
+
+    @admin.display(description='Agents')
+    def agent_names(self, obj):
+        return ', '.join(agent.name for agent in obj.associated_agent.all())
     
 class PropertyImageAdmin(admin.ModelAdmin):
     list_display = [ 'associated_property_image']
@@ -30,10 +242,16 @@ class ProjectImageInline(admin.TabularInline):
     extra = 1
 
 
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(
+    ListingImportMixin, GalleryUploadMixin, LargeTableAdminMixin, IndexedSearchMixin, admin.ModelAdmin,
+):
+    import_kind = 'project'
+    facet_counted = True
     inlines = [ProjectImageInline]
-    list_display = ('title', 'price',  'location')
-    search_fields = ('title', 'status') 
+    list_display = ('title', 'price',  'location', 'category', 'review_count', 'inquiry_count')
+    list_select_related = ('category',)
+    search_fields = ('title', 'location')
+    autocomplete_fields = ('category',)
 
     fieldsets = (
         ('Basic Information', {
@@ -42,6 +260,10 @@ class ProjectAdmin(admin.ModelAdmin):
         ('Additional Information', {
             'fields': ('no_of_block', 'no_of_flat', 'no_of_floors', 'slug')
         }),
+        ('Map Position', {
+            'description': 'Filled in from the location when left blank.',
+            'fields': ('latitude', 'longitude')
+        }),
     )
     
     prepopulated_fields = {'slug': ('title',)} 
@@ -49,19 +271,93 @@ class ProjectAdmin(admin.ModelAdmin):
 class ProjectImageAdmin(admin.ModelAdmin):
     list_display = [ 'associated_project_image']
 
+
+class AgentAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    list_display = ['name', 'email', 'phone_number']
+    search_fields = ['name', 'email']
+    ordering = ['name']
+
+class CategoryAdmin(admin.ModelAdmin):
+    search_fields = ['name']
+    ordering = ['name']
+
+class Property_ReviewAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['property', 'user', 'created_at']
+    list_select_related = ['property', 'user']
+    autocomplete_fields = ['property']
+    raw_id_fields = ['user']
+    date_hierarchy = 'created_at'
+
+class Project_ReviewAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['project', 'user', 'created_at']
+    list_select_related = ['project', 'user']
+    autocomplete_fields = ['project']
+    raw_id_fields = ['user']
+    date_hierarchy = 'created_at'
+
+class BlogAdmin(admin.ModelAdmin):
+    actions = ['create_newsletter_campaign']
+
+    @admin.action(description='Create newsletter campaign')
+    def create_newsletter_campaign(self, request, queryset):
+        for blog in queryset:
+            campaign = create_campaign(blog)
+            messages.success(request, f'Created draft campaign "{campaign}" for {campaign.total_recipients} subscribers')
+
+class NewsletterCampaignAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'blog', 'status', 'total_recipients', 'sent_count', 'failed_count', 'updated']
+    list_filter = ['status']
+    list_select_related = ['blog']
+    readonly_fields = ['status', 'total_recipients', 'sent_count', 'failed_count', 'started_at', 'finished_at']
+    actions = ['queue', 'pause']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            add_recipients(obj)
+
+    @admin.action(description='Queue for sending')
+    def queue(self, request, queryset):
+        messages.success(request, f'Queued {queue_campaigns(queryset)} campaigns')
+
+    @admin.action(description='Pause sending')
+    def pause(self, request, queryset):
+        messages.success(request, f'Paused {pause_campaigns(queryset)} campaigns')
+
+class CampaignRecipientAdmin(admin.ModelAdmin):
+    list_display = ['email', 'campaign', 'status', 'sent_at', 'error']
+    list_filter = ['status', 'campaign']
+    list_select_related = ['campaign']
+    search_fields = ['email']
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'kind', 'status', 'attempts', 'next_attempt_at', 'created', 'sent_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['subject']
+    readonly_fields = ['kind', 'subject', 'body', 'html_body', 'from_email', 'recipients', 'reply_to', 'status',
+                       'attempts', 'next_attempt_at', 'claim', 'last_error', 'created', 'sent_at']
+    actions = ['retry']
+
+    @admin.action(description='Retry failed messages now')
+    def retry(self, request, queryset):
+        messages.success(request, f'Requeued {retry_failed(queryset)} messages')
+
     
-admin.site.register(Agent)
+admin.site.register(Agent, AgentAdmin)
 admin.site.register(Staff)
-admin.site.register(Blog)
+admin.site.register(Blog, BlogAdmin)
 admin.site.register(Property, PropertyAdmin)
-admin.site.register(Project_Review)
-admin.site.register(Property_Review)
-admin.site.register(InspectionBooking)
-admin.site.register(NewsletterSubscription)
+admin.site.register(Project_Review, Project_ReviewAdmin)
+admin.site.register(Property_Review, Property_ReviewAdmin)
+admin.site.register(InspectionBooking, InspectionBookingAdmin)
+admin.site.register(NewsletterSubscription, NewsletterSubscriptionAdmin)
+admin.site.register(NewsletterCampaign, NewsletterCampaignAdmin)
+admin.site.register(CampaignRecipient, CampaignRecipientAdmin)
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
 admin.site.register(Project,ProjectAdmin)
-admin.site.register(Project_Category)
+admin.site.register(Project_Category, CategoryAdmin)
 admin.site.register(ProjectImage, ProjectImageAdmin)
 admin.site.register(PropertyImage,PropertyImageAdmin)
-admin.site.register(ContactMessage)
-admin.site.register(ProjectContactMessage)
-admin.site.register(Property_Category)
\ No newline at end of file
+admin.site.register(ContactMessage, ContactMessageAdmin)
+admin.site.register(ProjectContactMessage, ProjectContactMessageAdmin)
+admin.site.register(Property_Category, CategoryAdmin)
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Read-only JSON endpoints for listings, agents and blog posts.
+
+Each endpoint takes the same filters as its HTML page, ``fields`` to pick
+the attributes returned, ``limit`` and the ``page`` cursor from the
+previous response. Rows are read with ``values()`` and serialized straight
+from the dicts, and responses carry an ETag so polling clients get a
+bodyless 304 while nothing has changed.
+"""
+import hashlib
+
+from django.db.models import Q
+from django.http import HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_safe
+
+from .models import Agent, Blog, Project, Property
+from .utils.cache import get_model_versions
+from .utils.pagination import CursorPaginator
+from .views import PROJECT_NUMBER_FILTERS, PROPERTY_NUMBER_FILTERS, filter_listings
+
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def image_url(image):
+    return image.url if image else None
+
+
+def detail_url(url_name):
+    def url(slug):
+        return reverse(url_name, args=[slug]) if slug else None
+    return url
+
+
+def filter_properties(request, queryset):
+    if request.GET.get('category'):
+        queryset = queryset.filter(category__name=request.GET['category'])
+    return filter_listings(request, queryset, PROPERTY_NUMBER_FILTERS)[:2]
+
+
+def filter_projects(request, queryset):
+    if request.GET.get('category'):
+        queryset = queryset.filter(category__name=request.GET['category'])
+    return filter_listings(request, queryset, PROJECT_NUMBER_FILTERS)[:2]
+
+
+def filter_agents(request, queryset):
+    if request.GET.get('query'):
+        queryset = queryset.filter(name__icontains=request.GET['query'])
+    return queryset, ('-id',)
+
+
+def filter_blogs(request, queryset):
+    query = request.GET.get('query')
+    if query:
+        queryset = queryset.filter(
+            Q(title__icontains=query) | Q(description__icontains=query) | Q(category__icontains=query)
+        )
+    return queryset, ('-id',)
+
+
+# Each resource maps its public field names to a values() column, or to a
+# (column, function) pair for fields computed from a column.
+API_RESOURCES = {
+    'properties': {
+        'model': Property,
+        'versions': ('property', 'property_category'),
+        'filter': filter_properties,
+        'fields': {
+            'id': 'id', 'slug': 'slug', 'title': 'title', 'availability': 'availability',
+            'location': 'location', 'property_type': 'property_type', 'category': 'category__name',
+            'price': 'price', 'living_room': 'living_room', 'dining': 'dining',
+            'no_of_bedrooms': 'no_of_bedrooms', 'no_of_bathrooms': 'no_of_bathrooms',
+            'no_of_floors': 'no_of_floors', 'features': 'features', 'thumbnail': ('thumbnail', image_url),
+            'latitude': 'latitude', 'longitude': 'longitude', 'review_count': 'review_count',
+            'image_count': 'image_count', 'created': 'created', 'updated': 'updated',
+            'url': ('slug', detail_url('properties_details')),
+        },
+        'default_fields': (
+            'id', 'slug', 'title', 'availability', 'location', 'category', 'price',
+            'no_of_bedrooms', 'no_of_bathrooms', 'thumbnail', 'updated', 'url',
+        ),
+    },
+    'projects': {
+        'model': Project,
+        'versions': ('project', 'project_category'),
+        'filter': filter_projects,
+        'fields': {
+            'id': 'id', 'slug': 'slug', 'title': 'title', 'location': 'location', 'price': 'price',
+            'status': 'status', 'category': 'category__name', 'no_of_block': 'no_of_block',
+            'no_of_flat': 'no_of_flat', 'no_of_floors': 'no_of_floors', 'thumbnail': ('thumbnail', image_url),
+            'latitude': 'latitude', 'longitude': 'longitude', 'review_count': 'review_count',
+            'image_count': 'image_count', 'created': 'created', 'updated': 'updated',
+            'url': ('slug', detail_url('project_details')),
+        },
+        'default_fields': (
+            'id', 'slug', 'title', 'location', 'status', 'category', 'price', 'thumbnail', 'updated', 'url',
+        ),
+    },
+    'agents': {
+        'model': Agent,
+        'versions': ('agent',),
+        'filter': filter_agents,
+        'fields': {
+            'id': 'id', 'name': 'name', 'phone_number': 'phone_number', 'email': 'email',
+            'image': ('image', image_url),
+        },
+        'default_fields': ('id', 'name', 'phone_number', 'email', 'image'),
+    },
+    'blogs': {
+        'model': Blog,
+        'versions': ('blog',),
+        'filter': filter_blogs,
+        'fields': {
+            'id': 'id', 'slug': 'slug', 'title': 'title', 'category': 'category',
+            'description': 'description', 'content': 'content', 'image': ('image', image_url),
+            'created_at': 'created_at', 'url': ('slug', detail_url('blog_details')),
+        },
+        'default_fields': ('id', 'slug', 'title', 'category', 'description', 'image', 'created_at', 'url'),
+    },
+}
+
+
+def error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def page_etag(resource, request, rows):
+    """
+    Derives the ETag of a page from the query, the resource's cache versions
+    (bumped on every save and delete) and each row's id and ``updated``.
+    """
+    parts = [request.get_full_path(), *map(str, get_model_versions(*resource['versions']))]
+    parts += [f"{row['id']}:{row.get('updated', '')}" for row in rows]
+    digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    return quote_etag(digest)
+
+
+@require_safe
+def resource_list(request, resource_name):
+    resource = API_RESOURCES[resource_name]
+    fields = resource['default_fields']
+    if request.GET.get('fields'):
+        fields = [name.strip() for name in request.GET['fields'].split(',') if name.strip()]
+        unknown = [name for name in fields if name not in resource['fields']]
+        if unknown:
+            return error(f"Unknown fields: {', '.join(unknown)}")
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        return error('limit must be a whole number')
+
+    queryset, ordering = resource['filter'](request, resource['model'].objects.all())
+    columns = {spec if isinstance(spec, str) else spec[0] for spec in map(resource['fields'].get, fields)}
+    # The cursor and ETag need the ordering columns, id and updated.
+    columns.update(name.lstrip('-') for name in ordering)
+    columns.add('id')
+    if 'updated' in resource['fields']:
+        columns.add('updated')
+    queryset = queryset.values(*sorted(columns))
+
+    page = CursorPaginator(queryset, limit, ordering=ordering).page(request.GET.get('page'))
+    etag = page_etag(resource, request, page.object_list)
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    client_etags = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+    if etag in client_etags or '*' in client_etags:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    results = []
+    for row in page.object_list:
+        item = {}
+        for name in fields:
+            spec = resource['fields'][name]
+            item[name] = row[spec] if isinstance(spec, str) else spec[1](row[spec[0]])
+        if 'distance_km' in row:
+            item['distance_km'] = round(row['distance_km'], 3)
+        results.append(item)
+    response = JsonResponse(
+        {'results': results, 'next': page.next_cursor, 'previous': page.previous_cursor},
+        json_dumps_params={'separators': (',', ':')},
+    )
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,72 @@
+"""
+Async versions of the busiest public pages, routed in place of the sync
+views when ``settings.ASYNC_VIEWS`` is on (the default under ASGI).
+
+Their independent queries run concurrently through ``fan_out``; templates
+are rendered once all data is loaded. Data behind a cached fragment is not
+loaded at all. Form submissions are handed to the sync views unchanged.
+"""
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+from django.utils.functional import SimpleLazyObject
+
+from eswift.db_router import primary_reads
+
+from . import views
+from .forms import NewsletterSubscriptionForm
+from .models import Agent, Project, Property
+from .utils.cache import missing_fragments
+from .utils.concurrency import fan_out
+from .utils.search import SEARCH_DOCUMENTS, search_type
+
+
+# Each home page context value: the fragment it is rendered in, and how to
+# load it.
+HOME_CONTEXT = {
+    'recent_properties': (
+        ('home-properties', ('property',)), lambda: list(Property.objects.order_by('-created')[:3]),
+    ),
+    'recent_projects': (
+        ('home-projects', ('project',)), lambda: list(Project.objects.order_by('-created')[:3]),
+    ),
+    'agents': (('home-agents', ('agent',)), lambda: list(Agent.objects.order_by('-id')[:3])),
+    'blog_page': (('blog-list', ('blog',)), views.blog_feed_page),
+}
+
+
+async def home(request):
+    if request.method != 'GET':
+        return await sync_to_async(views.home)(request)
+    missing = await sync_to_async(missing_fragments)({
+        name: fragment for name, (fragment, _load) in HOME_CONTEXT.items()
+    })
+    # What is loaded here fills the missing fragments, so it must not come
+    # from a lagging replica.
+    with primary_reads():
+        context = await fan_out(**{name: HOME_CONTEXT[name][1] for name in missing})
+    # A fragment may still expire before the template reads it; load those
+    # lazily like the sync view does.
+    for name, (_fragment, load) in HOME_CONTEXT.items():
+        context.setdefault(name, SimpleLazyObject(load))
+    context['form'] = NewsletterSubscriptionForm()
+    return await sync_to_async(render)(request, 'home.html', context)
+
+
+async def global_search(request):
+    if request.method != 'GET':
+        return await sync_to_async(views.global_search)(request)
+    query = request.GET.get('query')
+    results = {doc_type: [] for doc_type in SEARCH_DOCUMENTS}
+    if query:
+        results = await fan_out(**{
+            doc_type: partial(search_type, doc_type, query) for doc_type in SEARCH_DOCUMENTS
+        })
+    context = {
+        'query': query,
+        'results': results,
+        'form': NewsletterSubscriptionForm(),
+        'any_results_found': any(results.values()),
+    }
+    return await sync_to_async(render)(request, 'global_search.html', context)
@@ -32,4 +32,25 @@ class ProjectContactForm(forms.Form):
 
         
 class ReviewForm(forms.Form):
-    comment = forms.CharField(widget=forms.Textarea)
\ No newline at end of file
+    comment = forms.CharField(widget=forms.Textarea)
+
+class ListingImportForm(forms.Form):
+    file = forms.FileField(help_text='CSV (.csv) or JSON lines (.jsonl)')
+
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+class MultipleFileField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', MultipleFileInput(attrs={'accept': 'image/*'}))
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        # Each file is checked when it is stored, so one bad file does not
+        # reject the rest.
+        if isinstance(data, (list, tuple)) and data:
+            return [super(MultipleFileField, self).clean(item, initial) for item in data]
+        return [super().clean(data, initial)]
+
+class GalleryUploadForm(forms.Form):
+    images = MultipleFileField(help_text='JPEG, PNG, WebP, AVIF or GIF images')
@@ -0,0 +1,174 @@
+import json
+import math
+import time
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, _TestState, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from authentication import urls as authentication_urls
+from authentication.models import CustomUser
+from properties import urls as properties_urls
+from properties.models import Blog, Project, Project_Category, Property
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks every public route through the test client and reports latency and query counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--cold-cache', action='store_true', help='Clear the cache before every request')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare against a previous JSON result file')
+        parser.add_argument('--max-latency-ratio', type=float, default=1.25,
+                            help='Flag routes whose p95 grew by more than this factor')
+        parser.add_argument('--max-extra-queries', type=int, default=0,
+                            help='Flag routes that run more than this many extra queries')
+
+    def handle(self, *args, **options):
+        # Inside a test run the environment is already set up.
+        own_environment = not hasattr(_TestState, 'saved_data')
+        if own_environment:
+            setup_test_environment()
+        try:
+            scenarios = self.scenarios()
+            results = {
+                name: self.measure(url, options)
+                for name, url in scenarios
+            }
+        finally:
+            if own_environment:
+                teardown_test_environment()
+
+        report = {
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'cold_cache': options['cold_cache'],
+            'results': results,
+        }
+        self.print_report(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = self.compare(baseline['results'], results, options)
+            if regressions:
+                raise CommandError('Performance regressions:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def scenarios(self):
+        """
+        Builds one URL per named route in the properties and authentication
+        apps, filling path arguments from existing rows, plus a few common
+        filtered and search requests.
+        """
+        property_obj = Property.objects.exclude(slug=None).first()
+        project_obj = Project.objects.exclude(slug=None).first()
+        blog_obj = Blog.objects.exclude(slug=None).first()
+        project_category = Project_Category.objects.first()
+        user = CustomUser.objects.first()
+
+        arguments = {
+            'project_slug': project_obj and project_obj.slug,
+            'property_slug': property_obj and property_obj.slug,
+            'slug': blog_obj and blog_obj.slug,
+            'category_name': project_category and project_category.name,
+            'uidb64': user and urlsafe_base64_encode(force_bytes(user.pk)),
+            'token': user and default_token_generator.make_token(user),
+        }
+
+        scenarios = []
+        seen = set()
+        for urlconf in (properties_urls, authentication_urls):
+            for pattern in urlconf.urlpatterns:
+                if not isinstance(pattern, URLPattern) or not pattern.name or pattern.name in seen:
+                    continue
+                seen.add(pattern.name)
+                kwargs = {name: arguments.get(name) for name in pattern.pattern.converters}
+                if any(value is None for value in kwargs.values()):
+                    self.stdout.write(self.style.WARNING(f'Skipping {pattern.name}: no data to build its URL'))
+                    continue
+                scenarios.append((pattern.name, reverse(pattern.name, kwargs=kwargs)))
+
+        scenarios += [
+            ('properties:filtered', reverse('properties') + '?keyword=bedroom&bedrooms=3'),
+            ('project:filtered', reverse('project') + '?location=lekki&floor=4'),
+            ('global_search:query', reverse('global_search') + '?query=lekki'),
+            ('blog:query', reverse('blog') + '?query=market'),
+        ]
+        return scenarios
+
+    def measure(self, url, options):
+        client = Client(raise_request_exception=False)
+        for _ in range(options['warmup']):
+            client.get(url)
+
+        timings = []
+        query_counts = []
+        status = None
+        size = 0
+        for _ in range(options['iterations']):
+            if options['cold_cache']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            query_counts.append(len(queries))
+            status = response.status_code
+            size = len(response.content) if not response.streaming else 0
+
+        return {
+            'url': url,
+            'status': status,
+            'bytes': size,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries': max(query_counts),
+        }
+
+    def print_report(self, results):
+        self.stdout.write(f"{'route':<28}{'status':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<28}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['queries']:>9}"
+            )
+
+    def compare(self, baseline, results, options):
+        regressions = []
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            if previous['p95_ms'] and result['p95_ms'] > previous['p95_ms'] * options['max_latency_ratio']:
+                regressions.append(
+                    f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms"
+                )
+            if result['queries'] > previous['queries'] + options['max_extra_queries']:
+                regressions.append(
+                    f"{name}: queries {previous['queries']} -> {result['queries']}"
+                )
+        return regressions
@@ -0,0 +1,118 @@
+import asyncio
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import _TestState, setup_test_environment, teardown_test_environment
+from django.urls import clear_url_caches, reverse
+
+from properties.models import Property
+from .benchmark import percentile
+
+
+def load_urls():
+    # properties.urls picks its views when imported, so reload it (and the
+    # root URLconf that includes it) after switching ASYNC_VIEWS.
+    from eswift import urls as root_urls
+    from properties import urls as properties_urls
+    importlib.reload(properties_urls)
+    importlib.reload(root_urls)
+    clear_url_caches()
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends concurrent requests to the home and search pages through the sync '
+        '(WSGI) and async (ASGI) views and compares latency and throughput'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Paths to request (default: home and search)')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per path and mode')
+
+    def handle(self, *args, **options):
+        if not Property.objects.exists():
+            raise CommandError('No listings to measure; run seed_data first.')
+        paths = options['paths'] or [reverse('home'), reverse('global_search') + '?query=lekki']
+
+        own_environment = not hasattr(_TestState, 'saved_data')
+        if own_environment:
+            setup_test_environment()
+        try:
+            results = {}
+            for mode, run in (('wsgi', self.run_sync), ('asgi', self.run_async)):
+                with override_settings(ASYNC_VIEWS=mode == 'asgi'):
+                    load_urls()
+                    for path in paths:
+                        results[mode, path] = run(path, options)
+            load_urls()
+        finally:
+            if own_environment:
+                teardown_test_environment()
+
+        self.print_report(paths, results)
+
+    def run_sync(self, path, options):
+        local = threading.local()
+
+        def fetch(_):
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+            start = time.perf_counter()
+            status = local.client.get(path).status_code
+            return status, (time.perf_counter() - start) * 1000
+
+        def worker_done(_):
+            close_old_connections()
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            list(pool.map(fetch, range(options['concurrency'])))  # warm up
+            start = time.perf_counter()
+            responses = list(pool.map(fetch, range(options['requests'])))
+            elapsed = time.perf_counter() - start
+            list(pool.map(worker_done, range(options['concurrency'])))
+        return self.summarize(responses, elapsed)
+
+    def run_async(self, path, options):
+        async def run():
+            client = AsyncClient(raise_request_exception=False)
+            limit = asyncio.Semaphore(options['concurrency'])
+
+            async def fetch():
+                async with limit:
+                    start = time.perf_counter()
+                    response = await client.get(path)
+                    return response.status_code, (time.perf_counter() - start) * 1000
+
+            await asyncio.gather(*(fetch() for _ in range(options['concurrency'])))  # warm up
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(fetch() for _ in range(options['requests'])))
+            return responses, time.perf_counter() - start
+
+        responses, elapsed = asyncio.run(run())
+        return self.summarize(responses, elapsed)
+
+    def summarize(self, responses, elapsed):
+        timings = [timing for _, timing in responses]
+        return {
+            'errors': sum(1 for status, _ in responses if status >= 400),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'rps': round(len(responses) / elapsed, 1),
+        }
+
+    def print_report(self, paths, results):
+        self.stdout.write(f"{'path':<32}{'mode':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>9}{'errors':>8}")
+        for path in paths:
+            for mode in ('wsgi', 'asgi'):
+                result = results[mode, path]
+                self.stdout.write(
+                    f"{path:<32}{mode:>6}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                    f"{result['p99_ms']:>10.2f}{result['rps']:>9.1f}{result['errors']:>8}"
+                )
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from properties.utils.outbox import OUTBOX_BATCH_SIZE, drain
+
+
+class Command(BaseCommand):
+    help = 'Sends queued outbox emails with a pool of workers; with --loop it keeps running in the background'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new messages')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls when idle')
+
+    def handle(self, *args, **options):
+        self.sent = 0
+        self.lock = threading.Lock()
+        workers = [
+            threading.Thread(target=self.work, args=(options,), name=f'outbox-{number}', daemon=True)
+            for number in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping; messages in flight are retried after their lease expires')
+        self.stdout.write(self.style.SUCCESS(f'Processed {self.sent} outbox messages'))
+
+    def work(self, options):
+        try:
+            while True:
+                processed = drain(options['batch_size'])
+                with self.lock:
+                    self.sent += processed
+                if processed:
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            # Every thread has its own database connection.
+            connection.close()
@@ -0,0 +1,153 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from properties.models import Project, Property
+from properties.utils.indexes import TEXT_SEARCH_COLUMNS, model_index_names, text_index_name
+from properties.utils.pagination import DEFAULT_ORDERING
+
+
+PAGE_SIZE = 9
+
+
+def scenarios():
+    """
+    The listing queries the properties and project pages run, one per
+    common filter combination, limited to one page like the views.
+    """
+    property_category = Property.objects.values_list('category_id', flat=True).first()
+    project_category = Project.objects.values_list('category_id', flat=True).first()
+    properties = Property.objects.order_by(*DEFAULT_ORDERING)
+    projects = Project.objects.order_by(*DEFAULT_ORDERING)
+    return [
+        ('properties', properties),
+        ('properties:category', properties.filter(category_id=property_category)),
+        ('properties:bedrooms', properties.filter(no_of_bedrooms=3)),
+        ('properties:rooms', properties.filter(no_of_bedrooms=3, no_of_bathrooms=3, no_of_floors=2)),
+        ('properties:location', properties.filter(location__icontains='lekki')),
+        ('properties:keyword', properties.filter(title__icontains='duplex')),
+        ('properties:newest', Property.objects.order_by('-created')),
+        ('projects', projects),
+        ('projects:category', projects.filter(category_id=project_category)),
+        ('projects:units', projects.filter(no_of_block=4, no_of_flat=24)),
+        ('projects:location', projects.filter(location__icontains='lekki')),
+        ('projects:newest', Project.objects.order_by('-created')),
+    ]
+
+
+def explain(queryset, label):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        # The label keeps the statement text unique per pass; SQLite would
+        # otherwise reuse the cached plan from before the indexes were dropped.
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql} /* {label} */', params)
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def full_scan(plan):
+    """
+    True when the plan reads a whole table instead of an index.
+    """
+    if connection.vendor == 'postgresql':
+        return 'Seq Scan' in plan
+    if connection.vendor == 'sqlite':
+        return any(
+            'SCAN ' in line and 'USING' not in line
+            for line in plan.splitlines()
+        )
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Explains and times the listing filter queries, and with --compare repeats them '
+        'with the listing indexes dropped inside a rolled-back transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--compare', action='store_true',
+                            help='Also measure without the listing indexes (changes are rolled back)')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Refresh the planner statistics first')
+        parser.add_argument('--plans', action='store_true', help='Print every query plan')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if not Property.objects.exists():
+            raise CommandError('No listings to measure; run seed_data first.')
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        existing = self.existing_indexes()
+        missing = [name for name in model_index_names(Property, Project) if name not in existing]
+        if missing:
+            self.stdout.write(self.style.WARNING(
+                f"Missing indexes {', '.join(missing)}; run makemigrations and migrate first."
+            ))
+
+        results = {'with_indexes': self.measure('with_indexes', options)}
+        if options['compare']:
+            with transaction.atomic():
+                self.drop_indexes(existing)
+                results['without_indexes'] = self.measure('without_indexes', options)
+                transaction.set_rollback(True)
+
+        self.print_report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'database': connection.vendor, 'rows': Property.objects.count(), **results},
+                          output, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    def existing_indexes(self):
+        names = set()
+        with connection.cursor() as cursor:
+            for model in (Property, Project):
+                names.update(connection.introspection.get_constraints(cursor, model._meta.db_table))
+        return names
+
+    def drop_indexes(self, existing):
+        names = model_index_names(Property, Project)
+        names += [text_index_name(model, column) for model, column in TEXT_SEARCH_COLUMNS]
+        with connection.cursor() as cursor:
+            for name in names:
+                if name in existing:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+
+    def measure(self, label, options):
+        results = {}
+        for name, queryset in scenarios():
+            queryset = queryset[:PAGE_SIZE + 1]
+            plan = explain(queryset, label)
+            timings = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {
+                'median_ms': round(statistics.median(timings), 3),
+                'full_scan': full_scan(plan),
+                'plan': plan,
+            }
+            if options['plans']:
+                self.stdout.write(f'{label} {name}:\n{plan}\n')
+        return results
+
+    def print_report(self, results):
+        with_indexes = results['with_indexes']
+        without_indexes = results.get('without_indexes', {})
+        self.stdout.write(f"{'query':<24}{'indexed ms':>12}{'scan':>7}{'unindexed ms':>14}{'scan':>7}")
+        for name, result in with_indexes.items():
+            line = f"{name:<24}{result['median_ms']:>12.3f}{self.scan_label(result):>7}"
+            if name in without_indexes:
+                before = without_indexes[name]
+                line += f"{before['median_ms']:>14.3f}{self.scan_label(before):>7}"
+            self.stdout.write(line)
+
+    def scan_label(self, result):
+        return {True: 'full', False: 'index', None: '?'}[result['full_scan']]
@@ -0,0 +1,32 @@
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.utils.exporter import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORT_SPECS, encode_rows, export_rows
+
+
+class Command(BaseCommand):
+    help = 'Streams contact messages, inspection bookings or newsletter subscribers to CSV or JSON lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORT_SPECS))
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--since', type=date.fromisoformat, help='First day to include (YYYY-MM-DD)')
+        parser.add_argument('--until', type=date.fromisoformat, help='Last day to include (YYYY-MM-DD)')
+        parser.add_argument('--output', help='File to write (default: standard output)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            options['kind'], since=options['since'], until=options['until'], chunk_size=options['chunk_size'],
+        )
+        chunks = encode_rows(options['kind'], rows, options['format'])
+        try:
+            if options['output']:
+                with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                    output.writelines(chunks)
+            else:
+                sys.stdout.writelines(chunks)
+        except OSError as error:
+            raise CommandError(error)
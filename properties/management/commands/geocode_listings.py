@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from properties.models import Project, Property
+from properties.utils.cache import bump_model_version
+from properties.utils.geo import geocode_missing
+
+
+class Command(BaseCommand):
+    help = 'Geocodes listings that have no coordinates from their location text'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Re-geocode every listing, replacing hand-entered coordinates')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in (Property, Project):
+            located = geocode_missing(model, everything=options['all'], batch_size=options['batch_size'])
+            bump_model_version(model)
+            self.stdout.write(self.style.SUCCESS(
+                f'Located {located} {model._meta.verbose_name_plural.lower()}'
+            ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.utils.importer import detect_format, import_listings
+
+
+class Command(BaseCommand):
+    help = 'Imports properties or projects from a CSV or JSON-lines file, upserting by slug'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['property', 'project'])
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--no-create-categories', action='store_true',
+                            help='Reject rows whose category does not exist yet')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['path'])
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                result = import_listings(
+                    options['kind'], stream, file_format,
+                    batch_size=options['batch_size'],
+                    create_categories=not options['no_create_categories'],
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+
+        for line_number, message in result.errors:
+            self.stderr.write(f'Line {line_number}: {message}')
+        self.stdout.write(self.style.SUCCESS(f'Import finished: {result}'))
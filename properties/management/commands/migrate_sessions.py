@@ -0,0 +1,53 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies unexpired database sessions into the sessions cache so switching '
+        'SESSION_STORE to "cache" (or warming "cached_db") logs nobody out'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--delete', action='store_true',
+            help='Delete the database rows once copied (only with the "cache" store)',
+        )
+
+    def handle(self, *args, **options):
+        engine = settings.SESSION_ENGINE
+        if not engine.endswith(('.cache', '.cached_db')):
+            # Signed-cookie sessions live in the browser and database sessions
+            # are already in place, so there is nothing to copy.
+            self.stdout.write(f'{engine} does not read from the sessions cache; nothing to migrate.')
+            return
+
+        store_class = import_module(engine).SessionStore
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        now = timezone.now()
+        sessions = Session.objects.filter(expire_date__gt=now).order_by('pk')
+        copied = 0
+        last_key = ''
+        while True:
+            batch = list(sessions.filter(pk__gt=last_key)[:options['batch_size']])
+            if not batch:
+                break
+            last_key = batch[-1].pk
+            # Keep each session's own expiry rather than restarting the clock.
+            for session in batch:
+                timeout = int((session.expire_date - now).total_seconds())
+                cache.set(store_class(session.session_key).cache_key, session.get_decoded(), timeout)
+            copied += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Copied {copied} sessions into the "{settings.SESSION_CACHE_ALIAS}" cache'
+        ))
+        if options['delete'] and engine.endswith('.cache'):
+            deleted, _ = Session.objects.all().delete()
+            self.stdout.write(f'Deleted {deleted} database sessions')
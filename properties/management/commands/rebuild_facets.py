@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from properties.models import Project, Property
+from properties.utils.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the precomputed listing facets used by the properties and project pages'
+
+    def handle(self, *args, **options):
+        for model in (Property, Project):
+            categories = rebuild_facets(model)
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt {model._meta.verbose_name} facets for {categories} categories'
+            ))
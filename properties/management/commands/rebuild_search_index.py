@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from properties.utils.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text index used by the global search page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        counts = rebuild_index(chunk_size=options['chunk_size'])
+        for doc_type, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {doc_type}'))
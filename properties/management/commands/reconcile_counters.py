@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from properties.models import Project, Property
+from properties.utils.counters import reconcile_counters
+from properties.utils.details import invalidate_detail
+
+
+class Command(BaseCommand):
+    help = 'Recounts reviews, inquiries and images and fixes drifted listing counters'
+
+    def handle(self, *args, **options):
+        for model in (Property, Project):
+            slugs = reconcile_counters(model)
+            invalidate_detail(model, *slugs)
+            self.stdout.write(self.style.SUCCESS(
+                f'Corrected counters on {len(slugs)} {model._meta.verbose_name_plural.lower()}'
+            ))
@@ -0,0 +1,246 @@
+import random
+import secrets
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import slugify
+
+from authentication.models import CustomUser
+from properties.models import (
+    Agent, Blog, ContactMessage, InspectionBooking, NewsletterSubscription, Project, Project_Category,
+    Project_Review, ProjectContactMessage, ProjectImage, Property, Property_Category, Property_Review,
+    PropertyImage, Staff,
+)
+from properties.utils.counters import reconcile_counters
+from properties.utils.facets import rebuild_facets
+from properties.utils.geo import geocode_missing
+from properties.utils.search import rebuild_index
+
+
+LOCATIONS = [
+    ('Lekki', 'Lagos', 18), ('Ikoyi', 'Lagos', 8), ('Victoria Island', 'Lagos', 7), ('Ikeja', 'Lagos', 10),
+    ('Ajah', 'Lagos', 9), ('Yaba', 'Lagos', 5), ('Maitama', 'Abuja', 6), ('Gwarinpa', 'Abuja', 7),
+    ('Asokoro', 'Abuja', 4), ('Wuse', 'Abuja', 5), ('GRA', 'Port Harcourt', 6), ('Bodija', 'Ibadan', 4),
+    ('Independence Layout', 'Enugu', 3), ('Rayfield', 'Jos', 2), ('Nassarawa GRA', 'Kano', 3),
+]
+PROPERTY_CATEGORIES = ['Duplex', 'Terrace', 'Bungalow', 'Apartment', 'Penthouse', 'Land']
+PROJECT_CATEGORIES = ['Residential Estate', 'Commercial', 'Mixed Use', 'Affordable Housing']
+PROPERTY_TYPES = ['Detached Duplex', 'Semi-Detached Duplex', 'Terrace', 'Flat', 'Bungalow', 'Maisonette']
+FEATURES = ['Swimming pool', 'Gym', '24/7 power', 'Security', 'Parking', 'Garden', 'BQ', 'Cinema', 'Elevator']
+PROJECT_STATUSES = ['Ongoing', 'Completed', 'Off-plan']
+BLOG_CATEGORIES = ['Market', 'Tips', 'News', 'Investment', 'Design']
+WORDS = (
+    'property market buyers sellers mortgage rent estate location value investment neighbourhood '
+    'infrastructure amenities security title survey documentation inspection price growth demand '
+    'supply development lagos abuja family home apartment duplex finance agent advice trend'
+).split()
+FIRST_NAMES = ['Ada', 'Tunde', 'Chioma', 'Emeka', 'Funke', 'Ibrahim', 'Ngozi', 'Segun', 'Aisha', 'Kelechi']
+LAST_NAMES = ['Okafor', 'Adeyemi', 'Bello', 'Eze', 'Balogun', 'Okonkwo', 'Musa', 'Adebayo', 'Nwosu', 'Lawal']
+
+
+class Command(BaseCommand):
+    help = 'Seeds the database with a synthetic catalog for development and benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--properties', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--agents', type=int, default=50)
+        parser.add_argument('--staff', type=int, default=12)
+        parser.add_argument('--blogs', type=int, default=100)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--images-per-listing', type=int, default=4)
+        parser.add_argument('--reviews', type=int, default=2000)
+        parser.add_argument('--inquiries', type=int, default=2000)
+        parser.add_argument('--subscribers', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # The seed fixes the data's shape; the prefix keeps each run's unique
+        # fields (emails, slugs) apart so seeding twice adds a second set.
+        self.prefix = f"s{options['seed']}-{secrets.token_hex(3)}"
+
+        with transaction.atomic():
+            property_categories = self.categories(Property_Category, PROPERTY_CATEGORIES)
+            project_categories = self.categories(Project_Category, PROJECT_CATEGORIES)
+            agents = self.create(Agent, [self.agent(i) for i in range(options['agents'])])
+            self.create(Staff, [self.staff(i) for i in range(options['staff'])])
+            users = self.create(CustomUser, self.users(options['users']))
+            properties = self.create(
+                Property, [self.property(i, property_categories) for i in range(options['properties'])])
+            projects = self.create(
+                Project, [self.project(i, project_categories) for i in range(options['projects'])])
+            self.assign_agents(properties, agents)
+            self.images(properties, projects, options['images_per_listing'])
+            self.reviews(properties, projects, users, options['reviews'])
+            self.inquiries(properties, projects, options['inquiries'])
+            self.create(Blog, [self.blog(i) for i in range(options['blogs'])])
+            self.create(NewsletterSubscription, [
+                NewsletterSubscription(email=f'{self.prefix}-subscriber{i}@example.com')
+                for i in range(options['subscribers'])
+            ])
+
+        # bulk_create bypasses the model signals, so derived data is rebuilt here.
+        for model in (Property, Project):
+            rebuild_facets(model)
+            reconcile_counters(model)
+            geocode_missing(model)
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Seeded dataset {self.prefix}'))
+
+    def create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(created)} {model._meta.verbose_name_plural}')
+        return created
+
+    def categories(self, model, names):
+        existing = {category.name: category for category in model.objects.filter(name__in=names)}
+        missing = [model(name=name) for name in names if name not in existing]
+        model.objects.bulk_create(missing)
+        return list(model.objects.filter(name__in=names))
+
+    def weighted_location(self):
+        area, city, _weight = self.random.choices(LOCATIONS, weights=[loc[2] for loc in LOCATIONS])[0]
+        return f'{area}, {city}'
+
+    def sentence(self, words):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words)).capitalize()
+
+    def person(self):
+        return f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}'
+
+    def phone(self):
+        # Stored in IntegerField, so keep below 2**31 on every backend.
+        return self.random.randrange(700000000, 999999999)
+
+    def agent(self, index):
+        name = self.person()
+        return Agent(name=name, phone_number=self.phone(), email=f'{self.prefix}-agent{index}@example.com')
+
+    def staff(self, index):
+        return Staff(
+            name=self.person(), position=self.random.choice(['Manager', 'Surveyor', 'Analyst', 'Sales Lead']),
+            phone=self.phone(), email=f'{self.prefix}-staff{index}@example.com',
+        )
+
+    def users(self, count):
+        password = make_password(None)
+        return [
+            CustomUser(
+                email=f'{self.prefix}-user{i}@example.com', password=password,
+                first_name=self.random.choice(FIRST_NAMES), last_name=self.random.choice(LAST_NAMES),
+            )
+            for i in range(count)
+        ]
+
+    def property(self, index, categories):
+        bedrooms = self.random.choices([1, 2, 3, 4, 5, 6, 7], weights=[10, 20, 25, 22, 13, 6, 4])[0]
+        location = self.weighted_location()
+        title = f'{bedrooms} Bedroom {self.random.choice(PROPERTY_TYPES)} in {location.split(",")[0]}'
+        # Prices are roughly log-normal around ₦80m and scale with size.
+        price = int(self.random.lognormvariate(18.2, 0.6) * bedrooms / 3)
+        return Property(
+            availability=self.random.choices(['Selling', 'Rent'], weights=[65, 35])[0],
+            title=title,
+            location=location,
+            property_type=self.random.choice(PROPERTY_TYPES),
+            category=self.random.choice(categories),
+            price=min(price, 2 ** 31 - 1),
+            living_room=self.random.choice([1, 1, 2, 2, 3]),
+            dining=self.random.choice([0, 1, 1, 1, 2]),
+            no_of_bedrooms=bedrooms,
+            no_of_bathrooms=max(1, bedrooms + self.random.choice([-1, 0, 0, 1])),
+            no_of_floors=self.random.choices([1, 2, 3, 4], weights=[35, 45, 15, 5])[0],
+            features=','.join(self.random.sample(FEATURES, self.random.randint(2, 5))),
+            slug=f'{slugify(title)}-{self.prefix}-{index}',
+        )
+
+    def project(self, index, categories):
+        location = self.weighted_location()
+        title = f'{location.split(",")[0]} {self.random.choice(["Gardens", "Court", "Heights", "Towers", "Estate"])}'
+        blocks = self.random.choices([1, 2, 3, 4, 6, 8, 12], weights=[20, 20, 18, 15, 12, 9, 6])[0]
+        return Project(
+            title=title,
+            location=location,
+            price=min(int(self.random.lognormvariate(19.5, 0.7)), 2 ** 31 - 1),
+            status=self.random.choice(PROJECT_STATUSES),
+            category=self.random.choice(categories),
+            no_of_block=blocks,
+            no_of_flat=blocks * self.random.choice([4, 6, 8, 12]),
+            no_of_floors=self.random.choices([2, 3, 4, 5, 8, 12], weights=[20, 25, 25, 15, 10, 5])[0],
+            slug=f'{slugify(title)}-{self.prefix}-{index}',
+        )
+
+    def blog(self, index):
+        title = self.sentence(self.random.randint(4, 9))
+        return Blog(
+            title=title,
+            category=self.random.choice(BLOG_CATEGORIES),
+            description=self.sentence(30),
+            content='\n\n'.join(self.sentence(self.random.randint(40, 120)) for _ in range(self.random.randint(3, 12))),
+            slug=f'{slugify(title)}-{self.prefix}-{index}',
+        )
+
+    def assign_agents(self, properties, agents):
+        if not agents:
+            return
+        through = Property.associated_agent.through
+        links = []
+        for listing in properties:
+            for agent in self.random.sample(agents, min(len(agents), self.random.choice([1, 1, 2, 3]))):
+                links.append(through(property_id=listing.id, agent_id=agent.id))
+        self.create(through, links)
+
+    def images(self, properties, projects, per_listing):
+        # Gallery sizes vary around the requested average.
+        def count():
+            return max(0, int(self.random.gauss(per_listing, per_listing / 3)))
+
+        self.create(PropertyImage, [
+            PropertyImage(property=listing) for listing in properties for _ in range(count())
+        ])
+        self.create(ProjectImage, [
+            ProjectImage(project=listing) for listing in projects for _ in range(count())
+        ])
+
+    def popular(self, listings):
+        # A few listings attract most of the engagement.
+        if self.random.random() < 0.5:
+            return self.random.choice(listings)
+        return listings[min(len(listings) - 1, int(self.random.paretovariate(1.2)) - 1)]
+
+    def reviews(self, properties, projects, users, count):
+        if not users:
+            return
+        property_reviews, project_reviews = [], []
+        for _ in range(count):
+            user = self.random.choice(users)
+            if projects and (not properties or self.random.random() < 0.3):
+                project_reviews.append(
+                    Project_Review(project=self.popular(projects), user=user, comment=self.sentence(20)))
+            elif properties:
+                property_reviews.append(
+                    Property_Review(property=self.popular(properties), user=user, comment=self.sentence(20)))
+        self.create(Property_Review, property_reviews)
+        self.create(Project_Review, project_reviews)
+
+    def inquiries(self, properties, projects, count):
+        bookings, project_messages, messages = [], [], []
+        for i in range(count):
+            details = {
+                'name': self.person(), 'phone': self.phone(),
+                'email': f'{self.prefix}-lead{i}@example.com', 'message': self.sentence(25),
+            }
+            roll = self.random.random()
+            if properties and roll < 0.5:
+                bookings.append(InspectionBooking(property=self.popular(properties), **details))
+            elif projects and roll < 0.8:
+                project_messages.append(ProjectContactMessage(project=self.popular(projects), **details))
+            else:
+                messages.append(ContactMessage(subject=self.sentence(5), **details))
+        self.create(InspectionBooking, bookings)
+        self.create(ProjectContactMessage, project_messages)
+        self.create(ContactMessage, messages)
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from properties.utils.campaigns import (
+    CAMPAIGN_BATCH_SIZE, CAMPAIGN_RATE_LIMIT, CampaignSender, claim_campaign,
+)
+
+
+class Command(BaseCommand):
+    help = 'Sends queued newsletter campaigns; with --loop it keeps running as a background worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaign', type=int, help='Only send the campaign with this id')
+        parser.add_argument('--batch-size', type=int, default=CAMPAIGN_BATCH_SIZE)
+        parser.add_argument('--rate', type=float, default=CAMPAIGN_RATE_LIMIT,
+                            help='Maximum messages per second (0 for no limit)')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for queued campaigns')
+        parser.add_argument('--interval', type=int, default=30, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            campaign = claim_campaign(options['campaign'])
+            if campaign is not None:
+                self.send(campaign, options)
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def send(self, campaign, options):
+        self.stdout.write(f'Sending "{campaign}" to {campaign.total_recipients} recipients')
+        sender = CampaignSender(campaign, batch_size=options['batch_size'], rate=options['rate'])
+        try:
+            finished = sender.run()
+        except Exception as error:
+            # The campaign stays in "sending" and is picked up again once stale.
+            self.stderr.write(self.style.ERROR(f'Campaign {campaign.pk} interrupted: {error}'))
+            if not options['loop']:
+                raise
+            return
+        campaign.refresh_from_db()
+        status = 'Finished' if finished else 'Paused'
+        self.stdout.write(self.style.SUCCESS(
+            f'{status} "{campaign}": {campaign.sent_count} sent, {campaign.failed_count} failed'
+        ))
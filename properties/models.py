@@ -1,5 +1,6 @@
 from django.db import models
 from cloudinary.models import CloudinaryField
+from django.utils import timezone
 from django.utils.text import slugify
 from authentication.models import CustomUser
 
@@ -33,7 +34,45 @@ class Agent(models.Model):
     
     
 
-class Project(models.Model):
+class EngagementCounters(models.Model):
+    """
+    Review, inquiry and image counts kept in step with the related rows by
+    properties/utils/counters.py, so listing cards can show them without
+    counting. ``manage.py reconcile_counters`` repairs any drift.
+    """
+    COUNTER_FIELDS = ('review_count', 'inquiry_count', 'image_count')
+
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    inquiry_count = models.PositiveIntegerField(default=0, editable=False)
+    image_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Re-saving a listing must not write back counts that were loaded
+        # before a concurrent increment.
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+class GeoLocation(models.Model):
+    """
+    Coordinates geocoded from ``location`` (see properties/utils/geo.py).
+    The indexed geohash lets radius and bounding-box searches scan a few
+    index ranges instead of matching location text.
+    """
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, default='', editable=False, db_index=True)
+
+    class Meta:
+        abstract = True
+
+class Project(GeoLocation, EngagementCounters):
     title = models.CharField(max_length=255)
     location = models.CharField(max_length=255)
     price = models.IntegerField()
@@ -60,8 +99,16 @@ class Project(models.Model):
         ordering = ['-updated', '-created']
         verbose_name = "Project"
         verbose_name_plural = "Projects"
-
-class Property(models.Model):
+        # Listing pages filter by category and unit counts and page in
+        # (-updated, -created, id) order; the home page takes the newest.
+        indexes = [
+            models.Index(fields=['-updated', '-created', 'id'], name='project_recent_idx'),
+            models.Index(fields=['category', '-updated', '-created', 'id'], name='project_category_recent_idx'),
+            models.Index(fields=['no_of_block', '-updated', '-created', 'id'], name='project_blocks_recent_idx'),
+            models.Index(fields=['-created'], name='project_created_idx'),
+        ]
+
+class Property(GeoLocation, EngagementCounters):
     AVAILABILITY_CHOICES = [
         ('Selling', 'Selling'),
         ('Rent', 'Rent'),
@@ -97,6 +144,12 @@ class Property(models.Model):
         ordering = ['-updated', '-created']
         verbose_name = "Property"
         verbose_name_plural = "Properties"
+        indexes = [
+            models.Index(fields=['-updated', '-created', 'id'], name='property_recent_idx'),
+            models.Index(fields=['category', '-updated', '-created', 'id'], name='property_category_recent_idx'),
+            models.Index(fields=['no_of_bedrooms', '-updated', '-created', 'id'], name='property_bedrooms_recent_idx'),
+            models.Index(fields=['-created'], name='property_created_idx'),
+        ]
 
 class PropertyImage(models.Model):
     property = models.ForeignKey(Property, on_delete=models.CASCADE)
@@ -115,10 +168,10 @@ class ProjectImage(models.Model):
 class ContactMessage(models.Model):
     name = models.CharField(max_length=255)
     phone = models.IntegerField()
-    email = models.EmailField()
+    email = models.EmailField(db_index=True)
     subject = models.CharField(max_length=255)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"{self.name} - {self.email}'s Message"
@@ -127,9 +180,9 @@ class ProjectContactMessage(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='project_messages')
     name = models.CharField(max_length=255)
     phone = models.IntegerField()
-    email = models.EmailField()
+    email = models.EmailField(db_index=True)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"Contact Message about {self.project}"
@@ -138,9 +191,9 @@ class InspectionBooking(models.Model):
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='property_inspection')
     name = models.CharField(max_length=255)
     phone = models.IntegerField()
-    email = models.EmailField()
+    email = models.EmailField(db_index=True)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"Inspection Booking for {self.property}"
@@ -165,6 +218,8 @@ class Project_Review(models.Model):
 
 class NewsletterSubscription(models.Model):
     email = models.EmailField(unique=True)
+    # Blank for subscriptions made before the date was recorded.
+    created_at = models.DateTimeField(auto_now_add=True, null=True, db_index=True)
 
     def __str__(self):
         return self.email
@@ -198,4 +253,102 @@ class Staff(models.Model):
     def __str__(self):
         return f'{self.name} - {self.position}'
 
-    
\ No newline at end of file
+
+class ListingFacet(models.Model):
+    KIND_CHOICES = [
+        ('property', 'Property'),
+        ('project', 'Project'),
+    ]
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    category_id = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    ranges = models.JSONField(default=dict)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('kind', 'category_id')
+        verbose_name = "Listing Facet"
+        verbose_name_plural = "Listing Facets"
+
+    def __str__(self):
+        return f'{self.kind} facets for category {self.category_id}'
+
+
+class NewsletterCampaign(models.Model):
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('paused', 'Paused'),
+        ('sent', 'Sent'),
+    ]
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='campaigns')
+    subject = models.CharField(max_length=255)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='draft')
+    total_recipients = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created']
+        verbose_name = "Newsletter Campaign"
+        verbose_name_plural = "Newsletter Campaigns"
+
+    def __str__(self):
+        return self.subject
+
+
+class CampaignRecipient(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    campaign = models.ForeignKey(NewsletterCampaign, on_delete=models.CASCADE, related_name='recipients')
+    email = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    error = models.CharField(max_length=255, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('campaign', 'email')
+        indexes = [models.Index(fields=['campaign', 'status', 'id'])]
+
+    def __str__(self):
+        return f'{self.email} ({self.status})'
+
+
+class OutboxMessage(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    kind = models.CharField(max_length=40)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField(default=list)
+    reply_to = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim = models.CharField(max_length=32, blank=True)
+    last_error = models.CharField(max_length=500, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+        verbose_name = "Outbox Message"
+        verbose_name_plural = "Outbox Messages"
+
+    def __str__(self):
+        return f'{self.kind}: {self.subject}'
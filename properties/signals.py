@@ -0,0 +1,161 @@
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Agent, Blog, Project, Project_Category, Project_Review, ProjectImage, Property, Property_Category,
+    Property_Review, PropertyImage, Staff,
+)
+from .utils.cache import bump_model_version
+from .utils.counters import COUNTED_RELATIONS, adjust_counter
+from .utils.details import invalidate_detail
+from .utils.facets import adjust_category_facet
+from .utils.geo import locate
+from .utils.images import IMAGE_FIELDS, schedule_derivatives
+from .utils.indexes import ensure_text_indexes
+from .utils.search import ensure_search_index, index_instance, remove_instance
+
+
+@receiver(pre_save, sender=Property)
+@receiver(pre_save, sender=Project)
+def remember_previous_listing(sender, instance, **kwargs):
+    # A listing that moves between categories must update both facet rows,
+    # one whose slug changes must drop the detail cached under the old one,
+    # and one whose location changes must be geocoded again.
+    previous = {}
+    if instance.pk:
+        previous = sender.objects.filter(pk=instance.pk).values(
+            'category_id', 'slug', 'location', 'latitude', 'longitude',
+        ).first() or {}
+    instance._previous_category_id = previous.get('category_id')
+    instance._previous_slug = previous.get('slug')
+    locate(instance, previous.get('location'), (previous.get('latitude'), previous.get('longitude')))
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Project)
+def update_facets_on_save(sender, instance, created, **kwargs):
+    previous_category_id = getattr(instance, '_previous_category_id', None)
+    moved = not created and previous_category_id and previous_category_id != instance.category_id
+    if moved:
+        adjust_category_facet(sender, previous_category_id, -1)
+    adjust_category_facet(sender, instance.category_id, 1 if created or moved else 0, instance)
+
+
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Project)
+def update_facets_on_delete(sender, instance, **kwargs):
+    adjust_category_facet(sender, instance.category_id, -1)
+
+
+@receiver(post_save, sender=Agent)
+@receiver(post_save, sender=Blog)
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Project)
+def update_search_index_on_save(sender, instance, **kwargs):
+    index_instance(instance)
+
+
+@receiver(post_delete, sender=Agent)
+@receiver(post_delete, sender=Blog)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Project)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+@receiver(post_save, sender=Agent)
+@receiver(post_save, sender=Blog)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Staff)
+@receiver(post_save, sender=Project_Category)
+@receiver(post_save, sender=Property_Category)
+@receiver(post_delete, sender=Agent)
+@receiver(post_delete, sender=Blog)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Staff)
+@receiver(post_delete, sender=Project_Category)
+@receiver(post_delete, sender=Property_Category)
+def invalidate_cached_fragments(sender, instance, **kwargs):
+    bump_model_version(sender)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Project)
+def invalidate_listing_detail(sender, instance, **kwargs):
+    invalidate_detail(sender, instance.slug, getattr(instance, '_previous_slug', None))
+
+
+LISTING_RELATIONS = {
+    PropertyImage: (Property, 'property_id'),
+    Property_Review: (Property, 'property_id'),
+    ProjectImage: (Project, 'project_id'),
+    Project_Review: (Project, 'project_id'),
+}
+
+
+def invalidate_related_detail(sender, instance, **kwargs):
+    model, field = LISTING_RELATIONS[sender]
+    slug = model.objects.filter(pk=getattr(instance, field)).values_list('slug', flat=True).first()
+    invalidate_detail(model, slug)
+
+
+for model in LISTING_RELATIONS:
+    post_save.connect(invalidate_related_detail, sender=model)
+    post_delete.connect(invalidate_related_detail, sender=model)
+
+
+def count_related_on_save(sender, instance, created, **kwargs):
+    if created:
+        adjust_counter(sender, instance, 1)
+
+
+def count_related_on_delete(sender, instance, **kwargs):
+    adjust_counter(sender, instance, -1)
+
+
+for model in COUNTED_RELATIONS:
+    post_save.connect(count_related_on_save, sender=model)
+    post_delete.connect(count_related_on_delete, sender=model)
+
+
+@receiver(m2m_changed, sender=Property.associated_agent.through)
+def invalidate_agents_detail(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # The properties losing this agent are only known before the clear.
+        invalidate_detail(Property, *instance.property_set.values_list('slug', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if reverse:
+            invalidate_detail(Property, *Property.objects.filter(pk__in=pk_set or ()).values_list('slug', flat=True))
+        else:
+            invalidate_detail(Property, instance.slug)
+
+
+IMAGE_MODELS = (Agent, Blog, Staff, Project, Property, ProjectImage, PropertyImage)
+
+
+def remember_previous_images(sender, instance, **kwargs):
+    fields = IMAGE_FIELDS[sender._meta.model_name]
+    instance._previous_image_ids = {}
+    if instance.pk:
+        previous = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+        instance._previous_image_ids = {field: previous.get(field) for field in fields}
+
+
+def generate_image_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance, getattr(instance, '_previous_image_ids', None))
+
+
+for model in IMAGE_MODELS:
+    pre_save.connect(remember_previous_images, sender=model)
+    post_save.connect(generate_image_derivatives, sender=model)
+
+
+@receiver(post_migrate)
+def create_text_indexes(sender, using='default', **kwargs):
+    if sender.name == 'properties':
+        ensure_text_indexes(using)
+        ensure_search_index(using)
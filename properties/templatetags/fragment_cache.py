@@ -0,0 +1,58 @@
+from django import template
+from django.core.cache import cache
+
+from eswift.db_router import primary_reads
+from properties.utils.cache import FRAGMENT_CACHE_TIMEOUT, fragment_cache_key
+
+register = template.Library()
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, model_names, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.model_names = model_names
+        self.vary_on = vary_on
+
+    def render(self, context):
+        key = fragment_cache_key(
+            self.name.resolve(context),
+            [model.resolve(context) for model in self.model_names],
+            [value.resolve(context) for value in self.vary_on],
+        )
+        content = cache.get(key)
+        if content is None:
+            # The querysets the fragment reads are lazy, so this is where
+            # they run.
+            with primary_reads():
+                content = self.nodelist.render(context)
+            cache.set(key, content, FRAGMENT_CACHE_TIMEOUT)
+        return content
+
+
+@register.tag('cachefragment')
+def do_cachefragment(parser, token):
+    """
+    Caches a template fragment until one of the listed models changes.
+
+    Usage::
+
+        {% cachefragment "home-agents" "agent" %}...{% endcachefragment %}
+        {% cachefragment "blog-results" "blog" vary=search_query %}...{% endcachefragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a fragment name and at least one model name."
+        )
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+
+    model_names = []
+    vary_on = []
+    for bit in bits[2:]:
+        if bit.startswith('vary='):
+            vary_on.append(parser.compile_filter(bit[len('vary='):]))
+        else:
+            model_names.append(parser.compile_filter(bit))
+    return FragmentCacheNode(nodelist, parser.compile_filter(bits[1]), model_names, vary_on)
@@ -0,0 +1,53 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from properties.utils.images import DEFAULT_ASPECT, RESPONSIVE_FORMATS, RESPONSIVE_WIDTHS, get_image_service
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 600px) 100vw, (max-width: 1024px) 50vw, 33vw'
+
+
+def _srcset(candidates):
+    return ', '.join(f'{url} {width}w' for url, width in candidates)
+
+
+def _attributes(loading, css_class):
+    attributes = [('loading', loading), ('class', css_class)]
+    return format_html_join(' ', '{}="{}"', [(name, value) for name, value in attributes if value])
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes=DEFAULT_SIZES, aspect=DEFAULT_ASPECT, css_class='', loading='lazy'):
+    """
+    Renders an image with a width-based srcset, so browsers download the
+    smallest derivative that fits the slot.
+
+    Usage::
+
+        {% responsive_image blog.image alt=blog.title %}
+        {% responsive_image property.thumbnail alt="Property" sizes="100vw" aspect="" %}
+    """
+    if not image:
+        return ''
+    service = get_image_service()
+    aspect = aspect or None
+    fallback = service.url(image, RESPONSIVE_WIDTHS[len(RESPONSIVE_WIDTHS) // 2], aspect=aspect)
+
+    if service.negotiates_format:
+        return format_html(
+            '<img {} src="{}" srcset="{}" sizes="{}" alt="{}"/>',
+            _attributes(loading, css_class), fallback, _srcset(service.srcset(image, aspect=aspect)), sizes, alt,
+        )
+
+    sources = [
+        (f'image/{fmt}', _srcset(candidates), sizes)
+        for fmt in RESPONSIVE_FORMATS
+        for candidates in [service.srcset(image, fmt=fmt, aspect=aspect)]
+        if candidates
+    ]
+    return format_html(
+        '<picture>{}<img {} src="{}" alt="{}"/></picture>',
+        format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', sources),
+        _attributes(loading, css_class), fallback, alt,
+    )
@@ -0,0 +1,28 @@
+from properties.models import Agent, Project, Project_Category, Property, Property_Category
+
+
+def make_property(category=None, **fields):
+    values = {
+        'availability': 'Rent', 'title': 'Two Bedroom Flat', 'location': 'Lekki, Lagos',
+        'property_type': 'Flat', 'price': 1000000, 'living_room': 1, 'dining': 1,
+        'no_of_bedrooms': 2, 'no_of_bathrooms': 2, 'no_of_floors': 1, 'features': 'Parking,Pool',
+    }
+    values.update(fields)
+    category = category or Property_Category.objects.create(name='Flat')
+    return Property.objects.create(category=category, **values)
+
+
+def make_project(category=None, **fields):
+    values = {
+        'title': 'Lekki Gardens', 'location': 'Lekki, Lagos', 'price': 50000000, 'status': 'Ongoing',
+        'no_of_block': 2, 'no_of_flat': 8, 'no_of_floors': 3,
+    }
+    values.update(fields)
+    category = category or Project_Category.objects.create(name='Estate')
+    return Project.objects.create(category=category, **values)
+
+
+def make_agent(**fields):
+    values = {'name': 'Ada Obi', 'phone_number': 8031234567, 'email': 'ada@example.com'}
+    values.update(fields)
+    return Agent.objects.create(**values)
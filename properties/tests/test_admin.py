@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from properties.models import ContactMessage, Property, Property_Category
+from properties.tests.factories import make_agent, make_property
+from properties.utils.pagination import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Property_Category.objects.create(name='Flat')
+        for index in range(5):
+            make_property(category, slug=f'flat-{index}')
+
+    @mock.patch('properties.utils.pagination.ADMIN_COUNT_LIMIT', 10)
+    def test_small_results_are_counted(self):
+        self.assertEqual(EstimatedCountPaginator(Property.objects.all(), 2).count, 5)
+
+    @mock.patch('properties.utils.pagination.ADMIN_COUNT_LIMIT', 3)
+    def test_large_results_stop_counting_at_the_limit(self):
+        with self.assertNumQueries(1) as queries:
+            self.assertEqual(EstimatedCountPaginator(Property.objects.all(), 2).count, 3)
+        self.assertIn('LIMIT 3', queries.captured_queries[0]['sql'])
+        paginator = EstimatedCountPaginator(Property.objects.all(), 2, known_count=5000)
+        self.assertEqual((paginator.count, paginator.num_pages), (5000, 2500))
+
+
+class ChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(email='admin@example.com', password='secret-pass')
+        category = Property_Category.objects.create(name='Flat')
+        agent = make_agent()
+        for index in range(4):
+            make_property(category, slug=f'flat-{index}', title=f'Flat {index}').associated_agent.add(agent)
+        make_property(category, slug='penthouse', title='Ocean Penthouse')
+        for email in ('Visitor@Example.com', 'visitor@example.com', 'other@example.com'):
+            ContactMessage.objects.create(name='V', email=email, phone=1, subject='S', message='M')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def changelist(self, model_name, **params):
+        return self.client.get(f'/admin/properties/{model_name}/', params)
+
+    def test_email_search_matches_whole_addresses(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.changelist('contactmessage', q=' Visitor@Example.com ')
+        self.assertEqual(response.context['cl'].result_count, 2)
+        self.assertFalse(any('LIKE' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(self.changelist('contactmessage', q='visitor').context['cl'].result_count, 0)
+
+    def test_listing_search_uses_the_search_index(self):
+        response = self.changelist('property', q='pent')
+        self.assertEqual([listing.slug for listing in response.context['cl'].result_list], ['penthouse'])
+
+    @mock.patch('properties.utils.pagination.ADMIN_COUNT_LIMIT', 2)
+    def test_unfiltered_total_comes_from_the_facets(self):
+        self.assertEqual(self.changelist('property').context['cl'].result_count, 5)
+        self.assertEqual(self.changelist('property', q='flat').context['cl'].result_count, 2)
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        with CaptureQueriesContext(connection) as full_page:
+            self.changelist('property')
+        Property.objects.filter(slug__startswith='flat-').delete()
+        with CaptureQueriesContext(connection) as short_page:
+            self.changelist('property')
+        self.assertEqual(len(full_page), len(short_page))
@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from properties.models import Blog, Property, Property_Category
+from properties.tests.factories import make_agent, make_property
+
+
+class ListingApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        flats = Property_Category.objects.create(name='Flat')
+        duplexes = Property_Category.objects.create(name='Duplex')
+        for index in range(5):
+            make_property(flats, slug=f'flat-{index}', title=f'Flat {index}', no_of_bedrooms=index)
+        make_property(duplexes, slug='duplex', title='Duplex', location='Maitama, Abuja')
+        make_agent(name='Ada Obi')
+        make_agent(name='Chidi Eze', email='chidi@example.com')
+        Blog.objects.create(title='Market update', category='news', description='Prices', slug='market-update')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_default_fields(self):
+        result = self.client.get('/api/properties/', {'limit': 1}).json()['results'][0]
+        self.assertEqual(set(result), {
+            'id', 'slug', 'title', 'availability', 'location', 'category', 'price',
+            'no_of_bedrooms', 'no_of_bathrooms', 'thumbnail', 'updated', 'url',
+        })
+        self.assertEqual(result['url'], f"/properties/{result['slug']}")
+        self.assertIsNone(result['thumbnail'])
+
+    def test_field_selection_reads_only_those_columns(self):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get('/api/properties/', {'fields': 'slug,category', 'category': 'Duplex'})
+        self.assertEqual(response.json()['results'], [{'slug': 'duplex', 'category': 'Duplex'}])
+        self.assertNotIn('"features"', queries.captured_queries[0]['sql'])
+
+    def test_invalid_parameters(self):
+        response = self.client.get('/api/properties/', {'fields': 'slug,password'})
+        self.assertEqual((response.status_code, response.json()), (400, {'error': 'Unknown fields: password'}))
+        self.assertEqual(self.client.get('/api/properties/', {'limit': 'ten'}).status_code, 400)
+        self.assertEqual(self.client.post('/api/properties/').status_code, 405)
+
+    def test_pages_follow_the_cursor(self):
+        first = self.client.get('/api/properties/', {'limit': 4, 'fields': 'slug'}).json()
+        self.assertEqual(len(first['results']), 4)
+        self.assertIsNone(first['previous'])
+        second = self.client.get('/api/properties/', {'limit': 4, 'fields': 'slug', 'page': first['next']}).json()
+        self.assertEqual(len(second['results']), 2)
+        self.assertIsNone(second['next'])
+        slugs = {row['slug'] for row in first['results'] + second['results']}
+        self.assertEqual(len(slugs), 6)
+
+    def test_filters_match_the_html_pages(self):
+        response = self.client.get('/api/properties/', {'bedrooms': 3, 'fields': 'slug'})
+        self.assertEqual(response.json()['results'], [{'slug': 'flat-3'}])
+        nearby = self.client.get('/api/properties/', {'location': 'Maitama', 'radius': 5, 'fields': 'slug'})
+        self.assertEqual([row['slug'] for row in nearby.json()['results']], ['duplex'])
+        self.assertIn('distance_km', nearby.json()['results'][0])
+        agents = self.client.get('/api/agents/', {'query': 'chidi', 'fields': 'name'}).json()
+        self.assertEqual(agents['results'], [{'name': 'Chidi Eze'}])
+        blogs = self.client.get('/api/blogs/', {'query': 'prices', 'fields': 'url'}).json()
+        self.assertEqual(blogs['results'], [{'url': '/blog-details/market-update/'}])
+
+    def test_conditional_get(self):
+        response = self.client.get('/api/properties/')
+        etag = response['ETag']
+        not_modified = self.client.get('/api/properties/', HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertNotEqual(self.client.get('/api/properties/', {'limit': 2})['ETag'], etag)
+
+        listing = Property.objects.get(slug='duplex')
+        listing.price = 5
+        listing.save()
+        self.assertEqual(self.client.get('/api/properties/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
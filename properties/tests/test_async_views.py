@@ -0,0 +1,64 @@
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import AsyncRequestFactory, TransactionTestCase
+
+from properties import async_views
+from properties.models import Agent
+from properties.tests.factories import make_agent, make_project, make_property
+from properties.utils.cache import bump_model_version, missing_fragments
+
+
+class AsyncViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+        make_property(title='Lekki Penthouse')
+        make_project(title='Ikoyi Towers')
+        make_agent(name='Ngozi Okafor')
+
+    def get(self, view, path, data=None):
+        return async_to_sync(view)(self.factory.get(path, data))
+
+    def test_home_renders_every_section(self):
+        response = self.get(async_views.home, '/')
+        for text in ('Lekki Penthouse', 'Ikoyi Towers', 'Ngozi Okafor'):
+            self.assertContains(response, text)
+
+    def test_home_loads_only_missing_fragments(self):
+        self.get(async_views.home, '/')
+        Agent.objects.update(name='Chidi Eze')
+        bump_model_version(Agent)
+        with mock.patch('properties.async_views.fan_out', wraps=async_views.fan_out) as fan_out:
+            response = self.get(async_views.home, '/')
+        self.assertEqual(list(fan_out.call_args.kwargs), ['agents'])
+        self.assertContains(response, 'Chidi Eze')
+        self.assertContains(response, 'Lekki Penthouse')
+
+    def test_search_queries_every_type(self):
+        response = self.get(async_views.global_search, '/search/', {'query': 'penthouse'})
+        self.assertContains(response, 'Lekki Penthouse')
+        self.assertNotContains(response, 'Ikoyi Towers')
+        self.assertContains(self.get(async_views.global_search, '/search/', {'query': 'ikoyi'}), 'Ikoyi Towers')
+
+    def test_posts_are_handled_by_the_sync_view(self):
+        with mock.patch('properties.views.home') as home:
+            async_to_sync(async_views.home)(self.factory.post('/', {'email': 'a@example.com'}))
+        home.assert_called_once()
+
+    def test_missing_fragments(self):
+        fragments = {name: fragment for name, (fragment, _load) in async_views.HOME_CONTEXT.items()}
+        self.assertEqual(missing_fragments(fragments), list(fragments))
+        self.get(async_views.home, '/')
+        self.assertEqual(missing_fragments(fragments), [])
+
+    def test_benchmark_async_smoke(self):
+        stdout = StringIO()
+        call_command('benchmark_async', '/', concurrency=2, requests=2, stdout=stdout)
+        rows = stdout.getvalue().splitlines()[1:]
+        self.assertEqual([row.split()[1] for row in rows], ['wsgi', 'asgi'])
+        # The last column counts error responses.
+        self.assertEqual([row.split()[-1] for row in rows], ['0', '0'])
@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from properties.models import Blog
+from properties.views import BLOG_FEED_CHUNK_SIZE
+
+
+class BlogFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(BLOG_FEED_CHUNK_SIZE + 2):
+            Blog.objects.create(title=f'Post {index}', category='news', description='d', slug=f'post-{index}')
+
+    def test_json_chunks_follow_the_cursor(self):
+        first = self.client.get('/blog/feed/', {'format': 'json'}).json()
+        self.assertEqual(len(first['results']), BLOG_FEED_CHUNK_SIZE)
+        self.assertEqual(first['results'][0]['slug'], f'post-{BLOG_FEED_CHUNK_SIZE + 1}')
+        self.assertEqual(first['results'][0]['url'], f'/blog-details/post-{BLOG_FEED_CHUNK_SIZE + 1}/')
+        rest = self.client.get('/blog/feed/', {'format': 'json', 'cursor': first['next']}).json()
+        self.assertEqual([blog['slug'] for blog in rest['results']], ['post-1', 'post-0'])
+        self.assertIsNone(rest['next'])
+
+    def test_partial_sends_the_next_cursor_as_a_header(self):
+        response = self.client.get('/blog/feed/')
+        self.assertContains(response, 'Post 7')
+        self.assertNotContains(response, 'Post 1<')
+        last = self.client.get('/blog/feed/', {'cursor': response['X-Next-Cursor']})
+        self.assertContains(last, 'Post 0')
+        self.assertFalse(last.has_header('X-Next-Cursor'))
+
+    def test_blog_page_renders_only_the_first_chunk(self):
+        response = self.client.get('/blog/')
+        self.assertEqual(len(response.context['blog_page'].object_list), BLOG_FEED_CHUNK_SIZE)
+        self.assertContains(response, 'js/blog_feed.js', count=1)
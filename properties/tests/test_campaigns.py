@@ -0,0 +1,104 @@
+import smtplib
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from properties.models import Blog, NewsletterCampaign, NewsletterSubscription
+from properties.utils.campaigns import (
+    CampaignSender, claim_campaign, create_campaign, pause_campaigns, queue_campaigns,
+)
+
+
+class RefusingBackend(EmailBackend):
+    """
+    Locmem backend that refuses one address and counts its sessions.
+    """
+
+    def __init__(self, *args, refuse=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.refuse = refuse
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & set(self.refuse):
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b'No such user')})
+        return super().send_messages(messages)
+
+
+class CampaignTests(TestCase):
+    def setUp(self):
+        blog = Blog.objects.create(title='Market update', category='news', description='d', slug='market-update')
+        for index in range(5):
+            NewsletterSubscription.objects.create(email=f'reader{index}@example.com')
+        self.campaign = create_campaign(blog)
+
+    def test_recipients_are_a_snapshot(self):
+        NewsletterSubscription.objects.create(email='late@example.com')
+        self.assertEqual(self.campaign.total_recipients, 5)
+        self.assertEqual(self.campaign.subject, 'Market update')
+        self.assertEqual(self.campaign.recipients.count(), 5)
+
+    def test_queued_campaign_is_sent_in_batches_over_one_connection(self):
+        queue_campaigns(NewsletterCampaign.objects.all())
+        campaign = claim_campaign()
+        connection = RefusingBackend()
+        self.assertTrue(CampaignSender(campaign, batch_size=2, rate=0, connection=connection).run())
+        self.assertEqual(connection.opened, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertIn('/blog-details/market-update/', mail.outbox[0].body)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.status, campaign.sent_count, campaign.failed_count), ('sent', 5, 0))
+
+    def test_refused_recipients_are_recorded_and_the_rest_sent(self):
+        queue_campaigns(NewsletterCampaign.objects.all())
+        campaign = claim_campaign()
+        connection = RefusingBackend(refuse=['reader2@example.com'])
+        CampaignSender(campaign, rate=0, connection=connection).run()
+        self.assertEqual(len(mail.outbox), 4)
+        failed = campaign.recipients.get(status='failed')
+        self.assertEqual(failed.email, 'reader2@example.com')
+        self.assertIn('No such user', failed.error)
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (4, 1))
+
+    def test_a_resumed_run_sends_only_pending_recipients(self):
+        self.campaign.recipients.filter(email__in=['reader0@example.com', 'reader1@example.com']).update(status='sent')
+        queue_campaigns(NewsletterCampaign.objects.all())
+        CampaignSender(claim_campaign(), rate=0, connection=RefusingBackend()).run()
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [
+            'reader2@example.com', 'reader3@example.com', 'reader4@example.com',
+        ])
+
+    def test_paused_campaign_stops(self):
+        queue_campaigns(NewsletterCampaign.objects.all())
+        campaign = claim_campaign()
+        pause_campaigns(NewsletterCampaign.objects.all())
+        self.assertFalse(CampaignSender(campaign, rate=0, connection=RefusingBackend()).run())
+        self.assertEqual(mail.outbox, [])
+
+    def test_campaigns_are_claimed_once_unless_abandoned(self):
+        queue_campaigns(NewsletterCampaign.objects.all())
+        self.assertEqual(claim_campaign(), self.campaign)
+        self.assertIsNone(claim_campaign())
+        NewsletterCampaign.objects.update(updated=timezone.now() - timedelta(hours=1))
+        self.assertEqual(claim_campaign(), self.campaign)
+
+    def test_drafts_are_not_sent(self):
+        self.assertIsNone(claim_campaign())
+
+    def test_command(self):
+        queue_campaigns(NewsletterCampaign.objects.all())
+        stdout = StringIO()
+        call_command('send_campaigns', rate=0, stdout=stdout)
+        self.assertIn('Finished "', stdout.getvalue())
+        self.assertIn('5 sent, 0 failed', stdout.getvalue())
+        self.assertEqual(len(mail.outbox), 5)
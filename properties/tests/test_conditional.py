@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from properties.models import Property
+from properties.tests.factories import make_property
+
+
+class ConditionalPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.listing = make_property(slug='flat')
+        # The first response sets the CSRF cookie, which the ETag covers.
+        self.client.get('/properties/flat')
+
+    def test_unchanged_page_is_not_modified(self):
+        response = self.client.get('/properties/flat')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Last-Modified'][-3:], 'GMT')
+        with self.assertTemplateNotUsed('properties_details.html'):
+            not_modified = self.client.get('/properties/flat', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        since = self.client.get('/properties/flat', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_saving_the_listing_changes_the_etag(self):
+        etag = self.client.get('/properties/flat')['ETag']
+        Property.objects.get(slug='flat').save()
+        response = self.client.get('/properties/flat', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_each_visitor_gets_its_own_etag(self):
+        etag = self.client.get('/properties/flat')['ETag']
+        self.client.cookies['csrftoken'] = 'x' * 32
+        self.assertEqual(self.client.get('/properties/flat', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pages_are_private_and_revalidated(self):
+        for path in ('/properties/flat', '/properties/', '/blog/'):
+            response = self.client.get(path)
+            self.assertEqual(
+                set(response['Cache-Control'].split(', ')), {'private', 'no-cache'}, path)
+            self.assertIn('Cookie', response['Vary'])
+
+    def test_pending_messages_are_rendered(self):
+        etag = self.client.get('/properties/flat')['ETag']
+        self.client.post('/contact/', {
+            'name': 'Tunde', 'email': 'tunde@example.com', 'phone_number': '8030000000',
+            'subject': 'Viewing', 'message': 'Hello',
+        })
+        response = self.client.get('/properties/flat', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Your message has been sent successfully!')
+        self.assertEqual(self.client.get('/properties/flat', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_missing_listing_is_404(self):
+        self.assertEqual(self.client.get('/properties/nowhere').status_code, 404)
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from properties.models import Project, Project_Review, Property, Property_Review, PropertyImage
+from properties.tests.factories import make_project, make_property
+
+
+class EngagementCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email='reader@example.com', password='secret-pass')
+        self.listing = make_property(slug='flat')
+        self.project = make_project(slug='gardens')
+
+    def counts(self, model, slug):
+        return model.objects.values_list('review_count', 'inquiry_count', 'image_count').get(slug=slug)
+
+    def test_posting_a_property_review_counts_it(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/properties/flat', {'comment': 'Bright and quiet.'})
+        self.assertRedirects(response, '/properties/flat', fetch_redirect_response=False)
+        review = Property_Review.objects.get()
+        self.assertEqual((review.property, review.user, review.comment), (self.listing, self.user, 'Bright and quiet.'))
+        self.assertEqual(self.counts(Property, 'flat'), (1, 0, 0))
+        self.assertContains(self.client.get('/properties/flat'), 'Bright and quiet.')
+
+    def test_posting_a_project_review_counts_it(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/project_details/gardens/', {'comment': 'Good progress.'})
+        self.assertRedirects(response, '/project_details/gardens/', fetch_redirect_response=False)
+        self.assertEqual(Project_Review.objects.get().project, self.project)
+        self.assertEqual(self.counts(Project, 'gardens'), (1, 0, 0))
+
+    def test_anonymous_reviews_are_refused(self):
+        response = self.client.post('/properties/flat', {'comment': 'Bright and quiet.'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Property_Review.objects.exists())
+        self.assertEqual(self.counts(Property, 'flat'), (0, 0, 0))
+
+    def test_inquiries_and_images_are_counted_and_uncounted(self):
+        self.client.post('/properties/flat', {
+            'name': 'Tunde', 'email': 'tunde@example.com', 'phone_number': '8030000000', 'message': 'Hi',
+        })
+        image = PropertyImage.objects.create(property=self.listing, associated_property_image='one')
+        self.assertEqual(self.counts(Property, 'flat'), (0, 1, 1))
+        image.delete()
+        self.assertEqual(self.counts(Property, 'flat'), (0, 1, 0))
+
+    def test_reconcile_fixes_drifted_counters(self):
+        Property_Review.objects.create(property=self.listing, user=self.user, comment='One')
+        Property.objects.update(review_count=7, image_count=3)
+        stdout = StringIO()
+        call_command('reconcile_counters', stdout=stdout)
+        self.assertIn('Corrected counters on 1 properties', stdout.getvalue())
+        self.assertIn('Corrected counters on 0 projects', stdout.getvalue())
+        self.assertEqual(self.counts(Property, 'flat'), (1, 0, 0))
@@ -0,0 +1,56 @@
+import io
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase
+
+from properties.models import Property
+from properties.tests.factories import make_agent, make_project, make_property
+from properties.tests.test_importer import PROPERTY_HEADER, property_row
+from properties.utils.counters import reconcile_counters
+from properties.utils.details import load_project_detail, load_property_detail
+from properties.utils.importer import import_listings
+
+
+class DetailLoaderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.listing = make_property(slug='flat', price=987654321)
+        self.listing.associated_agent.add(make_agent())
+
+    def test_loads_in_four_queries_then_none(self):
+        with self.assertNumQueries(4):
+            detail = load_property_detail('flat')
+        self.assertEqual([agent.name for agent in detail['agents']], ['Ada Obi'])
+        with self.assertNumQueries(0):
+            load_property_detail('flat')
+
+    def test_project_loads_in_three_queries(self):
+        make_project(slug='gardens')
+        with self.assertNumQueries(3):
+            self.assertEqual(load_project_detail('gardens')['listing'].slug, 'gardens')
+
+    def test_missing_slug_raises_404(self):
+        with self.assertRaises(Http404):
+            load_property_detail('nowhere')
+
+    def test_saving_shared_rows_refreshes_the_detail(self):
+        load_property_detail('flat')
+        agent = self.listing.associated_agent.get()
+        agent.name = 'Chidi Eze'
+        agent.save()
+        self.assertEqual([agent.name for agent in load_property_detail('flat')['agents']], ['Chidi Eze'])
+
+    def test_import_upsert_refreshes_the_detail_page(self):
+        self.assertContains(self.client.get('/properties/flat'), '987,654,321')
+        import_listings('property', io.StringIO(PROPERTY_HEADER + property_row('flat', price=111)), 'csv')
+        self.assertEqual(Property.objects.get(slug='flat').price, 111)
+        response = self.client.get('/properties/flat')
+        self.assertNotContains(response, '987,654,321')
+        self.assertEqual(response.context['properties'].price, 111)
+
+    def test_bulk_counter_updates_refresh_the_detail(self):
+        Property.objects.update(image_count=5)
+        self.assertEqual(load_property_detail('flat')['listing'].image_count, 5)
+        reconcile_counters(Property)
+        self.assertEqual(load_property_detail('flat')['listing'].image_count, 0)
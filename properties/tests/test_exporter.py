@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from properties.models import ContactMessage, InspectionBooking, NewsletterSubscription
+from properties.tests.factories import make_property
+from properties.utils.exporter import csv_cell, encode_rows, export_rows
+
+
+class CsvCellTests(SimpleTestCase):
+    def test_formulas_are_quoted_as_text(self):
+        for value in ('=HYPERLINK("x")', '+1', '-1+2', '@SUM(A1)', '\tTab', '\rReturn'):
+            self.assertEqual(csv_cell(value), "'" + value)
+        self.assertEqual(csv_cell('Hello = world'), 'Hello = world')
+        self.assertEqual(csv_cell(-5), -5)
+        moment = datetime(2024, 5, 1, 9, 30)
+        self.assertEqual(csv_cell(moment), '2024-05-01T09:30:00')
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(5):
+            ContactMessage.objects.create(
+                name=f'Visitor {index}', email=f'visitor{index}@example.com', phone=8030000000,
+                subject='Viewing', message='=cmd|calc' if index == 0 else 'Hello, "agent"\nThanks',
+            )
+        # The oldest row falls before the export window.
+        ContactMessage.objects.filter(name='Visitor 4').update(created_at=timezone.now() - timedelta(days=10))
+        listing = make_property(title='Lekki Flat', slug='lekki-flat')
+        InspectionBooking.objects.create(property=listing, name='Tunde', email='t@example.com', phone=1, message='Hi')
+
+    def read_csv(self, text):
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def test_rows_are_streamed_in_key_order(self):
+        rows = list(export_rows('contact_messages', chunk_size=2))
+        self.assertEqual([row['name'] for row in rows], [f'Visitor {index}' for index in range(5)])
+        self.assertEqual(list(rows[0])[:3], ['id', 'created_at', 'name'])
+
+    def test_related_columns(self):
+        row = next(export_rows('inspection_bookings'))
+        self.assertEqual((row['property'], row['property_slug']), ('Lekki Flat', 'lekki-flat'))
+
+    def test_csv_round_trips_and_quotes_formulas(self):
+        rows = self.read_csv(''.join(encode_rows('contact_messages', export_rows('contact_messages'), 'csv')))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['message'], "'=cmd|calc")
+        self.assertEqual(rows[1]['message'], 'Hello, "agent"\nThanks')
+
+    def test_command_filters_by_date(self):
+        today = timezone.localdate()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.jsonl')
+            call_command('export_records', 'contact_messages', format='jsonl', output=path,
+                         since=today - timedelta(days=1), until=today)
+            with open(path) as export:
+                rows = [json.loads(line) for line in export]
+        self.assertEqual([row['name'] for row in rows], [f'Visitor {index}' for index in range(4)])
+
+    def test_admin_actions_stream_the_selection(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='secret-pass')
+        self.client.force_login(admin)
+        NewsletterSubscription.objects.create(email='reader@example.com')
+        selected = ContactMessage.objects.filter(name__in=['Visitor 1', 'Visitor 2'])
+        response = self.client.post('/admin/properties/contactmessage/', {
+            'action': 'export_csv', '_selected_action': [message.pk for message in selected],
+        })
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertRegex(response['Content-Disposition'], r'filename="contact_messages-\d{4}-\d\d-\d\d\.csv"')
+        rows = self.read_csv(b''.join(response.streaming_content).decode())
+        self.assertEqual([row['name'] for row in rows], ['Visitor 1', 'Visitor 2'])
+
+        subscription = NewsletterSubscription.objects.get()
+        response = self.client.post('/admin/properties/newslettersubscription/', {
+            'action': 'export_jsonl', '_selected_action': [subscription.pk],
+        })
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        line = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(line['email'], 'reader@example.com')
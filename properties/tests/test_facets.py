@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from properties.models import ListingFacet, Project, Property, Property_Category
+from properties.utils.facets import get_facets, rebuild_facets
+
+from .factories import make_project, make_property
+
+
+class FacetMaintenanceTests(TestCase):
+    def setUp(self):
+        self.flats = Property_Category.objects.create(name='Flat')
+        self.duplexes = Property_Category.objects.create(name='Duplex')
+
+    def facet(self, category):
+        return get_facets(Property, category.pk)
+
+    def test_saves_count_and_widen_ranges(self):
+        make_property(self.flats, slug='a', no_of_bedrooms=2)
+        make_property(self.flats, slug='b', no_of_bedrooms=4)
+        facet = self.facet(self.flats)
+        self.assertEqual(facet['count'], 2)
+        self.assertEqual(facet['no_of_bedrooms'], {'min': 2, 'max': 4})
+
+    def test_edit_does_not_count_again(self):
+        listing = make_property(self.flats, slug='a')
+        listing.price = 5
+        listing.save()
+        self.assertEqual(self.facet(self.flats)['count'], 1)
+
+    def test_save_runs_no_aggregate(self):
+        make_property(self.flats, slug='a')
+        with CaptureQueriesContext(connection) as queries:
+            make_property(self.flats, slug='b')
+        facet_sql = [query['sql'] for query in queries if 'listingfacet' in query['sql']]
+        self.assertFalse([sql for sql in facet_sql if 'COUNT(' in sql or 'MIN(' in sql])
+        self.assertIn('"count" = ("properties_listingfacet"."count" + 1)', facet_sql[-1])
+        self.assertEqual(self.facet(self.flats)['count'], 2)
+
+    def test_moving_category_moves_the_count(self):
+        listing = make_property(self.flats, slug='a')
+        make_property(self.flats, slug='b')
+        listing.category = self.duplexes
+        listing.save()
+        self.assertEqual(self.facet(self.flats)['count'], 1)
+        self.assertEqual(self.facet(self.duplexes)['count'], 1)
+
+    def test_deleting_the_last_listing_drops_the_row(self):
+        listing = make_property(self.flats, slug='a')
+        listing.delete()
+        self.assertFalse(ListingFacet.objects.filter(kind='property', category_id=self.flats.pk).exists())
+
+    def test_rebuild_narrows_ranges_and_fixes_drift(self):
+        make_property(self.flats, slug='a', no_of_bedrooms=2)
+        wide = make_property(self.flats, slug='b', no_of_bedrooms=6)
+        wide.delete()
+        self.assertEqual(self.facet(self.flats)['no_of_bedrooms'], {'min': 2, 'max': 6})
+        ListingFacet.objects.update(count=40)
+        rebuild_facets(Property)
+        facet = self.facet(self.flats)
+        self.assertEqual(facet['count'], 1)
+        self.assertEqual(facet['no_of_bedrooms'], {'min': 2, 'max': 2})
+
+    def test_catalog_totals_cover_every_category(self):
+        make_property(self.flats, slug='a', no_of_floors=1)
+        make_property(self.duplexes, slug='b', no_of_floors=3)
+        make_project(slug='c')
+        facets = get_facets(Property)
+        self.assertEqual(facets['count'], 2)
+        self.assertEqual(facets['no_of_floors'], {'min': 1, 'max': 3})
+        self.assertEqual(get_facets(Project)['count'], 1)
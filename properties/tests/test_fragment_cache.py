@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from properties.models import Agent, Property
+from properties.utils.cache import bump_model_version, fragment_cache_key, get_model_versions, lazy_list
+
+from .factories import make_agent
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+AGENT_FRAGMENT = Template(
+    '{% load fragment_cache %}'
+    '{% cachefragment "agents" "agent" vary=page %}{% for agent in agents %}{{ agent.name }};{% endfor %}'
+    '{% endcachefragment %}'
+)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def render(self, page=1):
+        agents = lazy_list(Agent.objects.order_by('name'))
+        return AGENT_FRAGMENT.render(Context({'agents': agents, 'page': page}))
+
+    def test_versions_start_once_and_change_on_bump(self):
+        first = get_model_versions('agent', 'blog')
+        self.assertEqual(get_model_versions('agent', 'blog'), first)
+        bump_model_version(Agent)
+        self.assertNotEqual(get_model_versions('agent')[0], first[0])
+        self.assertEqual(get_model_versions('blog')[0], first[1])
+
+    def test_hit_skips_the_queries(self):
+        make_agent(name='Ada')
+        self.assertEqual(self.render(), 'Ada;')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(), 'Ada;')
+
+    def test_saving_a_model_invalidates_its_fragments(self):
+        agent = make_agent(name='Ada')
+        self.render()
+        agent.name = 'Bola'
+        agent.save()
+        self.assertEqual(self.render(), 'Bola;')
+
+    def test_other_models_leave_the_fragment_cached(self):
+        make_agent(name='Ada')
+        key = fragment_cache_key('agents', ['agent'], [1])
+        self.render()
+        bump_model_version(Property)
+        self.assertEqual(fragment_cache_key('agents', ['agent'], [1]), key)
+
+    def test_vary_values_are_cached_apart(self):
+        self.assertNotEqual(fragment_cache_key('agents', ['agent'], [1]), fragment_cache_key('agents', ['agent'], [2]))
+
+    def test_cached_pages_run_no_queries(self):
+        make_agent(name='Ada')
+        for url in ('/', '/agent/', '/about/'):
+            self.client.get(url)
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from properties.models import Property, PropertyImage
+from properties.tests.factories import make_project, make_property
+from properties.tests.test_images import jpeg
+from properties.utils.gallery import upload_gallery
+from properties.utils.images import LocalImageService
+
+
+def bad_file(name='bad.jpg'):
+    return SimpleUploadedFile(name, b'this is not an image', 'image/jpeg')
+
+
+class GalleryUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_patch = override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/')
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+        service_patch = mock.patch('properties.utils.images._service', LocalImageService())
+        service_patch.start()
+        self.addCleanup(service_patch.stop)
+        self.listing = make_property(slug='flat')
+
+    def test_valid_files_are_stored_in_order(self):
+        files = [jpeg('one.jpg'), bad_file(), jpeg('two.jpg'), bad_file('notes.txt')]
+        result = upload_gallery(self.listing, files, workers=3)
+        self.assertEqual(result.files, [
+            ('one.jpg', None), ('bad.jpg', 'not a valid image'), ('two.jpg', None),
+            ('notes.txt', 'not a supported image type'),
+        ])
+        self.assertEqual(str(result), '2 stored, 2 failed')
+        images = PropertyImage.objects.filter(property=self.listing).order_by('pk')
+        self.assertEqual([str(image.associated_property_image).split('/')[-1][:3] for image in images],
+                         ['one', 'two'])
+        self.assertEqual(Property.objects.get(pk=self.listing.pk).image_count, 2)
+
+    def test_project_galleries(self):
+        project = make_project(slug='gardens')
+        self.assertEqual(upload_gallery(project, [jpeg()]).stored, 1)
+        self.assertEqual(project.projectimage_set.count(), 1)
+
+    def test_avif_container_is_accepted(self):
+        avif = SimpleUploadedFile('flat.avif', b'\x00\x00\x00\x1cftypavif' + b'\x00' * 20, 'image/avif')
+        with mock.patch('properties.utils.gallery.upload_image', return_value='gallery/flat.avif'):
+            self.assertEqual(upload_gallery(self.listing, [avif]).files, [('flat.avif', None)])
+
+    def test_service_errors_are_reported_per_file(self):
+        with mock.patch('properties.utils.gallery.upload_image', side_effect=[OSError('quota exceeded'), 'ok.jpg']):
+            with self.assertLogs('properties.utils.gallery', 'ERROR'):
+                result = upload_gallery(self.listing, [jpeg('one.jpg'), jpeg('two.jpg')], workers=1)
+        self.assertEqual(result.files, [('one.jpg', 'quota exceeded'), ('two.jpg', None)])
+
+    def test_admin_page(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='secret-pass')
+        self.client.force_login(admin)
+        url = f'/admin/properties/property/{self.listing.pk}/gallery/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {'images': [jpeg(), bad_file()]}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json(), {
+            'files': [{'name': 'flat.jpg', 'error': None}, {'name': 'bad.jpg', 'error': 'not a valid image'}],
+            'stored': 1,
+        })
+        self.assertEqual(self.client.post(url, {}, HTTP_ACCEPT='application/json').status_code, 400)
+
+        response = self.client.post(url, {'images': [jpeg()]})
+        self.assertRedirects(response, f'/admin/properties/property/{self.listing.pk}/change/',
+                             fetch_redirect_response=False)
+        self.assertEqual(PropertyImage.objects.count(), 2)
@@ -0,0 +1,85 @@
+import random
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from properties.models import Property, Property_Category
+from properties.tests.factories import make_property
+from properties.utils.geo import geocode, geohash_encode, within_bbox, within_radius
+
+
+class GeocodeTests(SimpleTestCase):
+    def test_geohash(self):
+        self.assertEqual(geohash_encode(57.64911, 10.40744), 'u4pruydqq')
+        self.assertEqual(geohash_encode(57.64911, 10.40744, precision=5), 'u4pru')
+
+    def test_most_specific_place_wins(self):
+        self.assertEqual(geocode('Lekki Phase 1, Lagos'), (6.4698, 3.5852))
+        self.assertEqual(geocode('Somewhere in Lagos'), (6.5244, 3.3792))
+        self.assertEqual(geocode('Victoria Island'), (6.4281, 3.4219))
+        self.assertIsNone(geocode('Atlantis'))
+        self.assertIsNone(geocode(''))
+
+
+class GeoSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Property_Category.objects.create(name='Flat')
+        for slug, location in (('lekki', 'Lekki, Lagos'), ('ikoyi', 'Ikoyi, Lagos'), ('maitama', 'Maitama, Abuja')):
+            make_property(cls.category, slug=slug, title=f'Flat in {slug}', location=location)
+
+    def setUp(self):
+        cache.clear()
+
+    def slugs(self, queryset):
+        return [listing.slug for listing in queryset]
+
+    def test_saving_locates_the_listing(self):
+        listing = Property.objects.get(slug='ikoyi')
+        self.assertEqual((listing.latitude, listing.longitude), (6.45, 3.4333))
+        self.assertEqual(listing.geohash, geohash_encode(6.45, 3.4333))
+
+    def test_hand_entered_coordinates_are_kept(self):
+        listing = Property.objects.get(slug='ikoyi')
+        listing.latitude, listing.longitude = 6.5, 3.5
+        listing.save()
+        listing.refresh_from_db()
+        self.assertEqual((listing.latitude, listing.geohash), (6.5, geohash_encode(6.5, 3.5)))
+
+    def test_radius_search_is_ordered_by_distance(self):
+        self.assertEqual(self.slugs(within_radius(Property.objects.all(), 6.4698, 3.5852, 5)), ['lekki'])
+        nearby = within_radius(Property.objects.all(), 6.4698, 3.5852, 30).order_by('distance_km')
+        self.assertEqual(self.slugs(nearby), ['lekki', 'ikoyi'])
+        self.assertAlmostEqual(nearby[1].distance_km, 17.3, delta=0.5)
+
+    def test_bbox_matches_a_plain_coordinate_filter(self):
+        generator = random.Random(7)
+        Property.objects.bulk_create([
+            Property(category=self.category, slug=f'p{index}', title='Flat', location='', property_type='Flat',
+                     availability='Rent', price=1, living_room=1, dining=1, no_of_bedrooms=1,
+                     no_of_bathrooms=1, no_of_floors=1, features='',
+                     latitude=latitude, longitude=longitude, geohash=geohash_encode(latitude, longitude))
+            for index, (latitude, longitude) in enumerate(
+                (generator.uniform(6.3, 6.7), generator.uniform(3.2, 3.7)) for _ in range(300))
+        ])
+        for box in ((6.4, 3.3, 6.5, 3.45), (6.31, 3.21, 6.69, 3.69), (6.45, 3.5, 6.451, 3.6)):
+            expected = Property.objects.filter(
+                latitude__gte=box[0], longitude__gte=box[1], latitude__lte=box[2], longitude__lte=box[3])
+            self.assertEqual(set(within_bbox(Property.objects.all(), *box)), set(expected), box)
+
+    def test_listing_page_filters_by_radius_and_bbox(self):
+        response = self.client.get('/properties/', {'location': 'Lekki', 'radius': '5'})
+        self.assertEqual(self.slugs(response.context['paginated_properties']), ['lekki'])
+        response = self.client.get('/properties/', {'bbox': '8,7,10,8'})
+        self.assertEqual(self.slugs(response.context['paginated_properties']), ['maitama'])
+        response = self.client.get('/properties/', {'bbox': 'nan,1,2,3'})
+        self.assertEqual(len(response.context['paginated_properties']), 3)
+
+    def test_geocode_listings_command(self):
+        Property.objects.update(latitude=None, longitude=None, geohash='')
+        stdout = StringIO()
+        call_command('geocode_listings', stdout=stdout)
+        self.assertIn('Located 3 properties', stdout.getvalue())
+        self.assertEqual(Property.objects.get(slug='maitama').geohash, geohash_encode(9.0833, 7.5))
@@ -0,0 +1,94 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from cloudinary import CloudinaryImage
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from properties.models import Blog
+from properties.utils.images import CloudinaryImageService, LocalImageService, upload_image
+
+
+RESPONSIVE_TAG = Template('{% load responsive_images %}{% responsive_image image alt="Flat" %}')
+
+
+def jpeg(name='flat.jpg', size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 80, 40)).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+class LocalImageServiceTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_patch = override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/')
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+        service_patch = mock.patch('properties.utils.images._service', LocalImageService())
+        service_patch.start()
+        self.addCleanup(service_patch.stop)
+        self.media_root = media_root
+
+    def test_upload_writes_square_derivatives_up_to_the_source_width(self):
+        name = upload_image(jpeg(), 'gallery')
+        self.assertEqual(name, 'gallery/flat.jpg')
+        written = os.listdir(os.path.join(self.media_root, 'derivatives/gallery'))
+        # The square crop is 600px, so the 768px and 1024px widths are skipped.
+        self.assertEqual(sorted(name for name in written if name.endswith('.webp')), [
+            'flat-320-1x1.webp', 'flat-480-1x1.webp',
+        ])
+        with Image.open(os.path.join(self.media_root, 'derivatives/gallery/flat-480-1x1.webp')) as derivative:
+            self.assertEqual(derivative.size, (480, 480))
+
+    def test_tag_renders_a_picture_with_the_derivatives(self):
+        name = upload_image(jpeg(), 'gallery')
+        html = RESPONSIVE_TAG.render(Context({'image': name}))
+        self.assertIn('<source type="image/webp" srcset="/media/derivatives/gallery/flat-320-1x1.webp 320w, '
+                      '/media/derivatives/gallery/flat-480-1x1.webp 480w"', html)
+        # No 768px derivative exists, so the fallback is the original.
+        self.assertIn('src="/media/gallery/flat.jpg" alt="Flat"', html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_saving_a_new_image_builds_derivatives_after_commit(self):
+        name = default_storage.save('blog/cover.jpg', jpeg())
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            blog = Blog.objects.create(title='Cover', category='news', description='d', slug='cover', image=name)
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'derivatives/blog/cover-320-1x1.webp')))
+        blog = Blog.objects.get(pk=blog.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            blog.title = 'Same cover'
+            blog.save()
+        self.assertEqual(callbacks, [])
+        # The loaded value keeps the file's extension for the local service.
+        html = RESPONSIVE_TAG.render(Context({'image': blog.image}))
+        self.assertIn('/media/derivatives/blog/cover-320-1x1.webp 320w', html)
+        self.assertIn('src="/media/blog/cover.jpg"', html)
+
+    def test_tag_renders_nothing_without_an_image(self):
+        self.assertEqual(RESPONSIVE_TAG.render(Context({'image': None})), '')
+
+
+@mock.patch('properties.utils.images._service', CloudinaryImageService())
+class CloudinaryImageServiceTests(TestCase):
+    def test_tag_renders_an_auto_format_srcset(self):
+        html = RESPONSIVE_TAG.render(Context({'image': CloudinaryImage('listings/flat')}))
+        self.assertNotIn('<picture>', html)
+        self.assertIn('f_auto', html)
+        self.assertIn('w_320', html)
+        self.assertIn(' 1024w', html)
+        self.assertIn('ar_1:1', html)
+
+    def test_upload_requests_eager_derivatives(self):
+        with mock.patch('cloudinary.uploader.upload_resource') as upload:
+            upload_image(jpeg(), 'gallery')
+        options = upload.call_args.kwargs
+        self.assertEqual([transformation['width'] for transformation in options['eager']], [320, 480, 768, 1024])
+        self.assertTrue(options['eager_async'])
@@ -0,0 +1,100 @@
+import io
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from properties.models import Project, Property, Property_Category, PropertyImage
+from properties.utils.facets import get_facets
+from properties.utils.importer import import_listings
+from properties.utils.search import search_type
+
+from .factories import make_agent
+
+
+PROPERTY_HEADER = (
+    'slug,title,availability,location,property_type,category,price,living_room,dining,'
+    'no_of_bedrooms,no_of_bathrooms,no_of_floors,features,agents,images\n'
+)
+
+
+def property_row(slug, price=1000, agents='', images='', category='Flat', bedrooms=2):
+    return (
+        f'{slug},House {slug},Rent,"Lekki, Lagos",Flat,{category},{price},1,1,'
+        f'{bedrooms},2,1,Pool,{agents},{images}\n'
+    )
+
+
+class ListingImportTests(TestCase):
+    def import_csv(self, *rows, **options):
+        return import_listings('property', io.StringIO(PROPERTY_HEADER + ''.join(rows)), 'csv', **options)
+
+    def test_creates_then_updates_by_slug(self):
+        result = self.import_csv(property_row('a'), property_row('b'))
+        self.assertEqual((result.created, result.updated), (2, 0))
+        result = self.import_csv(property_row('a', price=2000), property_row('c'))
+        self.assertEqual((result.created, result.updated), (1, 1))
+        self.assertEqual(Property.objects.get(slug='a').price, 2000)
+        self.assertEqual(Property.objects.count(), 3)
+
+    def test_bad_rows_are_reported_by_line(self):
+        result = self.import_csv(property_row('a'), property_row('b', price='lots'), property_row('c'))
+        self.assertEqual(result.errors, [(3, 'price must be a whole number')])
+        self.assertEqual(sorted(Property.objects.values_list('slug', flat=True)), ['a', 'c'])
+
+    def test_unknown_categories_and_agents(self):
+        Property_Category.objects.create(name='Flat')
+        result = self.import_csv(
+            property_row('a', category='Castle'), property_row('b', agents='nobody@example.com'),
+            create_categories=False,
+        )
+        self.assertEqual(
+            result.errors, [(2, "unknown category 'Castle'"), (3, "unknown agent 'nobody@example.com'")],
+        )
+
+    def test_agents_and_images_are_replaced(self):
+        first = make_agent(email='first@example.com')
+        second = make_agent(email='second@example.com')
+        self.import_csv(property_row('a', agents='first@example.com', images='one.jpg|two.jpg'))
+        self.import_csv(property_row('a', agents='SECOND@example.com', images='three.jpg'))
+        listing = Property.objects.get(slug='a')
+        self.assertEqual(list(listing.associated_agent.all()), [second])
+        self.assertNotIn(first, listing.associated_agent.all())
+        images = PropertyImage.objects.filter(property=listing)
+        self.assertEqual([str(image.associated_property_image) for image in images], ['three'])
+
+    def test_repeated_slug_keeps_the_last_row(self):
+        self.import_csv(property_row('a', price=1), property_row('a', price=2))
+        self.assertEqual(Property.objects.get(slug='a').price, 2)
+
+    def test_derived_data_is_refreshed(self):
+        self.import_csv(property_row('a', bedrooms=1, images='x.jpg|y.jpg'), property_row('b', bedrooms=5))
+        facets = get_facets(Property)
+        self.assertEqual(facets['count'], 2)
+        self.assertEqual(facets['no_of_bedrooms'], {'min': 1, 'max': 5})
+        self.assertEqual(Property.objects.get(slug='a').image_count, 2)
+        self.assertEqual(len(search_type('properties', 'house')), 2)
+
+    def test_json_lines_projects(self):
+        stream = io.StringIO(
+            '{"slug": "p", "title": "Gardens", "location": "Ikoyi", "status": "Ongoing", "category": "Estate", '
+            '"price": "5,000,000", "no_of_block": 2, "no_of_flat": 8, "no_of_floors": 3}\n'
+            '\n'
+            'not json\n'
+        )
+        result = import_listings('project', stream, 'jsonl')
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.errors, [(3, 'not a valid record')])
+        self.assertEqual(Project.objects.get(slug='p').price, 5000000)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'listings.csv')
+            with open(path, 'w', encoding='utf-8') as listings:
+                listings.write(PROPERTY_HEADER + property_row('a') + property_row('b', price='x'))
+            stdout, stderr = StringIO(), StringIO()
+            call_command('import_listings', 'property', path, stdout=stdout, stderr=stderr)
+        self.assertIn('1 created, 0 updated, 1 rejected', stdout.getvalue())
+        self.assertIn('Line 3: price must be a whole number', stderr.getvalue())
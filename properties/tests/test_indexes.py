@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from properties.management.commands.explain_listing_queries import Command as ExplainCommand
+from properties.models import Project, Property
+from properties.tests.factories import make_project, make_property
+from properties.utils.indexes import model_index_names
+
+
+INDEXED_SCENARIOS = (
+    'properties', 'properties:category', 'properties:bedrooms', 'properties:newest',
+    'projects', 'projects:category', 'projects:newest',
+)
+# Filtering on the category can still use the foreign key's own index.
+FOREIGN_KEY_SCENARIOS = ('properties:category', 'projects:category')
+
+
+class ListingIndexTests(TestCase):
+    def test_model_indexes_exist(self):
+        existing = ExplainCommand().existing_indexes()
+        for name in model_index_names(Property, Project):
+            self.assertIn(name, existing)
+
+    def test_requires_listings(self):
+        with self.assertRaisesMessage(CommandError, 'run seed_data first'):
+            call_command('explain_listing_queries', stdout=StringIO())
+
+    def test_listing_queries_use_the_indexes(self):
+        make_property()
+        make_project()
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'plans.json')
+            call_command('explain_listing_queries', iterations=1, compare=True, output=output,
+                         stdout=StringIO())
+            with open(output) as report:
+                results = json.load(report)
+        for name in INDEXED_SCENARIOS:
+            self.assertFalse(results['with_indexes'][name]['full_scan'], name)
+            if name not in FOREIGN_KEY_SCENARIOS:
+                self.assertTrue(results['without_indexes'][name]['full_scan'], name)
+        # The comparison drops the indexes in a transaction that is rolled back.
+        self.assertTrue(set(model_index_names(Property, Project)) <= ExplainCommand().existing_indexes())
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from properties.models import ContactMessage, InspectionBooking, OutboxMessage
+from properties.tests.factories import make_agent, make_property
+from properties.utils.outbox import (
+    OUTBOX_MAX_ATTEMPTS, claim_messages, drain, enqueue_email, retry_failed,
+)
+
+
+CONTACT_POST = {
+    'name': 'Tunde', 'email': 'tunde@example.com', 'phone_number': '8030000000',
+    'subject': 'Viewing', 'message': 'Is the flat still available?',
+}
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise OSError('Connection reset')
+
+
+class BrokenBackend(EmailBackend):
+    def open(self):
+        raise OSError('Connection refused')
+
+
+class OutboxViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_contact_message_is_queued_not_sent(self):
+        response = self.client.post('/contact/', CONTACT_POST)
+        self.assertRedirects(response, '/contact/', fetch_redirect_response=False)
+        self.assertEqual(mail.outbox, [])
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.kind, message.status, message.reply_to),
+                         ('contact_message', 'pending', 'tunde@example.com'))
+        self.assertIn('Is the flat still available?', message.body)
+
+    def test_inspection_booking_notifies_the_listing_agents(self):
+        listing = make_property(slug='two-bedroom-flat')
+        listing.associated_agent.add(make_agent())
+        self.client.post('/properties/two-bedroom-flat', {
+            'name': 'Tunde', 'email': 'tunde@example.com', 'phone_number': '8030000000',
+            'message': 'Saturday morning?',
+        })
+        self.assertEqual(InspectionBooking.objects.count(), 1)
+        self.assertEqual(OutboxMessage.objects.get().recipients, ['ada@example.com'])
+
+    def test_message_is_not_queued_when_the_record_is_rolled_back(self):
+        with mock.patch('properties.views.notify_contact_message', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post('/contact/', CONTACT_POST)
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
+class DrainTests(TestCase):
+    def setUp(self):
+        self.message = enqueue_email('test', 'Hello', 'Body', ['a@example.com', 'a@example.com'],
+                                     html_body='<p>Body</p>', reply_to='b@example.com')
+
+    def test_drain_sends_and_marks_sent(self):
+        self.assertEqual(drain(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['a@example.com'])
+        self.assertEqual(mail.outbox[0].reply_to, ['b@example.com'])
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ('sent', 1))
+        self.assertIsNotNone(self.message.sent_at)
+        self.assertEqual(drain(), 0)
+
+    def test_failures_back_off_then_give_up(self):
+        with self.assertLogs('properties.utils.outbox', 'WARNING'):
+            drain(connection=FailingBackend())
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ('pending', 1))
+        self.assertEqual(self.message.last_error, 'Connection reset')
+        self.assertGreater(self.message.next_attempt_at, timezone.now())
+        self.assertEqual(drain(connection=FailingBackend()), 0)
+
+        OutboxMessage.objects.update(attempts=OUTBOX_MAX_ATTEMPTS - 1, next_attempt_at=timezone.now())
+        with self.assertLogs('properties.utils.outbox', 'ERROR'):
+            drain(connection=FailingBackend())
+        self.message.refresh_from_db()
+        self.assertEqual(self.message.status, 'failed')
+        self.assertEqual(retry_failed(OutboxMessage.objects.all()), 1)
+        self.assertEqual(drain(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_connection_failure_backs_off_the_whole_batch(self):
+        enqueue_email('test', 'Second', 'Body', ['c@example.com'])
+        with self.assertLogs('properties.utils.outbox', 'WARNING'):
+            self.assertEqual(drain(connection=BrokenBackend()), 2)
+        self.assertEqual(set(OutboxMessage.objects.values_list('status', 'attempts')), {('pending', 1)})
+
+    def test_claims_are_exclusive_until_the_lease_expires(self):
+        self.assertEqual(claim_messages(), [self.message])
+        self.assertEqual(claim_messages(), [])
+        OutboxMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim_messages(), [self.message])
+
+
+class DrainOutboxCommandTests(TransactionTestCase):
+    def test_workers_send_every_message_once(self):
+        for index in range(7):
+            enqueue_email('test', f'Message {index}', 'Body', [f'user{index}@example.com'])
+        stdout = StringIO()
+        call_command('drain_outbox', workers=3, batch_size=2, stdout=stdout)
+        self.assertIn('Processed 7 outbox messages', stdout.getvalue())
+        self.assertEqual(sorted(message.subject for message in mail.outbox),
+                         [f'Message {index}' for index in range(7)])
+        self.assertFalse(OutboxMessage.objects.exclude(status='sent').exists())
@@ -0,0 +1,99 @@
+from django.core import signing
+from django.db.models.functions import Length
+from django.test import TestCase
+
+from properties.models import Blog, Property, Property_Category
+from properties.utils.pagination import CURSOR_SALT, CursorPaginator
+
+from .factories import make_property
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index, title in enumerate(['Abuja', 'Lekki', 'Ikoyi', 'Ajah', 'Yaba', 'Ikeja', 'Lekki']):
+            Blog.objects.create(title=title, category='news', description='d', slug=f'blog-{index}')
+
+    def walk(self, paginator):
+        """
+        Follows next cursors from the first page, then previous cursors
+        back from the last, and returns the rows of each page seen.
+        """
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_page_number()))
+        backwards = [pages[-1]]
+        while backwards[-1].has_previous():
+            backwards.append(paginator.page(backwards[-1].previous_page_number()))
+        self.assertEqual(
+            [list(page) for page in reversed(backwards)], [list(page) for page in pages],
+        )
+        self.assertEqual([page.number for page in pages], list(range(1, len(pages) + 1)))
+        return [list(page) for page in pages]
+
+    def test_model_rows(self):
+        queryset = Blog.objects.all()
+        pages = self.walk(CursorPaginator(queryset, 3, ordering=('title', 'id')))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), list(queryset.order_by('title', 'id')))
+
+    def test_datetime_ordering(self):
+        queryset = Blog.objects.all()
+        pages = self.walk(CursorPaginator(queryset, 2, ordering=('-created_at', '-id')))
+        self.assertEqual(sum(pages, []), list(queryset.order_by('-created_at', '-id')))
+
+    def test_annotation_ordering(self):
+        queryset = Blog.objects.annotate(title_length=Length('title'))
+        pages = self.walk(CursorPaginator(queryset, 2, ordering=('-title_length', 'id')))
+        self.assertEqual(sum(pages, []), list(queryset.order_by('-title_length', 'id')))
+
+    def test_values_rows(self):
+        queryset = Blog.objects.values('id', 'title')
+        pages = self.walk(CursorPaginator(queryset, 3, ordering=('title', '-id')))
+        self.assertIsInstance(pages[0][0], dict)
+        self.assertEqual(sum(pages, []), list(queryset.order_by('title', '-id')))
+
+    def test_cursor_round_trip(self):
+        paginator = CursorPaginator(Blog.objects.annotate(title_length=Length('title')), 2, ordering=('-title_length', 'id'))
+        row = paginator.page()[1]
+        values, direction, number = paginator._decode(paginator._encode(row, 'next', 2))
+        self.assertEqual(values, [row.title_length, row.id])
+        self.assertEqual((direction, number), ('next', 2))
+
+    def test_bad_cursors_give_the_first_page(self):
+        paginator = CursorPaginator(Blog.objects.all(), 3, ordering=('title', 'id'))
+        first = list(paginator.page())
+        wrong_length = signing.dumps({'v': ['Lekki'], 'd': 'next', 'n': 2}, salt=CURSOR_SALT, compress=True)
+        wrong_direction = signing.dumps({'v': ['Lekki', '1'], 'd': 'up', 'n': 2}, salt=CURSOR_SALT, compress=True)
+        for cursor in ('garbage', paginator.page().next_page_number() + 'x', wrong_length, wrong_direction):
+            page = paginator.page(cursor)
+            self.assertEqual(list(page), first)
+            self.assertEqual(page.number, 1)
+
+
+class CursorSeekTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Property_Category.objects.create(name='Flat')
+        for index in range(30):
+            make_property(category, slug=f'listing-{index}')
+
+    def test_deep_pages_seek_into_the_index(self):
+        paginator = CursorPaginator(Property.objects.all(), 10)
+        last = paginator.page()[-1]
+        values = [last.updated, last.created, last.id]
+        plan = paginator.queryset.filter(paginator._seek(values, reverse=False)).explain()
+        self.assertIn('SEARCH', plan)
+        self.assertIn('property_recent_idx', plan)
+        self.assertIn('updated<', plan.replace(' ', ''))
+
+    def test_listing_pages_cover_every_row_once(self):
+        paginator = CursorPaginator(Property.objects.all(), 7)
+        seen = []
+        page = paginator.page()
+        while True:
+            seen.extend(listing.pk for listing in page)
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_page_number())
+        self.assertEqual(seen, list(Property.objects.order_by('-updated', '-created', 'id').values_list('pk', flat=True)))
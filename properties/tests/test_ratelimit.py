@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from properties.utils.ratelimit import parse_rate, rate_limit, take_token
+from properties.views import submitted_form
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+TEST_RATE_LIMITS = {
+    'newsletter': {'rate': '60/m', 'burst': 2, 'by': ('ip', 'email')},
+    'review': {'rate': '1/s', 'burst': 1, 'by': ('ip',)},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch.dict('properties.utils.ratelimit.RATE_LIMITS', TEST_RATE_LIMITS, clear=True)
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.factory = RequestFactory()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/s'), 10)
+        self.assertEqual(parse_rate('60/m'), 1)
+        self.assertEqual(parse_rate('10/h'), 10 / 3600)
+        self.assertEqual(parse_rate('24/day'), 24 / 86400)
+
+    def test_burst_then_refill(self):
+        keys = ['ratelimit:newsletter:ip:a']
+        self.assertEqual(take_token('newsletter', keys, now=100), 0)
+        self.assertEqual(take_token('newsletter', keys, now=100), 0)
+        # Empty: the next token arrives one second later at 60/m.
+        self.assertAlmostEqual(take_token('newsletter', keys, now=100), 1)
+        self.assertAlmostEqual(take_token('newsletter', keys, now=100.25), 0.75)
+        self.assertEqual(take_token('newsletter', keys, now=101), 0)
+
+    def test_refill_stops_at_burst(self):
+        keys = ['ratelimit:newsletter:ip:a']
+        take_token('newsletter', keys, now=100)
+        take_token('newsletter', keys, now=100)
+        # A long wait refills only up to the burst of 2.
+        self.assertEqual(take_token('newsletter', keys, now=1000), 0)
+        self.assertEqual(take_token('newsletter', keys, now=1000), 0)
+        self.assertGreater(take_token('newsletter', keys, now=1000), 0)
+
+    def test_rejection_takes_no_tokens(self):
+        empty, fresh = 'ratelimit:newsletter:ip:a', 'ratelimit:newsletter:email:b'
+        take_token('newsletter', [empty], now=100)
+        take_token('newsletter', [empty], now=100)
+        self.assertGreater(take_token('newsletter', [empty, fresh], now=100), 0)
+        # The fresh bucket still holds its whole burst.
+        self.assertEqual(take_token('newsletter', [fresh], now=100), 0)
+        self.assertEqual(take_token('newsletter', [fresh], now=100), 0)
+
+    def test_too_many_posts_get_429_with_retry_after(self):
+        view = rate_limit('newsletter')(lambda request: HttpResponse('ok'))
+        responses = [
+            view(self.factory.post('/', {'email': 'a@example.com'}, REMOTE_ADDR='10.0.0.1'))
+            for _ in range(3)
+        ]
+        self.assertEqual([response.status_code for response in responses], [200, 200, 429])
+        self.assertEqual(responses[2]['Retry-After'], '1')
+
+    def test_limits_each_identity(self):
+        view = rate_limit('newsletter')(lambda request: HttpResponse('ok'))
+        for address in ('10.0.0.1', '10.0.0.2'):
+            view(self.factory.post('/', {'email': 'A@example.com'}, REMOTE_ADDR=address))
+        # A third address, but the same email (in any case), is still limited.
+        response = view(self.factory.post('/', {'email': 'a@example.com '}, REMOTE_ADDR='10.0.0.3'))
+        self.assertEqual(response.status_code, 429)
+
+    def test_get_and_unknown_policies_pass(self):
+        view = rate_limit(lambda request: None)(lambda request: HttpResponse('ok'))
+        for _ in range(5):
+            self.assertEqual(view(self.factory.post('/', REMOTE_ADDR='10.0.0.1')).status_code, 200)
+        view = rate_limit('review')(lambda request: HttpResponse('ok'))
+        for _ in range(5):
+            self.assertEqual(view(self.factory.get('/', REMOTE_ADDR='10.0.0.1')).status_code, 200)
+
+    def test_submitted_form_picks_the_policy(self):
+        self.assertEqual(submitted_form(self.factory.post('/', {'comment': 'Nice', 'rating': 5})), 'review')
+        self.assertEqual(submitted_form(self.factory.post('/', {'message': 'Hi', 'email': 'a@b.c'})), 'inquiry')
+        self.assertEqual(submitted_form(self.factory.post('/', {'email': 'a@b.c'})), 'newsletter')
+
+    def test_policies_are_counted_separately(self):
+        view = rate_limit(submitted_form)(lambda request: HttpResponse('ok'))
+        review = self.factory.post('/', {'comment': 'Nice'}, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(view(review).status_code, 200)
+        self.assertEqual(view(review).status_code, 429)
+        newsletter = self.factory.post('/', {'email': 'a@example.com'}, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(view(newsletter).status_code, 200)
@@ -0,0 +1,63 @@
+from django.db import connection
+from django.test import TestCase
+
+from properties.models import Blog
+from properties.utils.search import SEARCH_TABLE, ensure_search_index, rebuild_index, search, search_type
+
+from .factories import make_agent, make_project, make_property
+
+
+class SearchIndexTests(TestCase):
+    def test_saved_objects_are_found_by_type(self):
+        listing = make_property(title='Lekki Duplex', slug='lekki-duplex')
+        project = make_project(title='Lekki Gardens', slug='lekki-gardens')
+        agent = make_agent(name='Lekki Agent')
+        results = search('lekki')
+        self.assertEqual(results['properties'], [listing])
+        self.assertEqual(results['projects'], [project])
+        self.assertEqual(results['agents'], [agent])
+        self.assertEqual(results['blogs'], [])
+
+    def test_title_matches_rank_above_body_matches(self):
+        in_body = Blog.objects.create(title='Market news', category='news', description='Ikoyi prices', slug='a')
+        in_title = Blog.objects.create(title='Ikoyi guide', category='news', description='Where to live', slug='b')
+        self.assertEqual(search_type('blogs', 'ikoyi'), [in_title, in_body])
+
+    def test_type_names_in_text_do_not_cross_types(self):
+        # A blog mentioning "properties" must not match the properties type.
+        Blog.objects.create(title='properties', category='news', description='properties', slug='a')
+        self.assertEqual(search_type('properties', 'properties'), [])
+
+    def test_prefixes_and_fts_syntax(self):
+        listing = make_property(title='Banana Island Mansion', slug='banana')
+        self.assertEqual(search_type('properties', 'bana isl'), [listing])
+        self.assertEqual(search_type('properties', 'banana" -island*:'), [listing])
+        self.assertEqual(search_type('properties', '***'), [])
+
+    def test_edits_and_deletes_update_the_index(self):
+        listing = make_property(title='Yaba Flat', slug='yaba')
+        listing.title = 'Surulere Flat'
+        listing.save()
+        self.assertEqual(search_type('properties', 'yaba'), [])
+        self.assertEqual(search_type('properties', 'surulere'), [listing])
+        listing.delete()
+        self.assertEqual(search_type('properties', 'surulere'), [])
+
+    def test_rebuild_index(self):
+        make_property(title='Ajah Terrace', slug='ajah')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        self.assertEqual(search_type('properties', 'ajah'), [])
+        self.assertEqual(rebuild_index()['properties'], 1)
+        self.assertEqual(len(search_type('properties', 'ajah')), 1)
+
+    def test_old_unindexed_table_is_replaced_and_refilled(self):
+        listing = make_property(title='Ikeja Bungalow', slug='ikeja')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {SEARCH_TABLE}')
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+                'doc_type UNINDEXED, object_id UNINDEXED, title, body)'
+            )
+        ensure_search_index()
+        self.assertEqual(search_type('properties', 'ikeja'), [listing])
@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from authentication.models import CustomUser
+from properties.models import ListingFacet, Property, PropertyImage
+from properties.utils.search import search_type
+
+
+SMALL_DATASET = {
+    'properties': 20, 'projects': 5, 'agents': 3, 'staff': 2, 'blogs': 4, 'users': 5,
+    'images_per_listing': 1, 'reviews': 10, 'inquiries': 10, 'subscribers': 5, 'stdout': StringIO(),
+}
+
+
+class SeedDataTests(TestCase):
+    def test_same_seed_twice_adds_a_second_dataset(self):
+        call_command('seed_data', seed=42, **SMALL_DATASET)
+        call_command('seed_data', seed=42, **SMALL_DATASET)
+        self.assertEqual(Property.objects.count(), 40)
+        self.assertEqual(CustomUser.objects.count(), 10)
+
+    def test_seeding_fills_the_derived_tables(self):
+        call_command('seed_data', seed=7, **SMALL_DATASET)
+        self.assertEqual(sum(ListingFacet.objects.filter(kind='property').values_list('count', flat=True)), 20)
+        self.assertEqual(sum(Property.objects.values_list('image_count', flat=True)), PropertyImage.objects.count())
+        self.assertEqual(len(search_type('properties', 'bedroom')), 20)
+
+
+class BenchmarkTests(TestCase):
+    def test_benchmark_writes_results_and_compares_with_them(self):
+        call_command('seed_data', seed=1, **SMALL_DATASET)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark', iterations=2, warmup=0, output=path, stdout=StringIO())
+            with open(path) as result_file:
+                results = json.load(result_file)['results']
+            self.assertIn('properties', results)
+            self.assertTrue(all('p95_ms' in result and 'queries' in result for result in results.values()))
+
+            # Every route ran far fewer queries than this; each now looks like a regression.
+            for result in results.values():
+                result['queries'] = -1
+            with open(path, 'w') as result_file:
+                json.dump({'results': results}, result_file)
+            with self.assertRaisesMessage(CommandError, 'Performance regressions'):
+                call_command('benchmark', iterations=2, warmup=0, baseline=path, stdout=StringIO())
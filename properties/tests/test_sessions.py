@@ -0,0 +1,64 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+
+CACHE_SESSIONS = 'django.contrib.sessions.backends.cache'
+
+
+class MigrateSessionsTests(TestCase):
+    def setUp(self):
+        caches['sessions'].clear()
+        self.session = DatabaseSessionStore()
+        self.session['cart'] = ['flat']
+        self.session.create()
+        expired = DatabaseSessionStore()
+        expired['cart'] = ['old']
+        expired.create()
+        Session.objects.filter(pk=expired.session_key).update(expire_date=timezone.now() - timedelta(days=1))
+
+    def migrate(self, *args):
+        stdout = StringIO()
+        call_command('migrate_sessions', *args, batch_size=1, stdout=stdout)
+        return stdout.getvalue()
+
+    @override_settings(SESSION_ENGINE=CACHE_SESSIONS)
+    def test_live_sessions_are_copied_into_the_cache(self):
+        self.assertIn('Copied 1 sessions into the "sessions" cache', self.migrate())
+        self.assertEqual(CacheSessionStore(self.session.session_key).load(), {'cart': ['flat']})
+        self.assertEqual(Session.objects.count(), 2)
+
+    @override_settings(SESSION_ENGINE=CACHE_SESSIONS)
+    def test_delete_removes_the_database_rows(self):
+        self.assertIn('Deleted 2 database sessions', self.migrate('--delete'))
+        self.assertFalse(Session.objects.exists())
+        self.assertEqual(CacheSessionStore(self.session.session_key).load(), {'cart': ['flat']})
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_delete_keeps_rows_for_cached_db(self):
+        self.migrate('--delete')
+        self.assertEqual(Session.objects.count(), 2)
+
+    def test_database_sessions_need_no_migration(self):
+        self.assertIn('nothing to migrate', self.migrate())
+
+
+class MessageStorageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_flash_messages_do_not_write_sessions(self):
+        response = self.client.post('/contact/', {
+            'name': 'Tunde', 'email': 'tunde@example.com', 'phone_number': '8030000000',
+            'subject': 'Viewing', 'message': 'Hello',
+        })
+        self.assertIn('messages', response.cookies)
+        self.assertContains(self.client.get('/contact/'), 'Your message has been sent successfully!')
+        self.assertFalse(Session.objects.exists())
@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
 
+# Under ASGI the home and search pages are served by their async versions.
+page_views = async_views if getattr(settings, 'ASYNC_VIEWS', False) else views
 
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', page_views.home, name='home'),
     path('about/', views.about, name='about'),
     path('blog/', views.blog, name='blog'),
+    path('blog/feed/', views.blog_feed, name='blog_feed'),
     path('agent/', views.agent, name='agent'),
     path('project/', views.project, name='project'),
     path('properties/', views.properties, name='properties'),
@@ -15,5 +19,9 @@ urlpatterns = [
     path('project/<str:category_name>/', views.properties, name='property_category'), 
     path('properties/<str:property_slug>', views.properties_details, name='properties_details'),
     path('blog-details/<slug:slug>/', views.blog_details, name='blog_details'),
-    path('search/', views.global_search, name='global_search'),
+    path('search/', page_views.global_search, name='global_search'),
+    path('api/properties/', api.resource_list, {'resource_name': 'properties'}, name='api_properties'),
+    path('api/projects/', api.resource_list, {'resource_name': 'projects'}, name='api_projects'),
+    path('api/agents/', api.resource_list, {'resource_name': 'agents'}, name='api_agents'),
+    path('api/blogs/', api.resource_list, {'resource_name': 'blogs'}, name='api_blogs'),
 ]
\ No newline at end of file
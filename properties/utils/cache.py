@@ -0,0 +1,63 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def version_key(model_name):
+    return f'model-version:{model_name.lower()}'
+
+
+def get_model_versions(*model_names):
+    """
+    Returns the current cache version of each model, in order.
+
+    Versions live in the shared cache without expiry; a model seen for the
+    first time (or evicted) starts at the current time so it can never
+    collide with a version used before.
+    """
+    keys = [version_key(name) for name in model_names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """
+    Invalidates every fragment that depends on the given model.
+    """
+    cache.set(version_key(model._meta.model_name), time.time_ns(), timeout=None)
+
+
+def fragment_cache_key(name, model_names, vary_on=()):
+    versions = get_model_versions(*model_names)
+    parts = [str(part) for part in (*versions, *vary_on)]
+    digest = hashlib.md5(':'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'fragment:{name}:{digest}'
+
+
+def missing_fragments(fragments):
+    """
+    Takes ``{name: (fragment name, model names)}`` for fragments without
+    ``vary`` values and returns the names whose fragment is not cached,
+    checking them all with one cache lookup.
+    """
+    keys = {name: fragment_cache_key(*fragment) for name, fragment in fragments.items()}
+    cached = cache.get_many(keys.values())
+    return [name for name, key in keys.items() if key not in cached]
+
+
+def lazy_list(queryset):
+    """
+    Defers evaluating a queryset until a template actually reads it, so
+    context built for cached fragments costs nothing on a cache hit.
+    """
+    return SimpleLazyObject(lambda: list(queryset))
@@ -0,0 +1,197 @@
+import logging
+import smtplib
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from properties.models import CampaignRecipient, NewsletterCampaign, NewsletterSubscription
+
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_BATCH_SIZE = getattr(settings, 'CAMPAIGN_BATCH_SIZE', 100)
+# Messages per second; 0 disables throttling.
+CAMPAIGN_RATE_LIMIT = getattr(settings, 'CAMPAIGN_RATE_LIMIT', 10)
+# A campaign still marked as sending after this many seconds without
+# progress is treated as abandoned by its worker and can be claimed again.
+CAMPAIGN_STALE_AFTER = getattr(settings, 'CAMPAIGN_STALE_AFTER', 600)
+
+# Failures that only concern one recipient; anything else (a dropped
+# network, refused credentials) stops the run and leaves the rest pending.
+RECIPIENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, ValueError)
+
+
+def add_recipients(campaign, chunk_size=2000):
+    """
+    Snapshots the current subscriber list into the campaign's recipients.
+    """
+    emails = NewsletterSubscription.objects.order_by('id').values_list('email', flat=True).iterator(
+        chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(emails, chunk_size))
+        if not chunk:
+            break
+        CampaignRecipient.objects.bulk_create(
+            [CampaignRecipient(campaign=campaign, email=email) for email in chunk],
+            batch_size=chunk_size, ignore_conflicts=True,
+        )
+    campaign.total_recipients = campaign.recipients.count()
+    campaign.save(update_fields=['total_recipients', 'updated'])
+
+
+def create_campaign(blog, subject=None):
+    """
+    Creates a draft campaign for a blog post addressed to every current
+    subscriber.
+    """
+    with transaction.atomic():
+        campaign = NewsletterCampaign.objects.create(blog=blog, subject=subject or blog.title)
+        add_recipients(campaign)
+    return campaign
+
+
+def queue_campaigns(queryset):
+    return queryset.filter(status__in=['draft', 'paused']).update(status='queued', updated=timezone.now())
+
+
+def pause_campaigns(queryset):
+    return queryset.filter(status__in=['queued', 'sending']).update(status='paused', updated=timezone.now())
+
+
+def claim_campaign(campaign_id=None):
+    """
+    Atomically marks one queued (or abandoned) campaign as sending and
+    returns it, so that concurrent workers never send the same campaign.
+    """
+    stale = timezone.now() - timedelta(seconds=CAMPAIGN_STALE_AFTER)
+    candidates = NewsletterCampaign.objects.filter(
+        Q(status='queued') | Q(status='sending', updated__lt=stale)
+    ).order_by('created')
+    if campaign_id is not None:
+        candidates = candidates.filter(pk=campaign_id)
+
+    for campaign in candidates[:10]:
+        claimed = NewsletterCampaign.objects.filter(
+            pk=campaign.pk, status=campaign.status, updated=campaign.updated,
+        ).update(status='sending', updated=timezone.now())
+        if claimed:
+            campaign.refresh_from_db()
+            return campaign
+    return None
+
+
+def render_campaign(campaign):
+    """
+    Returns the (text, html) bodies of a campaign. The content is the same
+    for every recipient, so it is rendered once per run.
+    """
+    site_url = getattr(settings, 'SITE_URL', '').rstrip('/')
+    context = {
+        'campaign': campaign,
+        'blog': campaign.blog,
+        'blog_url': site_url + reverse('blog_details', args=[campaign.blog.slug]),
+    }
+    return (
+        render_to_string('emails/newsletter_campaign.txt', context),
+        render_to_string('emails/newsletter_campaign.html', context),
+    )
+
+
+class CampaignSender:
+    """
+    Sends a campaign's pending recipients in batches over one reused mail
+    connection, throttled to ``rate`` messages per second.
+
+    Progress is written per recipient after every batch, so an interrupted
+    run resumes with the first unsent batch; at most one batch can be sent
+    twice after a crash.
+    """
+
+    def __init__(self, campaign, batch_size=CAMPAIGN_BATCH_SIZE, rate=CAMPAIGN_RATE_LIMIT, connection=None):
+        self.campaign = campaign
+        self.batch_size = batch_size
+        self.interval = 1 / rate if rate else 0
+        self.connection = connection or get_connection(fail_silently=False)
+        self.next_send = 0
+
+    def run(self):
+        campaign = self.campaign
+        if campaign.started_at is None:
+            campaign.started_at = timezone.now()
+            campaign.save(update_fields=['started_at', 'updated'])
+        text, html = render_campaign(campaign)
+
+        self.connection.open()
+        try:
+            last_id = 0
+            while True:
+                if NewsletterCampaign.objects.filter(pk=campaign.pk, status='paused').exists():
+                    logger.info('Campaign %s paused', campaign.pk)
+                    return False
+                batch = list(
+                    campaign.recipients.filter(status='pending', id__gt=last_id).order_by('id')[:self.batch_size]
+                )
+                if not batch:
+                    break
+                self.send_batch(batch, text, html)
+                last_id = batch[-1].id
+        finally:
+            self.connection.close()
+
+        NewsletterCampaign.objects.filter(pk=campaign.pk, status='sending').update(
+            status='sent', finished_at=timezone.now(), updated=timezone.now())
+        campaign.refresh_from_db()
+        return True
+
+    def throttle(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_send > now:
+            time.sleep(self.next_send - now)
+        self.next_send = max(now, self.next_send) + self.interval
+
+    def send(self, message):
+        try:
+            self.connection.send_messages([message])
+        except smtplib.SMTPServerDisconnected:
+            # Servers drop idle or long-lived sessions; reconnect once.
+            self.connection.close()
+            self.connection.open()
+            self.connection.send_messages([message])
+
+    def send_batch(self, batch, text, html):
+        sent, failed = [], []
+        for recipient in batch:
+            message = EmailMultiAlternatives(
+                self.campaign.subject, text, settings.DEFAULT_FROM_EMAIL, [recipient.email],
+                connection=self.connection,
+            )
+            message.attach_alternative(html, 'text/html')
+            self.throttle()
+            try:
+                self.send(message)
+            except RECIPIENT_ERRORS as error:
+                recipient.status = 'failed'
+                recipient.error = str(error)[:255]
+                failed.append(recipient)
+            else:
+                sent.append(recipient.id)
+
+        now = timezone.now()
+        with transaction.atomic():
+            CampaignRecipient.objects.filter(id__in=sent).update(status='sent', sent_at=now)
+            CampaignRecipient.objects.bulk_update(failed, ['status', 'error'])
+            NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(
+                sent_count=F('sent_count') + len(sent),
+                failed_count=F('failed_count') + len(failed),
+                updated=now,
+            )
@@ -0,0 +1,78 @@
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from properties.utils.cache import get_model_versions
+
+
+def page_etag(request, last_modified, versions):
+    """
+    Identifies one rendering of a page for one client.
+
+    Besides the data the page shows (the model versions bumped on every
+    write, and the newest ``updated``), the tag covers the client's user
+    and CSRF cookie: the page embeds a CSRF token derived from that cookie,
+    so a copy rendered before the cookie changed would fail on submit.
+    """
+    # Without a session cookie the visitor is anonymous; checking saves
+    # loading the session just to find that out.
+    user_pk = request.user.pk if settings.SESSION_COOKIE_NAME in request.COOKIES else None
+    parts = [
+        request.get_full_path(),
+        str(last_modified),
+        *map(str, get_model_versions(*versions)),
+        str(user_pk),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+    ]
+    return quote_etag(hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest())
+
+
+def patch_page_cache_headers(response):
+    """
+    Lets only the browser keep a page, and makes it revalidate before each
+    reuse. Every page extends _base.html, whose newsletter form embeds a
+    CSRF token, so no page is the same for all visitors and none may be
+    stored by a CDN or reverse proxy.
+    """
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+
+
+def conditional_page(latest=None, versions=()):
+    """
+    Answers a GET or HEAD with 304 Not Modified, before the view runs, when
+    the client's copy of the page is still current, and adds ETag,
+    Last-Modified and Cache-Control headers to fresh responses.
+
+    ``latest(request, *args, **kwargs)`` returns the newest ``updated``
+    timestamp the page shows, or None; ``versions`` names the models whose
+    cache versions the page depends on. Requests with flash messages
+    waiting are always rendered so the messages are shown.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            last_modified = latest(request, *args, **kwargs) if latest else None
+            timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+            etag = page_etag(request, last_modified, versions)
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response.headers.setdefault('ETag', etag)
+            if timestamp is not None:
+                response.headers.setdefault('Last-Modified', http_date(timestamp))
+            patch_page_cache_headers(response)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,67 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from properties.models import (
+    InspectionBooking, Project, Project_Review, ProjectContactMessage, ProjectImage, Property, Property_Review,
+    PropertyImage,
+)
+from properties.utils.cache import bump_model_version
+
+
+# Related model -> (listing model, foreign key attribute, counter field).
+COUNTED_RELATIONS = {
+    Property_Review: (Property, 'property_id', 'review_count'),
+    InspectionBooking: (Property, 'property_id', 'inquiry_count'),
+    PropertyImage: (Property, 'property_id', 'image_count'),
+    Project_Review: (Project, 'project_id', 'review_count'),
+    ProjectContactMessage: (Project, 'project_id', 'inquiry_count'),
+    ProjectImage: (Project, 'project_id', 'image_count'),
+}
+
+
+def adjust_counter(related_model, instance, delta):
+    """
+    Adds ``delta`` to the listing counter for a related row that was just
+    created or deleted.
+
+    The change is a single ``UPDATE ... SET n = n + delta`` in the caller's
+    transaction, so concurrent writers never lose an increment.
+    """
+    model, foreign_key, field = COUNTED_RELATIONS[related_model]
+    model.objects.filter(pk=getattr(instance, foreign_key)).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+    # Cached listing cards show the counts.
+    bump_model_version(model)
+
+
+def _actual_count(related_model, foreign_key):
+    counts = (
+        related_model.objects.filter(**{foreign_key: OuterRef('pk')})
+        .values(foreign_key).annotate(total=Count('pk')).values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def reconcile_counters(model):
+    """
+    Recounts the related rows of every listing of ``model`` and corrects
+    the counters that drifted. Returns the slugs of the corrected listings.
+    """
+    actual = {
+        field: _actual_count(related_model, foreign_key)
+        for related_model, (listing_model, foreign_key, field) in COUNTED_RELATIONS.items()
+        if listing_model is model
+    }
+    drift = Q()
+    for field in actual:
+        drift |= ~Q(**{field: F(f'actual_{field}')})
+    drifted = model.objects.annotate(
+        **{f'actual_{field}': expression for field, expression in actual.items()}
+    ).filter(drift)
+
+    rows = list(drifted.values_list('pk', 'slug'))
+    if rows:
+        model.objects.filter(pk__in=[pk for pk, _ in rows]).update(**actual)
+        bump_model_version(model)
+    return [slug for _, slug in rows]
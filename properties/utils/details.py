@@ -0,0 +1,86 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+
+from eswift.db_router import primary_reads
+from properties.models import Project, Project_Review, Property, Property_Review
+from properties.utils.cache import get_model_versions
+
+
+DETAIL_CACHE_TIMEOUT = getattr(settings, 'DETAIL_CACHE_TIMEOUT', 60 * 60)
+RECENT_REVIEWS = getattr(settings, 'DETAIL_RECENT_REVIEWS', 5)
+
+# Model versions a cached detail depends on: the listing's own model, so
+# bulk writers that only bump its version (imports, counter and geocode
+# updates) are seen, and the shared rows shown on many detail pages.
+DETAIL_DEPENDENCIES = {
+    Property: ('property', 'agent', 'property_category'),
+    Project: ('project', 'project_category'),
+}
+
+
+def detail_cache_key(model, slug):
+    digest = hashlib.md5(str(slug).encode(), usedforsecurity=False).hexdigest()
+    return f'detail:{model._meta.model_name}:{digest}'
+
+
+def invalidate_detail(model, *slugs):
+    cache.delete_many([detail_cache_key(model, slug) for slug in slugs if slug])
+
+
+def _recent_reviews(review_model):
+    return Prefetch(
+        'reviews',
+        queryset=review_model.objects.select_related('user').order_by('-created_at')[:RECENT_REVIEWS],
+        to_attr='recent_reviews',
+    )
+
+
+def _load(model, queryset, slug, related):
+    """
+    Returns the listing for ``slug`` with its related rows, from the cache
+    when possible.
+
+    The model versions it depends on are stored with the cached value rather
+    than in the key, so the slug's key stays the same and a single delete
+    invalidates it. The listing is read from the primary because the
+    result is cached.
+    """
+    key = detail_cache_key(model, slug)
+    versions = get_model_versions(*DETAIL_DEPENDENCIES[model])
+    cached = cache.get(key)
+    if cached is not None and cached['versions'] == versions:
+        return cached['detail']
+
+    with primary_reads():
+        listing = get_object_or_404(queryset, slug=slug)
+        detail = {'listing': listing, 'reviews': listing.recent_reviews}
+        for name, attribute in related.items():
+            detail[name] = list(getattr(listing, attribute).all())
+    cache.set(key, {'versions': versions, 'detail': detail}, DETAIL_CACHE_TIMEOUT)
+    return detail
+
+
+def load_property_detail(slug):
+    """
+    Loads a property with its category, images, agents and recent reviews
+    in four queries (none on a cache hit), raising Http404 when missing.
+    """
+    queryset = Property.objects.select_related('category').prefetch_related(
+        'propertyimage_set', 'associated_agent', _recent_reviews(Property_Review),
+    )
+    return _load(Property, queryset, slug, {'images': 'propertyimage_set', 'agents': 'associated_agent'})
+
+
+def load_project_detail(slug):
+    """
+    Loads a project with its category, images and recent reviews in three
+    queries (none on a cache hit), raising Http404 when missing.
+    """
+    queryset = Project.objects.select_related('category').prefetch_related(
+        'projectimage_set', _recent_reviews(Project_Review),
+    )
+    return _load(Project, queryset, slug, {'images': 'projectimage_set'})
@@ -1,15 +1,15 @@
-from properties.forms import NewsletterSubscriptionForm
+from django.contrib import messages
+from django.shortcuts import redirect
+
 from properties.models import NewsletterSubscription
 
-def handle_email_subscription(request, form_data):
-    form = NewsletterSubscriptionForm(form_data)
+
+def handle_email_subscription(request, form, redirect_url):
     if form.is_valid():
         email = form.cleaned_data['email']
-        if NewsletterSubscription.objects.filter(email=email).exists():
-            return 'You are already subscribed.'
+        _subscription, created = NewsletterSubscription.objects.get_or_create(email=email)
+        if created:
+            messages.success(request, 'Your subscription has been successful!')
         else:
-            subscription = NewsletterSubscription(email=email)
-            subscription.save()
-            return 'Your subscription has been successful!'
-    else:
-        return None
+            messages.info(request, 'You are already subscribed.')
+    return redirect(redirect_url)
@@ -0,0 +1,124 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from properties.models import ContactMessage, InspectionBooking, NewsletterSubscription, ProjectContactMessage
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Each kind maps its column headers to a values() column; every kind is
+# filtered by date on ``created_at``.
+EXPORT_SPECS = {
+    'contact_messages': {
+        'model': ContactMessage,
+        'columns': {
+            'id': 'id', 'created_at': 'created_at', 'name': 'name', 'email': 'email', 'phone': 'phone',
+            'subject': 'subject', 'message': 'message',
+        },
+    },
+    'project_messages': {
+        'model': ProjectContactMessage,
+        'columns': {
+            'id': 'id', 'created_at': 'created_at', 'project': 'project__title', 'project_slug': 'project__slug',
+            'name': 'name', 'email': 'email', 'phone': 'phone', 'message': 'message',
+        },
+    },
+    'inspection_bookings': {
+        'model': InspectionBooking,
+        'columns': {
+            'id': 'id', 'created_at': 'created_at', 'property': 'property__title',
+            'property_slug': 'property__slug', 'name': 'name', 'email': 'email', 'phone': 'phone',
+            'message': 'message',
+        },
+    },
+    'subscribers': {
+        'model': NewsletterSubscription,
+        'columns': {'id': 'id', 'created_at': 'created_at', 'email': 'email'},
+    },
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def export_kind(model):
+    for kind, spec in EXPORT_SPECS.items():
+        if spec['model'] is model:
+            return kind
+    raise ValueError(f'{model.__name__} cannot be exported')
+
+
+def filter_dates(queryset, since=None, until=None):
+    """
+    Keeps rows created on or after the ``since`` date and on or before the
+    ``until`` date, both taken as whole days in the current time zone.
+
+    Comparing ``created_at`` with datetimes, rather than through ``__date``,
+    lets the database use the column's index.
+    """
+    if since:
+        queryset = queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(since, time.min)))
+    if until:
+        next_day = timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min))
+        queryset = queryset.filter(created_at__lt=next_day)
+    return queryset
+
+
+def export_rows(kind, queryset=None, since=None, until=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the rows of one export kind as dicts keyed by column header.
+
+    Rows are read as plain values in primary-key order and fetched
+    ``chunk_size`` at a time, so memory stays flat however many there are.
+    """
+    spec = EXPORT_SPECS[kind]
+    if queryset is None:
+        queryset = spec['model'].objects.all()
+    queryset = filter_dates(queryset, since, until)
+    headers = list(spec['columns'])
+    rows = queryset.order_by('pk').values_list(*spec['columns'].values()).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield dict(zip(headers, row))
+
+
+class Echo:
+    """
+    A file-like object whose write returns the text, so ``csv.writer``
+    produces lines to yield instead of filling a buffer.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Spreadsheets run cells starting with these as formulas; the messages
+    # come from the public, so quote them as text.
+    if isinstance(value, str) and value.startswith(('=', '+', '-', '@', '\t', '\r')):
+        return "'" + value
+    return value
+
+
+def encode_rows(kind, rows, file_format):
+    """
+    Yields an export as chunks of text: CSV with a header line, or one
+    JSON object per line.
+    """
+    if file_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_SPECS[kind]['columns'])
+        for row in rows:
+            yield writer.writerow([csv_cell(value) for value in row.values()])
+    elif file_format == 'jsonl':
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+    else:
+        raise ValueError(f'Unsupported export format: {file_format}')
@@ -0,0 +1,133 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Min
+from django.utils import timezone
+
+from properties.models import ListingFacet, Project, Property
+
+
+FACET_FIELDS = {
+    Property: ('no_of_bedrooms', 'no_of_bathrooms', 'no_of_floors'),
+    Project: ('no_of_block', 'no_of_flat', 'no_of_floors'),
+}
+
+
+def facet_kind(model):
+    return model._meta.model_name
+
+
+def widen_ranges(ranges, model, listing):
+    """
+    Returns ``ranges`` stretched to take in the listing's values.
+    """
+    widened = {}
+    for field in FACET_FIELDS[model]:
+        value = getattr(listing, field)
+        bounds = ranges.get(field) or {'min': None, 'max': None}
+        widened[field] = {
+            'min': value if bounds['min'] is None else min(bounds['min'], value),
+            'max': value if bounds['max'] is None else max(bounds['max'], value),
+        }
+    return widened
+
+
+def adjust_category_facet(model, category_id, delta, listing=None):
+    """
+    Applies one listing write to its category's facet row: ``delta`` is
+    added to the count and the listing's values widen the ranges.
+
+    The row is locked and the count changed with F(), so concurrent saves
+    add up rather than overwrite each other, and no aggregate is run.
+    Ranges only widen here; one left too wide by an edit or delete is
+    narrowed by the next ``rebuild_facets``.
+    """
+    kind = facet_kind(model)
+    with transaction.atomic():
+        facets = ListingFacet.objects.select_for_update()
+        if listing is None:
+            facet = facets.filter(kind=kind, category_id=category_id).first()
+            if facet is None:
+                return
+        else:
+            facet, _ = facets.get_or_create(kind=kind, category_id=category_id)
+
+        updates = {'updated': timezone.now()}
+        if listing is not None:
+            updates['ranges'] = widen_ranges(facet.ranges, model, listing)
+        rows = ListingFacet.objects.filter(pk=facet.pk)
+        if delta < 0:
+            # A count already at zero (drifted before a rebuild) stays there.
+            rows.filter(count__gte=-delta).update(count=F('count') + delta)
+            rows.filter(count=0).delete()
+        elif delta:
+            updates['count'] = F('count') + delta
+        rows.update(**updates)
+
+
+def refresh_category_facet(model, category_id):
+    """
+    Recomputes the stored count and min/max ranges for a single category.
+
+    Only the rows of that category are aggregated, so the cost of a rebuild
+    does not grow with the size of the whole catalog.
+    """
+    fields = FACET_FIELDS[model]
+    aggregates = {'count': Count('id')}
+    for field in fields:
+        aggregates[f'{field}__min'] = Min(field)
+        aggregates[f'{field}__max'] = Max(field)
+    values = model.objects.filter(category_id=category_id).aggregate(**aggregates)
+
+    if not values['count']:
+        ListingFacet.objects.filter(kind=facet_kind(model), category_id=category_id).delete()
+        return None
+
+    ranges = {
+        field: {'min': values[f'{field}__min'], 'max': values[f'{field}__max']}
+        for field in fields
+    }
+    facet, _ = ListingFacet.objects.update_or_create(
+        kind=facet_kind(model),
+        category_id=category_id,
+        defaults={'count': values['count'], 'ranges': ranges},
+    )
+    return facet
+
+
+def rebuild_facets(model):
+    """
+    Rebuilds every facet row for the given listing model.
+    """
+    category_ids = set(model.objects.values_list('category_id', flat=True).distinct())
+    stale = ListingFacet.objects.filter(kind=facet_kind(model)).exclude(category_id__in=category_ids)
+    stale.delete()
+    for category_id in category_ids:
+        refresh_category_facet(model, category_id)
+    return len(category_ids)
+
+
+def get_facets(model, category_id=None):
+    """
+    Returns the listing count and per-field min/max for a category, or for
+    the whole catalog when no category is given.
+
+    Reads from the precomputed facet table, so this is a single query over
+    one row per category instead of aggregates over the listing table.
+    """
+    facets = ListingFacet.objects.filter(kind=facet_kind(model))
+    if category_id is not None:
+        facets = facets.filter(category_id=category_id)
+
+    result = {'count': 0}
+    for field in FACET_FIELDS[model]:
+        result[field] = {'min': None, 'max': None}
+
+    for facet in facets.only('count', 'ranges'):
+        result['count'] += facet.count
+        for field in FACET_FIELDS[model]:
+            bounds = facet.ranges.get(field, {})
+            current = result[field]
+            if bounds.get('min') is not None and (current['min'] is None or bounds['min'] < current['min']):
+                current['min'] = bounds['min']
+            if bounds.get('max') is not None and (current['max'] is None or bounds['max'] > current['max']):
+                current['max'] = bounds['max']
+    return result
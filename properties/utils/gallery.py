@@ -0,0 +1,106 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from properties.models import Project, ProjectImage, Property, PropertyImage
+from properties.utils.counters import adjust_counter
+from properties.utils.details import invalidate_detail
+from properties.utils.images import upload_image
+
+
+logger = logging.getLogger(__name__)
+
+# Uploads run at the same time per request; each holds a connection to the
+# image service, not to the database.
+GALLERY_UPLOAD_WORKERS = getattr(settings, 'GALLERY_UPLOAD_WORKERS', 6)
+GALLERY_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif')
+
+GALLERY_SPECS = {
+    Property: {'image_model': PropertyImage, 'owner_field': 'property', 'image_field': 'associated_property_image'},
+    Project: {'image_model': ProjectImage, 'owner_field': 'project', 'image_field': 'associated_project_image'},
+}
+
+
+class GalleryResult:
+    def __init__(self):
+        # (file name, error message or None), in upload order.
+        self.files = []
+
+    @property
+    def stored(self):
+        return sum(1 for _name, error in self.files if error is None)
+
+    @property
+    def failed(self):
+        return [(name, error) for name, error in self.files if error is not None]
+
+    def __str__(self):
+        return f'{self.stored} stored, {len(self.failed)} failed'
+
+
+def _is_image(file):
+    """
+    Checks the file's content, not just its name, is an image Pillow can
+    read. The file is left rewound for the upload.
+    """
+    from PIL import Image
+
+    head = file.read(12)
+    file.seek(0)
+    # Pillow only reads AVIF from 11.2 on; accept the container header.
+    if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+        return True
+    try:
+        with Image.open(file) as image:
+            image.verify()
+    except Exception:
+        return False
+    finally:
+        file.seek(0)
+    return True
+
+
+def _store(file, folder):
+    if os.path.splitext(file.name)[1].lower() not in GALLERY_EXTENSIONS:
+        return None, 'not a supported image type'
+    if not _is_image(file):
+        return None, 'not a valid image'
+    try:
+        return upload_image(file, folder), None
+    except Exception as error:
+        logger.exception('Could not upload gallery image %s', file.name)
+        return None, str(error) or error.__class__.__name__
+
+
+def upload_gallery(listing, files, workers=GALLERY_UPLOAD_WORKERS):
+    """
+    Uploads images to a listing's gallery and returns a GalleryResult.
+
+    Files go to the image service concurrently through a bounded thread
+    pool; the workers never touch the database. The stored images are then
+    added with one bulk insert, keeping the order the files were given in,
+    and the listing's image counter and cached detail page are updated
+    once for the whole batch.
+    """
+    spec = GALLERY_SPECS[type(listing)]
+    folder = f'gallery/{listing._meta.model_name}/{listing.pk}'
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+        outcomes = list(pool.map(lambda file: _store(file, folder), files))
+
+    result = GalleryResult()
+    images = []
+    for file, (value, error) in zip(files, outcomes):
+        result.files.append((file.name, error))
+        if error is None:
+            images.append(spec['image_model'](**{spec['owner_field']: listing, spec['image_field']: value}))
+
+    if images:
+        # bulk_create skips the model signals, so do their work here.
+        with transaction.atomic():
+            spec['image_model'].objects.bulk_create(images)
+            adjust_counter(spec['image_model'], images[0], len(images))
+        invalidate_detail(type(listing), listing.slug)
+    return result
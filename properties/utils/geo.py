@@ -0,0 +1,244 @@
+import csv
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+from django.db.models.functions import Sqrt
+
+
+GAZETTEER_PATH = getattr(
+    settings, 'GAZETTEER_PATH', Path(__file__).resolve().parent.parent / 'data' / 'gazetteer.csv'
+)
+# Precision of the stored geohash; 9 characters is a cell of about 5m.
+GEOHASH_PRECISION = 9
+# Most geohash ranges a bounding-box query may scan before it falls back
+# to coarser (larger) cells.
+GEOHASH_MAX_CELLS = getattr(settings, 'GEOHASH_MAX_CELLS', 16)
+# Length of one degree of latitude on a sphere of radius 6371 km.
+KM_PER_DEGREE = 111.195
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+Place = namedtuple('Place', 'name parent latitude longitude')
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encodes a point as a geohash: nearby points share long prefixes, so a
+    cell is a contiguous range of an ordinary index.
+    """
+    ranges = {'lat': [-90.0, 90.0], 'lon': [-180.0, 180.0]}
+    chars = []
+    bits = bit_count = 0
+    use_longitude = True
+    while len(chars) < precision:
+        axis, value = ('lon', longitude) if use_longitude else ('lat', latitude)
+        low, high = ranges[axis]
+        middle = (low + high) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            ranges[axis][0] = middle
+        else:
+            bits = bits * 2
+            ranges[axis][1] = middle
+        use_longitude = not use_longitude
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """
+    Returns the (height, width) in degrees of a geohash cell.
+    """
+    bits = precision * 5
+    return 180 / 2 ** (bits // 2), 360 / 2 ** math.ceil(bits / 2)
+
+
+def cell_successor(cell):
+    """
+    Returns the smallest geohash that sorts after every hash starting with
+    ``cell``, or None when there is none.
+    """
+    cell = cell.rstrip(BASE32[-1])
+    if not cell:
+        return None
+    return cell[:-1] + BASE32[BASE32.index(cell[-1]) + 1]
+
+
+def covering_cells(min_lat, min_lon, max_lat, max_lon):
+    """
+    Returns geohash cells that together cover the bounding box, using the
+    finest precision that needs at most ``GEOHASH_MAX_CELLS`` cells.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor((max_lat - min_lat) / height) + 2
+        columns = math.floor((max_lon - min_lon) / width) + 2
+        if rows * columns <= GEOHASH_MAX_CELLS:
+            break
+
+    # Stepping by at most one cell size from corner to corner touches
+    # every cell the box overlaps.
+    cells = set()
+    latitude = min_lat
+    while True:
+        longitude = min_lon
+        while True:
+            cells.add(geohash_encode(latitude, longitude, precision))
+            if longitude >= max_lon:
+                break
+            longitude = min(longitude + width, max_lon)
+        if latitude >= max_lat:
+            break
+        latitude = min(latitude + height, max_lat)
+    return sorted(cells)
+
+
+def bounding_box(latitude, longitude, km):
+    """
+    Returns ``(min_lat, min_lon, max_lat, max_lon)`` around a point.
+    """
+    lat_delta = km / KM_PER_DEGREE
+    lon_delta = km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        max(latitude - lat_delta, -90.0), max(longitude - lon_delta, -180.0),
+        min(latitude + lat_delta, 90.0), min(longitude + lon_delta, 180.0),
+    )
+
+
+def within_bbox(queryset, min_lat, min_lon, max_lat, max_lon):
+    """
+    Filters listings to a bounding box.
+
+    The geohash ranges of the covering cells narrow the rows through the
+    geohash index; the coordinate comparisons then trim the cell edges.
+    """
+    cells = Q()
+    for cell in covering_cells(min_lat, min_lon, max_lat, max_lon):
+        cell_range = Q(geohash__gte=cell)
+        successor = cell_successor(cell)
+        if successor:
+            cell_range &= Q(geohash__lt=successor)
+        cells |= cell_range
+    return queryset.filter(cells).filter(
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lon, longitude__lte=max_lon,
+    )
+
+
+def annotate_distance(queryset, latitude, longitude):
+    """
+    Annotates ``distance_km`` from the given point.
+
+    Uses the equirectangular approximation, which is accurate to well under
+    1% at the distances a buyer searches by and needs only arithmetic the
+    database can evaluate on any backend.
+    """
+    scale = math.cos(math.radians(latitude))
+    lat_delta = F('latitude') - latitude
+    lon_delta = (F('longitude') - longitude) * scale
+    return queryset.annotate(distance_km=ExpressionWrapper(
+        Sqrt(lat_delta * lat_delta + lon_delta * lon_delta) * KM_PER_DEGREE,
+        output_field=FloatField(),
+    ))
+
+
+def within_radius(queryset, latitude, longitude, km):
+    """
+    Filters listings to those within ``km`` of a point and annotates their
+    ``distance_km``.
+    """
+    queryset = within_bbox(queryset, *bounding_box(latitude, longitude, km))
+    return annotate_distance(queryset, latitude, longitude).filter(distance_km__lte=km)
+
+
+def _words(text):
+    return f" {re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()} "
+
+
+@lru_cache(maxsize=4)
+def load_gazetteer(path):
+    with open(path, newline='', encoding='utf-8') as gazetteer:
+        return [
+            Place(_words(row['name']), _words(row['parent']) if row['parent'] else None,
+                  float(row['latitude']), float(row['longitude']))
+            for row in csv.DictReader(gazetteer)
+        ]
+
+
+def geocode(text):
+    """
+    Returns ``(latitude, longitude)`` for the most specific gazetteer place
+    named in free text such as "Lekki Phase 1, Lagos", or None.
+
+    An area whose city is also named ranks above one named alone, which in
+    turn ranks above a bare city; longer names win ties.
+    """
+    if not text:
+        return None
+    haystack = _words(text)
+    best, best_rank = None, None
+    for place in load_gazetteer(str(GAZETTEER_PATH)):
+        if place.name not in haystack:
+            continue
+        if place.parent is None:
+            rank = (0, len(place.name))
+        else:
+            rank = (2 if place.parent in haystack else 1, len(place.name))
+        if best_rank is None or rank > best_rank:
+            best, best_rank = place, rank
+    return (best.latitude, best.longitude) if best else None
+
+
+def point_fields(latitude, longitude):
+    """
+    Returns the stored location fields for a point, or blanks for None.
+    """
+    if latitude is None or longitude is None:
+        return {'latitude': None, 'longitude': None, 'geohash': ''}
+    return {'latitude': latitude, 'longitude': longitude, 'geohash': geohash_encode(latitude, longitude)}
+
+
+def locate(instance, previous_location=None, previous_point=None):
+    """
+    Geocodes a listing being saved when its location text changed, unless
+    its coordinates were edited by hand at the same time, and keeps its
+    geohash in step with the coordinates.
+    """
+    point = (instance.latitude, instance.longitude)
+    if instance.latitude is None or (instance.location != previous_location and point == previous_point):
+        point = geocode(instance.location) or (None, None)
+    for field, value in point_fields(*point).items():
+        setattr(instance, field, value)
+
+
+def geocode_missing(model, everything=False, batch_size=500):
+    """
+    Fills in coordinates for listings written without the model signals,
+    or every listing when ``everything`` is set. Returns how many listings
+    were located.
+    """
+    queryset = model.objects.order_by('pk')
+    if not everything:
+        queryset = queryset.filter(geohash='')
+    located = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).only('pk', 'location', 'latitude', 'longitude', 'geohash')[:batch_size]
+        )
+        if not batch:
+            return located
+        last_pk = batch[-1].pk
+        for listing in batch:
+            for field, value in point_fields(*(geocode(listing.location) or (None, None))).items():
+                setattr(listing, field, value)
+            located += listing.latitude is not None
+        model.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
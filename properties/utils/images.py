@@ -0,0 +1,185 @@
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+RESPONSIVE_WIDTHS = getattr(settings, 'RESPONSIVE_IMAGE_WIDTHS', (320, 480, 768, 1024))
+RESPONSIVE_FORMATS = getattr(settings, 'RESPONSIVE_IMAGE_FORMATS', ('avif', 'webp'))
+DEFAULT_ASPECT = '1:1'
+
+# Models and the image fields that get derivatives when uploaded.
+IMAGE_FIELDS = {
+    'agent': ('image',),
+    'blog': ('image',),
+    'staff': ('image',),
+    'project': ('thumbnail',),
+    'property': ('thumbnail',),
+    'projectimage': ('associated_project_image',),
+    'propertyimage': ('associated_property_image',),
+}
+
+
+def public_id_of(image):
+    if not image:
+        return None
+    return getattr(image, 'public_id', None) or str(image)
+
+
+class CloudinaryImageService:
+    """
+    Derivatives are Cloudinary transformations; uploads request them eagerly
+    so the first visitor does not pay for generating them. Delivery uses
+    f_auto, which lets Cloudinary pick AVIF or WebP per browser, so one
+    srcset covers every format.
+    """
+
+    negotiates_format = True
+
+    def transformation(self, width, fmt='auto', aspect=DEFAULT_ASPECT):
+        options = {'width': width, 'fetch_format': fmt, 'quality': 'auto'}
+        if aspect:
+            options.update({'crop': 'fill', 'gravity': 'auto', 'aspect_ratio': aspect})
+        else:
+            options['crop'] = 'scale'
+        return options
+
+    def source_id(self, image):
+        return public_id_of(image)
+
+    def url(self, image, width, fmt='auto', aspect=DEFAULT_ASPECT):
+        return image.build_url(secure=True, **self.transformation(width, fmt, aspect))
+
+    def srcset(self, image, fmt='auto', aspect=DEFAULT_ASPECT):
+        return [(self.url(image, width, fmt, aspect), width) for width in RESPONSIVE_WIDTHS]
+
+    def upload(self, file, folder):
+        from cloudinary import uploader
+
+        # Requesting the derivatives with the upload saves a second call.
+        return uploader.upload_resource(
+            file, folder=folder, resource_type='image',
+            eager=[self.transformation(width, 'auto') for width in RESPONSIVE_WIDTHS],
+            eager_async=True,
+        )
+
+    def generate(self, public_id):
+        import cloudinary.uploader
+
+        cloudinary.uploader.explicit(
+            public_id,
+            type='upload',
+            eager=[self.transformation(width, 'auto') for width in RESPONSIVE_WIDTHS],
+            eager_async=True,
+        )
+
+
+class LocalImageService:
+    """
+    Stand-in for development and tests: the image value is treated as a
+    path under MEDIA_ROOT and derivatives are written next to it under
+    ``derivatives/`` with Pillow.
+    """
+
+    negotiates_format = False
+
+    def derivative_name(self, public_id, width, fmt, aspect):
+        stem = os.path.splitext(public_id)[0]
+        suffix = f"-{aspect.replace(':', 'x')}" if aspect else ''
+        return f'derivatives/{stem}-{width}{suffix}.{fmt}'
+
+    def source_id(self, image):
+        # CloudinaryField loads "gallery/a.jpg" as public id "gallery/a" with
+        # the extension as its format; the file name needs both.
+        public_id = public_id_of(image)
+        if getattr(image, 'public_id', None) and image.format:
+            return f'{public_id}.{image.format}'
+        return public_id
+
+    def url(self, image, width, fmt='webp', aspect=DEFAULT_ASPECT):
+        name = self.derivative_name(self.source_id(image), width, fmt, aspect)
+        if os.path.exists(os.path.join(settings.MEDIA_ROOT, name)):
+            return settings.MEDIA_URL + name
+        return settings.MEDIA_URL + self.source_id(image)
+
+    def srcset(self, image, fmt='webp', aspect=DEFAULT_ASPECT):
+        public_id = self.source_id(image)
+        candidates = []
+        for width in RESPONSIVE_WIDTHS:
+            name = self.derivative_name(public_id, width, fmt, aspect)
+            if os.path.exists(os.path.join(settings.MEDIA_ROOT, name)):
+                candidates.append((settings.MEDIA_URL + name, width))
+        return candidates
+
+    def upload(self, file, folder):
+        name = default_storage.save(f'{folder}/{os.path.basename(file.name)}', file)
+        generate_derivatives(name)
+        return name
+
+    def generate(self, public_id):
+        from PIL import Image, ImageOps, features
+
+        source = os.path.join(settings.MEDIA_ROOT, public_id)
+        if not os.path.exists(source):
+            return
+        with Image.open(source) as original:
+            original = ImageOps.exif_transpose(original).convert('RGB')
+            square = ImageOps.fit(original, (min(original.size),) * 2)
+            for fmt in RESPONSIVE_FORMATS:
+                if not features.check(fmt):
+                    continue
+                for width in RESPONSIVE_WIDTHS:
+                    if width > square.width:
+                        continue
+                    target = os.path.join(
+                        settings.MEDIA_ROOT, self.derivative_name(public_id, width, fmt, DEFAULT_ASPECT))
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    square.resize((width, width), Image.LANCZOS).save(target, fmt.upper(), quality=80)
+
+
+IMAGE_SERVICES = {
+    'cloudinary': CloudinaryImageService,
+    'local': LocalImageService,
+}
+
+_service = None
+
+
+def get_image_service():
+    global _service
+    if _service is None:
+        _service = IMAGE_SERVICES[getattr(settings, 'IMAGE_SERVICE', 'cloudinary')]()
+    return _service
+
+
+def upload_image(file, folder):
+    """
+    Stores an uploaded image with the configured service, derivatives
+    included, and returns the value to put in the image field.
+    """
+    return get_image_service().upload(file, folder)
+
+
+def generate_derivatives(public_id):
+    try:
+        get_image_service().generate(public_id)
+    except Exception:
+        # A failed derivative only costs page weight; never fail the upload.
+        logger.exception('Could not generate image derivatives for %s', public_id)
+
+
+def schedule_derivatives(instance, previous_ids=None):
+    """
+    Queues derivative generation for every image field of the instance that
+    was added or changed, once the surrounding transaction commits.
+    """
+    previous_ids = previous_ids or {}
+    service = get_image_service()
+    for field in IMAGE_FIELDS.get(instance._meta.model_name, ()):
+        public_id = service.source_id(getattr(instance, field))
+        if public_id and public_id != service.source_id(previous_ids.get(field)):
+            transaction.on_commit(lambda public_id=public_id: generate_derivatives(public_id))
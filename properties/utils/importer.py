@@ -0,0 +1,241 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from properties.models import (
+    Agent, Project, Project_Category, ProjectImage, Property, Property_Category, PropertyImage,
+)
+from properties.utils.cache import bump_model_version
+from properties.utils.counters import reconcile_counters
+from properties.utils.facets import rebuild_facets
+from properties.utils.geo import geocode, point_fields
+from properties.utils.search import index_instance
+
+
+LIST_SEPARATOR = '|'
+
+IMPORT_SPECS = {
+    'property': {
+        'model': Property,
+        'category_model': Property_Category,
+        'image_model': PropertyImage,
+        'image_field': 'associated_property_image',
+        'int_fields': ('price', 'living_room', 'dining', 'no_of_bedrooms', 'no_of_bathrooms', 'no_of_floors'),
+        'text_fields': ('availability', 'title', 'location', 'property_type', 'features'),
+    },
+    'project': {
+        'model': Project,
+        'category_model': Project_Category,
+        'image_model': ProjectImage,
+        'image_field': 'associated_project_image',
+        'int_fields': ('price', 'no_of_block', 'no_of_flat', 'no_of_floors'),
+        'text_fields': ('title', 'location', 'status'),
+    },
+}
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+
+    def __str__(self):
+        return f'{self.created} created, {self.updated} updated, {len(self.errors)} rejected'
+
+
+def read_rows(stream, file_format):
+    """
+    Yields ``(line_number, row)`` pairs from a CSV or JSON-lines text stream
+    without reading the whole file into memory.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+    else:
+        raise ValueError(f'Unsupported import format: {file_format}')
+
+
+def detect_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def split_list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(LIST_SEPARATOR) if item.strip()]
+
+
+class ListingImporter:
+    """
+    Upserts listings by slug in fixed-size batches.
+
+    Categories and agents are resolved through lookup maps loaded once, and
+    every batch is written with a single bulk upsert, so the cost per row
+    stays flat and memory is bounded by the batch size.
+    """
+
+    def __init__(self, kind, batch_size=1000, create_categories=True):
+        self.spec = IMPORT_SPECS[kind]
+        self.kind = kind
+        self.model = self.spec['model']
+        self.batch_size = batch_size
+        self.create_categories = create_categories
+        self.categories = {
+            name.lower(): pk for pk, name in self.spec['category_model'].objects.values_list('id', 'name')
+        }
+        self.agents = {}
+        if kind == 'property':
+            self.agents = {email.lower(): pk for pk, email in Agent.objects.values_list('id', 'email')}
+
+    def run(self, rows):
+        result = ImportResult()
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch, result)
+
+        # bulk writes skip the model signals, so refresh derived data once.
+        rebuild_facets(self.model)
+        reconcile_counters(self.model)
+        bump_model_version(self.model)
+        return result
+
+    def category_id(self, name):
+        if not name:
+            raise ImportRowError('category is required')
+        key = name.strip().lower()
+        if key not in self.categories:
+            if not self.create_categories:
+                raise ImportRowError(f'unknown category {name!r}')
+            self.categories[key] = self.spec['category_model'].objects.create(name=name.strip()).pk
+        return self.categories[key]
+
+    def build(self, row):
+        if not isinstance(row, dict):
+            raise ImportRowError('not a valid record')
+        values = {}
+        for field in self.spec['text_fields']:
+            value = (row.get(field) or '').strip()
+            if not value:
+                raise ImportRowError(f'{field} is required')
+            values[field] = value
+        for field in self.spec['int_fields']:
+            try:
+                values[field] = int(str(row.get(field)).replace(',', '').strip())
+            except (TypeError, ValueError):
+                raise ImportRowError(f'{field} must be a whole number')
+        values['category_id'] = self.category_id(row.get('category'))
+        # bulk_create skips the geocoding signal.
+        values.update(point_fields(*(geocode(values['location']) or (None, None))))
+        values['slug'] = (row.get('slug') or '').strip() or slugify(values['title'])
+
+        agent_ids = None
+        if 'agents' in row:
+            agent_ids = []
+            for email in split_list(row.get('agents')):
+                if email.lower() not in self.agents:
+                    raise ImportRowError(f'unknown agent {email!r}')
+                agent_ids.append(self.agents[email.lower()])
+        images = split_list(row['images']) if 'images' in row else None
+        return values, agent_ids, images
+
+    def import_batch(self, batch, result):
+        parsed = {}
+        for line_number, row in batch:
+            try:
+                values, agent_ids, images = self.build(row)
+            except ImportRowError as error:
+                result.errors.append((line_number, str(error)))
+                continue
+            # A slug repeated within a batch keeps its last row.
+            parsed[values['slug']] = (values, agent_ids, images)
+        if not parsed:
+            return
+
+        fields = [
+            *self.spec['text_fields'], *self.spec['int_fields'], 'category_id', 'latitude', 'longitude', 'geohash',
+            'updated',
+        ]
+        with transaction.atomic():
+            slugs = list(parsed)
+            existing = set(self.model.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+            listings = [self.model(**values) for values, _agents, _images in parsed.values()]
+            # One INSERT ... ON CONFLICT (slug) DO UPDATE per batch.
+            self.model.objects.bulk_create(
+                listings, batch_size=self.batch_size,
+                update_conflicts=True, unique_fields=['slug'], update_fields=fields,
+            )
+            ids = dict(self.model.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+            self.replace_agents(parsed, ids)
+            self.replace_images(parsed, ids)
+            for listing in listings:
+                listing.id = ids[listing.slug]
+                index_instance(listing)
+
+        result.created += len(parsed) - len(existing)
+        result.updated += len(existing)
+
+    def replace_agents(self, parsed, ids):
+        if self.kind != 'property':
+            return
+        through = Property.associated_agent.through
+        listing_ids = [ids[slug] for slug, (_v, agent_ids, _i) in parsed.items() if agent_ids is not None]
+        if not listing_ids:
+            return
+        through.objects.filter(property_id__in=listing_ids).delete()
+        through.objects.bulk_create([
+            through(property_id=ids[slug], agent_id=agent_id)
+            for slug, (_v, agent_ids, _i) in parsed.items() if agent_ids
+            for agent_id in dict.fromkeys(agent_ids)
+        ], batch_size=self.batch_size)
+
+    def replace_images(self, parsed, ids):
+        image_model = self.spec['image_model']
+        owner_field = f'{self.kind}_id'
+        listing_ids = [ids[slug] for slug, (_v, _a, images) in parsed.items() if images is not None]
+        if not listing_ids:
+            return
+        image_model.objects.filter(**{f'{owner_field}__in': listing_ids}).delete()
+        image_model.objects.bulk_create([
+            image_model(**{owner_field: ids[slug], self.spec['image_field']: image})
+            for slug, (_v, _a, images) in parsed.items() if images
+            for image in images
+        ], batch_size=self.batch_size)
+
+
+def import_listings(kind, stream, file_format, batch_size=1000, create_categories=True):
+    """
+    Imports listings of the given kind ('property' or 'project') from a
+    text stream and returns an ImportResult.
+    """
+    importer = ListingImporter(kind, batch_size=batch_size, create_categories=create_categories)
+    return importer.run(read_rows(stream, file_format))
+
+
+def text_stream(uploaded_file):
+    """
+    Wraps an uploaded file so it can be read line by line as text.
+    """
+    return io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
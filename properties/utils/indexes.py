@@ -0,0 +1,54 @@
+import logging
+
+from django.db import DatabaseError, connections
+
+from properties.models import Project, Property
+
+
+logger = logging.getLogger(__name__)
+
+# Columns searched with icontains on the listing pages.
+TEXT_SEARCH_COLUMNS = (
+    (Property, 'title'),
+    (Property, 'location'),
+    (Project, 'title'),
+    (Project, 'location'),
+)
+
+
+def text_index_name(model, column):
+    return f'{model._meta.model_name}_{column}_trgm_idx'
+
+
+def model_index_names(*models):
+    return [index.name for model in models for index in model._meta.indexes]
+
+
+def ensure_text_indexes(using='default'):
+    """
+    Creates trigram indexes for the icontains filters on PostgreSQL.
+
+    Django compiles ``icontains`` to ``UPPER(column::text) LIKE UPPER(...)``,
+    so the indexes are built on that expression. Other databases cannot
+    index a substring match and are left as they are. Returns the names of
+    the indexes that exist afterwards.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return []
+    names = []
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for model, column in TEXT_SEARCH_COLUMNS:
+                name = text_index_name(model, column)
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {connection.ops.quote_name(name)} '
+                    f'ON {connection.ops.quote_name(model._meta.db_table)} '
+                    f'USING gin ((UPPER({connection.ops.quote_name(column)}::text)) gin_trgm_ops)'
+                )
+                names.append(name)
+    except DatabaseError:
+        # Creating the extension needs elevated privileges on some hosts.
+        logger.exception('Could not create trigram indexes; icontains filters will scan')
+    return names
@@ -0,0 +1,185 @@
+import logging
+import random
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from properties.models import OutboxMessage
+
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = getattr(settings, 'OUTBOX_BATCH_SIZE', 50)
+OUTBOX_MAX_ATTEMPTS = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 8)
+# Retry n waits OUTBOX_RETRY_DELAY * 2**(n - 1) seconds, capped.
+OUTBOX_RETRY_DELAY = getattr(settings, 'OUTBOX_RETRY_DELAY', 30)
+OUTBOX_MAX_RETRY_DELAY = getattr(settings, 'OUTBOX_MAX_RETRY_DELAY', 60 * 60 * 6)
+# A claimed message that is neither sent nor rescheduled within this many
+# seconds belonged to a worker that died, and becomes claimable again.
+OUTBOX_LEASE = getattr(settings, 'OUTBOX_LEASE', 300)
+
+
+def enqueue_email(kind, subject, body, recipients, html_body='', from_email='', reply_to=''):
+    """
+    Adds an email to the outbox.
+
+    Call it inside the transaction that writes the record the email is
+    about, so the record and its notification are committed together.
+    """
+    return OutboxMessage.objects.create(
+        kind=kind,
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email,
+        recipients=list(dict.fromkeys(recipients)),
+        reply_to=reply_to,
+    )
+
+
+def inquiry_recipients():
+    return list(getattr(settings, 'INQUIRY_NOTIFICATION_EMAILS', None) or [settings.DEFAULT_FROM_EMAIL])
+
+
+def absolute_url(path):
+    return getattr(settings, 'SITE_URL', '').rstrip('/') + path
+
+
+def notify_inspection_booking(booking):
+    listing = booking.property
+    recipients = list(listing.associated_agent.values_list('email', flat=True)) or inquiry_recipients()
+    context = {'booking': booking, 'listing': listing,
+               'listing_url': absolute_url(reverse('properties_details', args=[listing.slug]))}
+    return enqueue_email(
+        'inspection_booking',
+        f'Inspection request for {listing.title}',
+        render_to_string('emails/inspection_booking.txt', context),
+        recipients,
+        reply_to=booking.email,
+    )
+
+
+def notify_project_message(contact_message):
+    project = contact_message.project
+    context = {'contact_message': contact_message, 'project': project,
+               'project_url': absolute_url(reverse('project_details', args=[project.slug]))}
+    return enqueue_email(
+        'project_message',
+        f'New enquiry about {project.title}',
+        render_to_string('emails/project_message.txt', context),
+        inquiry_recipients(),
+        reply_to=contact_message.email,
+    )
+
+
+def notify_contact_message(contact_message):
+    return enqueue_email(
+        'contact_message',
+        f'Contact form: {contact_message.subject}',
+        render_to_string('emails/contact_message.txt', {'contact_message': contact_message}),
+        inquiry_recipients(),
+        reply_to=contact_message.email,
+    )
+
+
+def retry_delay(attempts):
+    delay = min(OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), OUTBOX_MAX_RETRY_DELAY)
+    # Jitter keeps messages that failed together from retrying together.
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_messages(limit=OUTBOX_BATCH_SIZE):
+    """
+    Claims up to ``limit`` due messages for this worker.
+
+    The claim is a single conditional UPDATE tagged with a random token, so
+    concurrent workers never receive the same message, on any database.
+    """
+    now = timezone.now()
+    due = OutboxMessage.objects.filter(
+        Q(status='pending') | Q(status='sending'), next_attempt_at__lte=now,
+    ).order_by('next_attempt_at').values_list('id', flat=True)[:limit]
+    ids = list(due)
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    OutboxMessage.objects.filter(
+        Q(status='pending') | Q(status='sending'), id__in=ids, next_attempt_at__lte=now,
+    ).update(status='sending', claim=token, next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE))
+    return list(OutboxMessage.objects.filter(claim=token, status='sending').order_by('id'))
+
+
+def build_email(outbox_message, connection):
+    email = EmailMultiAlternatives(
+        outbox_message.subject,
+        outbox_message.body,
+        outbox_message.from_email or settings.DEFAULT_FROM_EMAIL,
+        outbox_message.recipients,
+        reply_to=[outbox_message.reply_to] if outbox_message.reply_to else None,
+        connection=connection,
+    )
+    if outbox_message.html_body:
+        email.attach_alternative(outbox_message.html_body, 'text/html')
+    return email
+
+
+def record_failure(outbox_message, error):
+    attempts = outbox_message.attempts + 1
+    if attempts >= OUTBOX_MAX_ATTEMPTS:
+        status, next_attempt_at = 'failed', timezone.now()
+        logger.error('Giving up on outbox message %s after %d attempts: %s', outbox_message.pk, attempts, error)
+    else:
+        status, next_attempt_at = 'pending', timezone.now() + retry_delay(attempts)
+        logger.warning('Outbox message %s failed (attempt %d): %s', outbox_message.pk, attempts, error)
+    OutboxMessage.objects.filter(pk=outbox_message.pk, claim=outbox_message.claim).update(
+        status=status, attempts=F('attempts') + 1, next_attempt_at=next_attempt_at,
+        last_error=str(error)[:500],
+    )
+
+
+def deliver(outbox_message, connection):
+    try:
+        connection.send_messages([build_email(outbox_message, connection)])
+    except Exception as error:
+        record_failure(outbox_message, error)
+        return False
+    OutboxMessage.objects.filter(pk=outbox_message.pk, claim=outbox_message.claim).update(
+        status='sent', attempts=F('attempts') + 1, sent_at=timezone.now(), last_error='',
+    )
+    return True
+
+
+def drain(batch_size=OUTBOX_BATCH_SIZE, connection=None):
+    """
+    Claims one batch of due messages and sends it over a single mail
+    connection. Returns the number of messages that were attempted.
+    """
+    batch = claim_messages(batch_size)
+    if not batch:
+        return 0
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        # Nothing can be sent right now; back off the whole batch.
+        for outbox_message in batch:
+            record_failure(outbox_message, error)
+        return len(batch)
+    try:
+        for outbox_message in batch:
+            deliver(outbox_message, connection)
+    finally:
+        connection.close()
+    return len(batch)
+
+
+def retry_failed(queryset):
+    return queryset.filter(status='failed').update(
+        status='pending', attempts=0, next_attempt_at=timezone.now(), last_error='')
@@ -0,0 +1,209 @@
+import math
+
+from django.conf import settings
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+DEFAULT_ORDERING = ('-updated', '-created', 'id')
+CURSOR_SALT = 'properties.pagination.cursor'
+# Admin changelists count at most this many rows; beyond it the total is
+# estimated (PostgreSQL) or reported as the limit.
+ADMIN_COUNT_LIMIT = getattr(settings, 'ADMIN_COUNT_LIMIT', 10000)
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated queryset.
+
+    Mirrors the parts of Django's ``Page`` that the listing templates use,
+    so ``next_page_number``/``previous_page_number`` return opaque cursor
+    tokens that go back into the ``page`` query parameter.
+    """
+
+    def __init__(self, object_list, paginator, number, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage {self.number}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.next_cursor
+
+    def previous_page_number(self):
+        return self.previous_cursor
+
+
+class CursorPaginator:
+    """
+    Paginates a queryset by seeking past the last row seen instead of using
+    OFFSET, so every page costs the same regardless of depth. No COUNT(*)
+    is run; ``count`` and ``num_pages`` are only available when an
+    estimated total is supplied.
+    """
+
+    def __init__(self, queryset, per_page, ordering=DEFAULT_ORDERING, estimated_total=None):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.ordering = ordering
+        self.count = estimated_total
+
+    @property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(1, math.ceil(self.count / self.per_page))
+
+    @property
+    def page_range(self):
+        return range(1, (self.num_pages or 0) + 1)
+
+    def _fields(self):
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+
+    def _value_to_string(self, obj, name):
+        # Rows may be model instances or dicts from a values() queryset.
+        value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+    def _to_python(self, name, value):
+        # Orderings may name an annotation, such as a distance.
+        if name in self.queryset.query.annotations:
+            return self.queryset.query.annotations[name].output_field.to_python(value)
+        return self.queryset.model._meta.get_field(name).to_python(value)
+
+    def _encode(self, obj, direction, number):
+        values = [self._value_to_string(obj, name) for name, _desc in self._fields()]
+        return signing.dumps({'v': values, 'd': direction, 'n': number}, salt=CURSOR_SALT, compress=True)
+
+    def _decode(self, cursor):
+        try:
+            payload = signing.loads(cursor, salt=CURSOR_SALT)
+            values = [
+                self._to_python(name, value)
+                for (name, _desc), value in zip(self._fields(), payload['v'])
+            ]
+        except Exception:
+            return None
+        if payload.get('d') not in ('next', 'prev') or len(values) != len(self.ordering):
+            return None
+        return values, payload['d'], payload.get('n', 1)
+
+    def _seek(self, values, reverse):
+        # (a, b, c) after (x, y, z) <=> a > x OR (a = x AND b > y) OR ...
+        fields = self._fields()
+        condition = Q()
+        lookups = []
+        for index, (name, descending) in enumerate(fields):
+            lookups.append('lt' if descending != reverse else 'gt')
+            clause = Q(**{f'{name}__{lookups[index]}': values[index]})
+            for prev_index in range(index):
+                clause &= Q(**{fields[prev_index][0]: values[prev_index]})
+            condition |= clause
+        # The OR chain alone cannot be used to seek into the index; the
+        # redundant range on the first column (a >= x) starts the scan at
+        # the cursor instead of at the first row.
+        return Q(**{f'{fields[0][0]}__{lookups[0]}e': values[0]}) & condition
+
+    def page(self, cursor=None):
+        decoded = self._decode(cursor) if cursor else None
+
+        if decoded is None:
+            rows = list(self.queryset[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return CursorPage(
+                rows, self, 1,
+                next_cursor=self._encode(rows[-1], 'next', 2) if has_more else None,
+            )
+
+        values, direction, number = decoded
+        if direction == 'next':
+            rows = list(self.queryset.filter(self._seek(values, reverse=False))[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            if not rows:
+                return self.page()
+            return CursorPage(
+                rows, self, number,
+                next_cursor=self._encode(rows[-1], 'next', number + 1) if has_more else None,
+                previous_cursor=self._encode(rows[0], 'prev', number - 1) if number > 1 else None,
+            )
+
+        reversed_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+        rows = list(
+            self.queryset.filter(self._seek(values, reverse=True)).order_by(*reversed_ordering)[:self.per_page + 1]
+        )
+        has_more = len(rows) > self.per_page
+        rows = list(reversed(rows[:self.per_page]))
+        if not rows or not has_more:
+            return self.page()
+        return CursorPage(
+            rows, self, number,
+            next_cursor=self._encode(rows[-1], 'next', number + 1),
+            previous_cursor=self._encode(rows[0], 'prev', number - 1) if number > 1 else None,
+        )
+
+
+def table_row_estimate(queryset):
+    """
+    Returns the planner's row estimate for an unfiltered PostgreSQL table,
+    or None when there is no usable estimate.
+    """
+    connection = connections[queryset.db]
+    if queryset.query.where or connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    # reltuples is -1 (or 0 on older servers) before the first ANALYZE.
+    return int(row[0]) if row and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists on large tables.
+
+    Counting stops after ``ADMIN_COUNT_LIMIT`` rows, so a broad filter
+    never scans the whole table. When more rows match, the total comes from
+    ``known_count`` (a count maintained elsewhere, for unfiltered lists) or
+    the PostgreSQL planner's estimate, and otherwise is shown as the limit.
+    """
+
+    def __init__(self, *args, known_count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        counted = self.object_list[:ADMIN_COUNT_LIMIT].count()
+        if counted < ADMIN_COUNT_LIMIT:
+            return counted
+        if self.known_count is not None:
+            return self.known_count
+        return max(table_row_estimate(self.object_list) or 0, counted)
@@ -0,0 +1,113 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+RATE_LIMITS = getattr(settings, 'RATE_LIMITS', {})
+RATE_LIMIT_CACHE = getattr(settings, 'RATE_LIMIT_CACHE', 'default')
+# Request header (as a META key) holding the client address; behind a proxy
+# use the one it sets, such as HTTP_X_REAL_IP.
+RATE_LIMIT_IP_HEADER = getattr(settings, 'RATE_LIMIT_IP_HEADER', 'REMOTE_ADDR')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """
+    Parses a rate such as "10/h" into tokens per second.
+    """
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period[0]]
+
+
+def client_ip(request):
+    return request.META.get(RATE_LIMIT_IP_HEADER, '').split(',')[0].strip()
+
+
+def bucket_keys(request, endpoint, identities):
+    """
+    Returns a cache key per identity the request carries: the client
+    address, and the email address submitted with the form.
+    """
+    values = {}
+    if 'ip' in identities:
+        values['ip'] = client_ip(request)
+    if 'email' in identities:
+        values['email'] = request.POST.get('email', '').strip().lower()
+    keys = []
+    for identity, value in values.items():
+        if value:
+            digest = hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+            keys.append(f'ratelimit:{endpoint}:{identity}:{digest}')
+    return keys
+
+
+def take_token(endpoint, keys, now=None):
+    """
+    Takes one token from each of the endpoint's buckets named by ``keys``.
+
+    A bucket holds up to ``burst`` tokens and refills at ``rate``; it is
+    stored as ``(tokens, timestamp)`` and only brought up to date when
+    read. Tokens are taken only when every bucket has one, so a rejected
+    request costs nothing. Returns 0 when allowed, otherwise the seconds
+    until the emptiest bucket has a token again.
+
+    Reads and writes are not atomic, so concurrent requests may each see
+    the same last token; the limit is approximate by that much.
+    """
+    policy = RATE_LIMITS[endpoint]
+    rate = parse_rate(policy['rate'])
+    burst = policy.get('burst', 1)
+    now = time.time() if now is None else now
+    cache = caches[RATE_LIMIT_CACHE]
+
+    stored = cache.get_many(keys)
+    buckets = {}
+    for key in keys:
+        tokens, updated = stored.get(key, (burst, now))
+        buckets[key] = min(burst, tokens + (now - updated) * rate)
+    emptiest = min(buckets.values(), default=burst)
+    if emptiest < 1:
+        return (1 - emptiest) / rate
+
+    # A bucket left alone refills in burst / rate seconds; after that it is
+    # the same as a missing one.
+    cache.set_many({key: (tokens - 1, now) for key, tokens in buckets.items()}, int(burst / rate) + 1)
+    return 0
+
+
+def rate_limit(endpoint):
+    """
+    Rejects POSTs to a view with 429 Too Many Requests once the client has
+    used up the ``RATE_LIMITS[endpoint]`` policy, before the form is
+    validated or the database touched.
+
+    ``endpoint`` is a policy name or a function of the request returning
+    one (or None to let the request through), for views that handle
+    several forms.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST':
+                return view(request, *args, **kwargs)
+            name = endpoint(request) if callable(endpoint) else endpoint
+            if name not in RATE_LIMITS:
+                return view(request, *args, **kwargs)
+
+            keys = bucket_keys(request, name, RATE_LIMITS[name].get('by', ('ip',)))
+            retry_after = take_token(name, keys)
+            if retry_after:
+                response = HttpResponse(
+                    'Too many requests. Please wait a moment and try again.',
+                    content_type='text/plain', status=429,
+                )
+                response['Retry-After'] = max(int(retry_after + 0.999), 1)
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
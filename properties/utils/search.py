@@ -0,0 +1,320 @@
+import re
+
+from django.conf import settings
+from django.db import connection, connections, router
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from properties.models import Agent, Blog, Project, Property
+
+
+SEARCH_TABLE = 'properties_search_index'
+RESULTS_PER_TYPE = getattr(settings, 'SEARCH_RESULTS_PER_TYPE', 20)
+
+# Result key -> (model, title builder, body builder, icontains fallback fields)
+SEARCH_DOCUMENTS = {
+    'agents': (Agent, lambda obj: obj.name, lambda obj: obj.email, ('name', 'email')),
+    'blogs': (
+        Blog,
+        lambda obj: obj.title,
+        lambda obj: f'{obj.description} {obj.content}',
+        ('title', 'content'),
+    ),
+    'properties': (Property, lambda obj: obj.title, lambda obj: obj.location, ('title', 'location')),
+    'projects': (Project, lambda obj: obj.title, lambda obj: obj.location, ('title', 'location')),
+}
+
+# Columns the result templates never display; skipping them keeps large
+# TextFields such as Blog.content out of the result fetch.
+DEFERRED_FIELDS = {
+    'blogs': ('content',),
+}
+
+
+def document_type_for(model):
+    for doc_type, (doc_model, *_rest) in SEARCH_DOCUMENTS.items():
+        if doc_model is model:
+            return doc_type
+    return None
+
+
+def tokenize(query):
+    return re.findall(r'\w+', query.lower())
+
+
+class BaseSearchBackend:
+    """
+    Interface for the global search index.
+
+    Backends store one document per indexed object and return object ids
+    ordered by relevance for a given document type.
+    """
+
+    def setup(self, using='default'):
+        """
+        Creates the index if it does not exist; run after migrate.
+        """
+
+    def read_connection(self):
+        # Searches follow the read routing, so replicas can serve them.
+        return connections[router.db_for_read(Property)]
+
+    def index(self, doc_type, object_id, title, body):
+        raise NotImplementedError
+
+    def remove(self, doc_type, object_id):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, doc_type, query, limit):
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 index ranked with bm25, title weighted above body.
+
+    Each document's rowid is derived from its type and object id so that
+    updates and deletes are rowid lookups. The type is an indexed column
+    matched in the query itself, so a search reads only that type's
+    postings instead of filtering every match afterwards.
+    """
+
+    type_codes = {doc_type: code for code, doc_type in enumerate(SEARCH_DOCUMENTS, start=1)}
+
+    def rowid(self, doc_type, object_id):
+        return int(object_id) * 8 + self.type_codes[doc_type]
+
+    def setup(self, using='default'):
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = %s", [SEARCH_TABLE])
+            row = cursor.fetchone()
+            if row and 'doc_type UNINDEXED' in row[0]:
+                # Tables from before doc_type was indexed are rebuilt.
+                cursor.execute(f'DROP TABLE {SEARCH_TABLE}')
+                row = None
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+                'doc_type, object_id UNINDEXED, title, body, '
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        return row is None
+
+    def index(self, doc_type, object_id, title, body):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, doc_type, object_id, title, body) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [self.rowid(doc_type, object_id), doc_type, object_id, title, body],
+            )
+
+    def remove(self, doc_type, object_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [self.rowid(doc_type, object_id)])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+
+    def search(self, doc_type, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Quote every term so user input can never be parsed as FTS syntax,
+        # and allow prefix matches so partial words still find results.
+        words = ' '.join(f'"{term}"*' for term in terms)
+        match = f'doc_type:"{doc_type}" AND {{title body}}: ({words})'
+        with self.read_connection().cursor() as cursor:
+            cursor.execute(
+                f'SELECT object_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+                f'ORDER BY bm25({SEARCH_TABLE}, 0, 0, 10.0, 1.0) LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL index on a stored, weighted tsvector column, with a partial
+    GIN index per document type so a search only reads that type's entries.
+    """
+
+    config = 'english'
+
+    def setup(self, using='default'):
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [SEARCH_TABLE])
+            created = cursor.fetchone()[0] is None
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+                'doc_type varchar(20) NOT NULL, '
+                'object_id bigint NOT NULL, '
+                'title text NOT NULL, '
+                'body text NOT NULL, '
+                'document tsvector GENERATED ALWAYS AS ('
+                f"setweight(to_tsvector('{self.config}', title), 'A') || "
+                f"setweight(to_tsvector('{self.config}', body), 'B')) STORED, "
+                'PRIMARY KEY (doc_type, object_id))'
+            )
+            cursor.execute(f'DROP INDEX IF EXISTS {SEARCH_TABLE}_document_idx')
+            for doc_type in SEARCH_DOCUMENTS:
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_{doc_type}_idx '
+                    f'ON {SEARCH_TABLE} USING GIN (document) WHERE doc_type = %s',
+                    [doc_type],
+                )
+        return created
+
+    def index(self, doc_type, object_id, title, body):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (doc_type, object_id, title, body) '
+                'VALUES (%s, %s, %s, %s) '
+                'ON CONFLICT (doc_type, object_id) DO UPDATE '
+                'SET title = EXCLUDED.title, body = EXCLUDED.body',
+                [doc_type, object_id, title, body],
+            )
+
+    def remove(self, doc_type, object_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE doc_type = %s AND object_id = %s',
+                [doc_type, object_id],
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {SEARCH_TABLE}')
+
+    def search(self, doc_type, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        with self.read_connection().cursor() as cursor:
+            cursor.execute(
+                f'SELECT object_id FROM {SEARCH_TABLE}, '
+                f"to_tsquery('{self.config}', %s) query "
+                'WHERE doc_type = %s AND document @@ query '
+                'ORDER BY ts_rank_cd(document, query) DESC LIMIT %s',
+                [tsquery, doc_type, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class DatabaseScanBackend(BaseSearchBackend):
+    """
+    Fallback for databases without a full-text index: the previous
+    icontains queries, limited per type.
+    """
+
+    def index(self, doc_type, object_id, title, body):
+        pass
+
+    def remove(self, doc_type, object_id):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, doc_type, query, limit):
+        model, _title, _body, fields = SEARCH_DOCUMENTS[doc_type]
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f'{field}__icontains': query})
+        return list(model.objects.filter(condition).values_list('id', flat=True)[:limit])
+
+
+DEFAULT_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    """
+    Returns the configured search backend.
+
+    ``settings.SEARCH_BACKEND`` may name a backend class by dotted path;
+    otherwise one is picked from the database vendor. Its table is created
+    after migrate by ``ensure_search_index``, never during a request.
+    """
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+        if backend_path:
+            backend_class = import_string(backend_path)
+        else:
+            backend_class = DEFAULT_BACKENDS.get(connection.vendor, DatabaseScanBackend)
+        _backend = backend_class()
+    return _backend
+
+
+def ensure_search_index(using='default'):
+    """
+    Creates the search index on the given database, filling it when it
+    had to be created (or recreated) so existing objects are searchable.
+    """
+    if get_backend().setup(using) and using == 'default':
+        rebuild_index()
+
+
+def index_instance(instance):
+    doc_type = document_type_for(type(instance))
+    if doc_type is None:
+        return
+    _model, title, body, _fields = SEARCH_DOCUMENTS[doc_type]
+    get_backend().index(doc_type, instance.pk, title(instance) or '', body(instance) or '')
+
+
+def remove_instance(instance):
+    doc_type = document_type_for(type(instance))
+    if doc_type is None:
+        return
+    get_backend().remove(doc_type, instance.pk)
+
+
+def rebuild_index(chunk_size=500):
+    """
+    Clears the search index and reindexes every searchable object.
+
+    Returns a mapping of result key to the number of documents indexed.
+    """
+    backend = get_backend()
+    backend.clear()
+    counts = {}
+    for doc_type, (model, title, body, _fields) in SEARCH_DOCUMENTS.items():
+        counts[doc_type] = 0
+        for obj in model.objects.order_by('pk').iterator(chunk_size=chunk_size):
+            backend.index(doc_type, obj.pk, title(obj) or '', body(obj) or '')
+            counts[doc_type] += 1
+    return counts
+
+
+def search(query, limit=RESULTS_PER_TYPE):
+    """
+    Searches every document type and returns ranked model instances.
+
+    Args:
+    - query: Raw search text from the user.
+    - limit: Maximum number of results returned per type.
+
+    Returns:
+    - Dict mapping each result key ('blogs', 'properties', ...) to a list
+      of instances, best match first.
+    """
+    return {doc_type: search_type(doc_type, query, limit) for doc_type in SEARCH_DOCUMENTS}
+
+
+def search_type(doc_type, query, limit=RESULTS_PER_TYPE):
+    """
+    Searches one document type and returns its ranked model instances.
+    """
+    model = SEARCH_DOCUMENTS[doc_type][0]
+    ids = get_backend().search(doc_type, query, limit)
+    objects = model.objects.defer(*DEFERRED_FIELDS.get(doc_type, ())).in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
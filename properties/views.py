@@ -1,30 +1,46 @@
+import math
+
 from django.shortcuts import render, get_object_or_404, redirect
 from .models import *
 from .forms import *
 from django.contrib import messages
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from .utils.email_utils import handle_email_subscription
-from django.db.models import Q
+from django.db import transaction
 from django.db.models import Max
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from .utils.email_utils import handle_email_subscription
+from .utils.cache import lazy_list
+from .utils.conditional import conditional_page
+from .utils.details import load_project_detail, load_property_detail
+from .utils.facets import get_facets
+from .utils.geo import geocode, within_bbox, within_radius
+from .utils.outbox import notify_contact_message, notify_inspection_booking, notify_project_message
+from .utils.pagination import DEFAULT_ORDERING, CursorPaginator
+from .utils.ratelimit import rate_limit
+from .utils.search import search
+
+
+def submitted_form(request):
+    """
+    Names the rate-limit policy of the form posted to a page that has
+    several: reviews carry a comment, inquiries a message, and anything
+    else is the newsletter form.
+    """
+    if 'comment' in request.POST:
+        return 'review'
+    if 'message' in request.POST:
+        return 'inquiry'
+    return 'newsletter'
 
 
+@rate_limit('newsletter')
 def global_search(request):
     query = request.GET.get('query')
     results = {'blogs': [], 'properties': [], 'projects': [], 'agents': []}
 
     if query:
-        agent_results = Agent.objects.filter(
-            Q(name__icontains=query) | Q(email__icontains=query))
-        results['agents'].extend(agent_results)
-        blog_results = Blog.objects.filter(
-            Q(title__icontains=query) | Q(content__icontains=query))
-        results['blogs'].extend(blog_results)
-        property_results = Property.objects.filter(
-            Q(title__icontains=query) | Q(location__icontains=query))
-        results['properties'].extend(property_results)
-        project_results = Project.objects.filter(
-            Q(title__icontains=query) | Q(location__icontains=query))
-        results['projects'].extend(project_results)
+        results = search(query)
     any_results_found = any(results.values())
     form = NewsletterSubscriptionForm()
     if request.method == 'POST':
@@ -43,52 +59,153 @@ def custom_404(request, exception):
     return render(request, '404.html', status=404)
 
 
-def paginate_items(request, items, items_per_page):
+def paginate_items(request, items, items_per_page, estimated_total=None, ordering=DEFAULT_ORDERING):
     """
-    Paginates a list of items based on the request and number of items per page.
+    Paginates a queryset with keyset (cursor) pagination based on the request.
 
     Args:
     - request: Django HttpRequest object.
-    - items: QuerySet or list of items to paginate.
+    - items: QuerySet of items to paginate.
     - items_per_page: Number of items to display per page.
+    - estimated_total: Optional total used for the "of N" page count.
+    - ordering: Fields to page by, ending with a unique one.
 
     Returns:
-    - Paginated items (Page object).
+    - Paginated items (CursorPage object).
     """
-    paginator = Paginator(items, items_per_page)
-    page_number = request.GET.get('page')
+    paginator = CursorPaginator(items, items_per_page, ordering=ordering, estimated_total=estimated_total)
+    return paginator.page(request.GET.get('page'))
+
+
+SEARCH_RADII = (5, 10, 25, 50, 100)
+MAX_SEARCH_RADIUS_KM = 200
+
 
+def filter_by_area(request, listings):
+    """
+    Applies the geographic filters of a listing search: ``radius`` km around
+    the place named in ``location``, nearest first, and ``bbox`` given as
+    "min_lat,min_lon,max_lat,max_lon".
+
+    Returns the filtered listings, the ordering to page them by and whether
+    the location text was resolved to a point (and so needs no text match).
+    """
+    ordering = DEFAULT_ORDERING
+    located = False
+    point = geocode(request.GET.get('location'))
     try:
-        paginated_items = paginator.page(page_number)
-    except PageNotAnInteger:
-        paginated_items = paginator.page(1)
-    except EmptyPage:
-        paginated_items = paginator.page(paginator.num_pages)
-    return paginated_items
-
-
-def handle_email_subscription(request, form, redirect_url):
-    if form.is_valid():
-        email = form.cleaned_data['email']
-        if NewsletterSubscription.objects.filter(email=email).exists():
-            messages.info(request, 'You are already subscribed.')
-        else:
-            subscription = NewsletterSubscription(email=email)
-            subscription.save()
-            messages.success(request, 'Your subscription has been successful!')
-    return redirect(redirect_url)
+        radius = float(request.GET.get('radius') or 0)
+    except ValueError:
+        radius = 0
+    if point and 0 < radius < math.inf:
+        listings = within_radius(listings, *point, min(radius, MAX_SEARCH_RADIUS_KM))
+        ordering = ('distance_km', 'id')
+        located = True
+
+    try:
+        bbox = [float(value) for value in request.GET.get('bbox', '').split(',')]
+    except ValueError:
+        bbox = []
+    if len(bbox) == 4 and all(math.isfinite(value) for value in bbox):
+        lat_a, lon_a, lat_b, lon_b = bbox
+        listings = within_bbox(
+            listings, max(min(lat_a, lat_b), -90), max(min(lon_a, lon_b), -180),
+            min(max(lat_a, lat_b), 90), min(max(lon_a, lon_b), 180),
+        )
+    return listings, ordering, located
+
 
+# Query parameter -> field of the exact-number filters on the listing pages.
+PROPERTY_NUMBER_FILTERS = {'bedrooms': 'no_of_bedrooms', 'floor': 'no_of_floors', 'bathrooms': 'no_of_bathrooms'}
+PROJECT_NUMBER_FILTERS = {'blocks': 'no_of_block', 'floor': 'no_of_floors', 'rooms': 'no_of_flat'}
 
+
+def filter_listings(request, listings, number_filters):
+    """
+    Applies the listing search filters from the query string: ``keyword``
+    on the title, ``location`` (by distance when ``radius`` is given),
+    ``bbox`` and the exact-number filters. Non-numeric numbers are ignored.
+
+    Returns the filtered listings, the ordering to page them by and
+    whether any filter was applied.
+    """
+    keyword = request.GET.get('keyword')
+    location = request.GET.get('location')
+    listings, ordering, located = filter_by_area(request, listings)
+    if keyword:
+        listings = listings.filter(title__icontains=keyword)
+    if location and not located:
+        listings = listings.filter(location__icontains=location)
+    numbers = {
+        field: int(request.GET[param])
+        for param, field in number_filters.items()
+        if request.GET.get(param, '').isdigit()
+    }
+    listings = listings.filter(**numbers)
+    filtered = bool(keyword or location or numbers or request.GET.get('bbox'))
+    return listings, ordering, filtered
+
+
+BLOG_FEED_CHUNK_SIZE = 6
+
+
+def latest_update(model):
+    """
+    Returns a ``conditional_page`` callback giving the newest ``updated``
+    of a listing model, read from the end of its recency index.
+    """
+    def latest(request, *args, **kwargs):
+        return model.objects.aggregate(latest=Max('updated'))['latest']
+    return latest
+
+
+def property_updated(request, property_slug=None):
+    return load_property_detail(property_slug)['listing'].updated
+
+
+def project_updated(request, project_slug, category_name=None):
+    return load_project_detail(project_slug)['listing'].updated
+
+
+def blog_feed_page(cursor=None):
+    """
+    Returns one fixed-size chunk of blog cards, newest first.
+    """
+    blogs = Blog.objects.defer('content')
+    paginator = CursorPaginator(blogs, BLOG_FEED_CHUNK_SIZE, ordering=('-id',))
+    return paginator.page(cursor)
+
+
+def blog_feed(request):
+    blog_page = blog_feed_page(request.GET.get('cursor'))
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'results': [
+                {
+                    'title': blog.title,
+                    'slug': blog.slug,
+                    'category': blog.category,
+                    'description': blog.description,
+                    'image': blog.image.url if blog.image else None,
+                    'url': reverse('blog_details', args=[blog.slug]),
+                    'created_at': blog.created_at,
+                }
+                for blog in blog_page
+            ],
+            'next': blog_page.next_cursor,
+        })
+    response = render(request, 'blog_cards.html', {'blogs': blog_page})
+    if blog_page.next_cursor:
+        response['X-Next-Cursor'] = blog_page.next_cursor
+    return response
+
+
+@rate_limit('newsletter')
 def home(request):
-    blogs = Blog.objects.all().order_by('-id')
+    blog_page = SimpleLazyObject(blog_feed_page)
     agents = Agent.objects.all().order_by('-id')[:3]
     recent_projects = Project.objects.all().order_by('-created')[:3]
-    recent_properties = Property.objects.all().order_by('-created')[:3]
-    first_property = recent_properties[0] if recent_properties else None
-    second_property = recent_properties[1] if len(
-        recent_properties) > 1 else None
-    third_property = recent_properties[2] if len(
-        recent_properties) > 2 else None
+    recent_properties = lazy_list(Property.objects.all().order_by('-created')[:3])
     form = NewsletterSubscriptionForm()
     if request.method == 'POST':
         form = NewsletterSubscriptionForm(request.POST)
@@ -96,16 +213,14 @@ def home(request):
     context = {
         'recent_projects':  recent_projects,
         'recent_properties':  recent_properties,
-        'first_property': first_property,
-        'second_property': second_property,
-        'third_property': third_property,
         'form': form,
         'agents': agents,
-        "blogs": blogs,
+        "blog_page": blog_page,
     }
     return render(request, 'home.html', context)
 
 
+@rate_limit('newsletter')
 def agent(request):
     agents = Agent.objects.all().order_by('-id')
     form = NewsletterSubscriptionForm()
@@ -119,6 +234,7 @@ def agent(request):
     return render(request, 'agent.html', context)
 
 
+@rate_limit('newsletter')
 def about(request):
     staffs = Staff.objects.all().order_by('-id')
     form = NewsletterSubscriptionForm()
@@ -129,9 +245,12 @@ def about(request):
     return render(request, 'about.html', context)
 
 
+@rate_limit('newsletter')
+@conditional_page(versions=('blog',))
 def blog(request):
     form = NewsletterSubscriptionForm()
     blogs = Blog.objects.all().order_by('-id')
+    blog_page = SimpleLazyObject(blog_feed_page)
     search_query= request.GET.get('query')
     results = None
     if search_query:
@@ -143,11 +262,13 @@ def blog(request):
         "search_query": search_query,
         'results': results,
         "form": form,
-        "blogs": blogs
+        "blog_page": blog_page
     }
     return render(request, 'blog.html', context)
 
 
+@rate_limit('newsletter')
+@conditional_page(versions=('blog',))
 def blog_details(request, slug):
     blog = get_object_or_404(Blog, slug=slug) 
     similar_blogs = Blog.objects.filter(category=blog.category).exclude(slug=slug)[:3] 
@@ -167,39 +288,32 @@ def blog_details(request, slug):
 
 
 
+@rate_limit('newsletter')
+@conditional_page(latest_update(Project), versions=('project', 'project_category'))
 def project(request, category_name=None):
     form = NewsletterSubscriptionForm()
-    projects = Project.objects.all().order_by('-id')
-    keyword = request.GET.get('keyword')
-    location = request.GET.get('location')
-    blocks = request.GET.get('blocks')
-    floor = request.GET.get('floor')
-    rooms = request.GET.get('rooms')
+    projects = Project.objects.all()
     results = None
     categories = Project_Category.objects.all()
     
+    category_id = None
+    
     # Filter projects by category if category_name is provided
     if category_name:
         category_obj = get_object_or_404(Project_Category, name=category_name)
         projects = projects.filter(category=category_obj)
+        category_id = category_obj.id
 
-    max_blocks = str(projects.aggregate(Max('no_of_block'))['no_of_block__max'])
-    max_floors = str(projects.aggregate(Max('no_of_floors'))['no_of_floors__max'])
-    max_rooms = str(projects.aggregate(Max('no_of_flat'))['no_of_flat__max'])
+    facets = get_facets(Project, category_id)
+    max_blocks = str(facets['no_of_block']['max'])
+    max_floors = str(facets['no_of_floors']['max'])
+    max_rooms = str(facets['no_of_flat']['max'])
 
-    if keyword:
-        projects = projects.filter(title__icontains=keyword)
-    if location:
-        projects = projects.filter(location__icontains=location)
-    if blocks:
-        projects = projects.filter(no_of_block=blocks)
-    if floor:
-        projects = projects.filter(no_of_floors=floor)
-    if rooms:
-        projects = projects.filter(no_of_flat=rooms)
-
-    results = projects
-    paginated_projects = paginate_items(request, projects, items_per_page=9)
+    projects, ordering, filtered = filter_listings(request, projects, PROJECT_NUMBER_FILTERS)
+    paginated_projects = paginate_items(
+        request, projects, items_per_page=9,
+        estimated_total=None if filtered else facets['count'], ordering=ordering)
+    results = paginated_projects
 
     if request.method == 'POST':
         form = NewsletterSubscriptionForm(request.POST)
@@ -214,39 +328,45 @@ def project(request, category_name=None):
         'max_blocks': max_blocks,
         'max_floors': max_floors,
         'max_rooms': max_rooms,
+        'search_radii': SEARCH_RADII,
+        'total_count': facets['count'],
     }
     return render(request, 'project.html', context)
+@rate_limit(submitted_form)
+@conditional_page(project_updated, versions=('project', 'project_category'))
 def project_details(request, project_slug, category_name=None):
     form = NewsletterSubscriptionForm()
     contact_form = ProjectContactForm()
     review_form = ReviewForm()
-    project = get_object_or_404(Project, slug=project_slug)
-    available_projects = Project.objects.all().order_by('-id')
+    detail = load_project_detail(project_slug)
+    project = detail['listing']
     if category_name:
         category = get_object_or_404(Project_Category, name=category_name)
         projects = Project.objects.filter(category=category)
+        estimated_total = get_facets(Project, category.id)['count']
     else:
-        projects = [project]
-    paginated_projects = paginate_items(request, projects, items_per_page=9)
+        projects = Project.objects.all()
+        estimated_total = get_facets(Project)['count']
+    paginated_projects = paginate_items(request, projects, items_per_page=9, estimated_total=estimated_total)
     if request.method == 'POST':
         contact_form = ProjectContactForm(request.POST)
-        project_instance = get_object_or_404(Project, slug=project_slug)
         if contact_form.is_valid():
+            with transaction.atomic():
                 contact_message = ProjectContactMessage.objects.create(
-                    project= project_instance,
+                    project=project,
                     name=contact_form.cleaned_data['name'],
                     email=contact_form.cleaned_data['email'],
                     phone=contact_form.cleaned_data['phone_number'],
                     message=contact_form.cleaned_data['message']
                 )
-                contact_message.save()
+                notify_project_message(contact_message)
                 messages.success(request, 'Your message has been sent successfully! We will get back to you soon.')
                 return redirect('project_details', project_slug=project_slug)
     else:
         contact_form = ProjectContactForm()
     if request.method == 'POST':
         review_form = ReviewForm(request.POST)
-        if form.is_valid():
+        if review_form.is_valid():
             if request.user.is_authenticated:
                 review_message = Project_Review(
                     project=project,
@@ -264,12 +384,11 @@ def project_details(request, project_slug, category_name=None):
     if request.method == 'POST':
         form = NewsletterSubscriptionForm(request.POST)
         handle_email_subscription(request, form, 'home')
-    images = project.projectimage_set.all()
     context = {
-        'available_projects': available_projects,
         'project': project,
         'projects': paginated_projects,
-        'images': images,
+        'images': detail['images'],
+        'reviews': detail['reviews'],
         'selected_category': category_name,
         'form': form,
         'review_form': review_form,
@@ -280,38 +399,29 @@ def project_details(request, project_slug, category_name=None):
 
 
 
+@rate_limit('newsletter')
+@conditional_page(latest_update(Property), versions=('property', 'property_category'))
 def properties(request, category_name=None):
     form = NewsletterSubscriptionForm()
-    properties = Property.objects.all().order_by('-id')
-    keyword = request.GET.get('keyword')
-    location = request.GET.get('location')
-    bedrooms = request.GET.get('bedrooms')
-    floor = request.GET.get('floor')
-    bathrooms = request.GET.get('bathrooms')
+    properties = Property.objects.all()
     results = None
     categories = Property_Category.objects.all()
+    category_id = None
     if category_name:
         category_obj = get_object_or_404(Property_Category, name=category_name)
         properties = properties.filter(category=category_obj)
+        category_id = category_obj.id
 
-    max_bedrooms = str(properties.aggregate(Max('no_of_bedrooms'))['no_of_bedrooms__max'])
-    max_floors = str(properties.aggregate(Max('no_of_floors'))['no_of_floors__max'])
-    max_bathrooms = str(properties.aggregate(Max('no_of_bathrooms'))['no_of_bathrooms__max'])
+    facets = get_facets(Property, category_id)
+    max_bedrooms = str(facets['no_of_bedrooms']['max'])
+    max_floors = str(facets['no_of_floors']['max'])
+    max_bathrooms = str(facets['no_of_bathrooms']['max'])
 
-    if keyword:
-        properties = properties.filter(title__icontains=keyword)
-    if location:
-        properties = properties.filter(location__icontains=location)
-    if bedrooms:
-        properties = properties.filter(no_of_bedrooms=bedrooms)
-    if floor:
-        properties = properties.filter(no_of_floors=floor)
-    if bathrooms:
-        properties = properties.filter(no_of_bathrooms=bathrooms)
-
-    results = properties
+    properties, ordering, filtered = filter_listings(request, properties, PROPERTY_NUMBER_FILTERS)
     paginated_properties = paginate_items(
-        request, properties, items_per_page=9)
+        request, properties, items_per_page=9,
+        estimated_total=None if filtered else facets['count'], ordering=ordering)
+    results = paginated_properties
     if request.method == 'POST':
         form = NewsletterSubscriptionForm(request.POST)
         handle_email_subscription(request, form, 'properties')
@@ -324,45 +434,49 @@ def properties(request, category_name=None):
         'max_bedrooms': max_bedrooms,
         'max_floors': max_floors,
         'max_bathrooms': max_bathrooms,
+        'search_radii': SEARCH_RADII,
+        'total_count': facets['count'],
 
     }
     return render(request, 'properties.html', context)
 
 
+@rate_limit(submitted_form)
+@conditional_page(property_updated, versions=('property', 'property_category', 'agent'))
 def properties_details(request, property_slug=None):
     form = NewsletterSubscriptionForm()
     review_form = ReviewForm()
     inspection_form = InspectionBookingForm() 
-    available_properties = Property.objects.all().order_by('-id')
-    properties = get_object_or_404(Property, slug=property_slug)
-    paginated_properties = paginate_items(request, available_properties, items_per_page=9)
-    images = properties.propertyimage_set.all()
-    agents = properties.associated_agent.all()
+    detail = load_property_detail(property_slug)
+    properties = detail['listing']
+    paginated_properties = paginate_items(
+        request, Property.objects.all(), items_per_page=9,
+        estimated_total=get_facets(Property)['count'])
     if request.method == 'POST':
         form = NewsletterSubscriptionForm(request.POST)
         handle_email_subscription(request, form, 'home')
     if request.method == 'POST':
             inspection_form = InspectionBookingForm(request.POST)
             if inspection_form.is_valid():
-                property_instance = get_object_or_404(Property, slug=property_slug)
-                inspection_booking = InspectionBooking.objects.create(
-                    property=property_instance,
-                    name=inspection_form.cleaned_data['name'],
-                    phone=inspection_form.cleaned_data['phone_number'],
-                    email=inspection_form.cleaned_data['email'],
-                    message=inspection_form.cleaned_data['message'],
-                )
-                inspection_booking.save()
+                with transaction.atomic():
+                    inspection_booking = InspectionBooking.objects.create(
+                        property=properties,
+                        name=inspection_form.cleaned_data['name'],
+                        phone=inspection_form.cleaned_data['phone_number'],
+                        email=inspection_form.cleaned_data['email'],
+                        message=inspection_form.cleaned_data['message'],
+                    )
+                    notify_inspection_booking(inspection_booking)
                 messages.success(request, 'Your inspection booking has been submitted successfully! We will get back to you soon.')
                 return redirect('properties_details', property_slug=property_slug)
     if request.method == 'POST':
         review_form = ReviewForm(request.POST)
-        if form.is_valid():
+        if review_form.is_valid():
             if request.user.is_authenticated:
                 review_message = Property_Review(
-                    properties=properties,
+                    property=properties,
                     user=request.user,
-                    comment=form.cleaned_data['comment']
+                    comment=review_form.cleaned_data['comment']
                 )
                 review_message.save()
                 messages.success(request, 'Your review has been submitted successfully!')
@@ -373,10 +487,10 @@ def properties_details(request, property_slug=None):
         else:
             review_form = ReviewForm()
     context = {
-        'available_properties': available_properties,
         'properties': properties,
-        'images': images,
-        'agents': agents,
+        'images': detail['images'],
+        'agents': detail['agents'],
+        'reviews': detail['reviews'],
         'form': form,
         'review_form': review_form,
         'inspection_form': inspection_form,
@@ -387,6 +501,7 @@ def properties_details(request, property_slug=None):
 
 
 
+@rate_limit(submitted_form)
 def contact(request):
     form = NewsletterSubscriptionForm()
     contact_form = ContactForm()
@@ -399,14 +514,15 @@ def contact(request):
         else:
             contact_form = ContactForm(request.POST)
             if contact_form.is_valid():
-                contact_message = ContactMessage.objects.create(
-                    name=contact_form.cleaned_data['name'],
-                    email=contact_form.cleaned_data['email'],
-                    phone=contact_form.cleaned_data['phone_number'],
-                    subject=contact_form.cleaned_data['subject'],
-                    message=contact_form.cleaned_data['message']
-                )
-                contact_message.save()
+                with transaction.atomic():
+                    contact_message = ContactMessage.objects.create(
+                        name=contact_form.cleaned_data['name'],
+                        email=contact_form.cleaned_data['email'],
+                        phone=contact_form.cleaned_data['phone_number'],
+                        subject=contact_form.cleaned_data['subject'],
+                        message=contact_form.cleaned_data['message']
+                    )
+                    notify_contact_message(contact_message)
                 messages.success(request, 'Your message has been sent successfully! We will get back to you soon.')
                 return redirect('contact')
 
@@ -0,0 +1,27 @@
+const loadMoreButtons = document.querySelectorAll('.blog-load-more');
+
+function loadMoreBlogs(event){
+    const button = event.currentTarget;
+    const url = `${button.dataset.feedUrl}?cursor=${encodeURIComponent(button.dataset.cursor)}`;
+    button.disabled = true;
+
+    fetch(url)
+        .then(response => {
+            const nextCursor = response.headers.get('X-Next-Cursor');
+            return response.text().then(html => ({ html, nextCursor }));
+        })
+        .then(({ html, nextCursor }) => {
+            button.insertAdjacentHTML('beforebegin', html);
+            if (nextCursor) {
+                button.dataset.cursor = nextCursor;
+                button.disabled = false;
+            } else {
+                button.remove();
+            }
+        })
+        .catch(() => {
+            button.disabled = false;
+        });
+}
+
+loadMoreButtons.forEach(button => button.addEventListener('click', loadMoreBlogs));